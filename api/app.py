@@ -1,10 +1,17 @@
+import os
+import tempfile
+import time
+import uuid
 from urllib.parse import unquote
 
-from flask import redirect, request
+from flask import Response, g, redirect, request, stream_with_context
 from flask_cors import CORS
 from flask_openapi3 import Info, OpenAPI, Tag
+from sqlalchemy import select
+from sqlalchemy.pool import QueuePool
 
-from logger import logger
+from logger import access_logger, logger, request_id
+from metrics import PHASE_SECONDS, REQUEST_SECONDS, REQUESTS, snapshot
 from model import *
 from schemas import *
 
@@ -16,15 +23,141 @@ CORS(app)
 # Define tags for route grouping
 home_tag = Tag(name="Documentation", description="Documentation selection: Swagger, Redoc, or RapiDoc")
 patient_tag = Tag(name="Patient", description="Add, view, remove, and predict patients with breast cancer")
+inference_tag = Tag(name="Inference", description="Inspect the model serving layer")
+
+# Trained pipeline used for predictions: a pickle, or the manifest.json of a
+# memory-mapped array artifact such as
+# ./machine_learning/pipelines/svc_breast_cancer_pipeline/manifest.json
+PIPELINE_PATH = os.environ.get("PIPELINE_PATH", './machine_learning/pipelines/svc_breast_cancer_pipeline.pkl')
+
+# Directory of versioned pipelines written by ModelSaver.save_version. The
+# newest version is served and new ones are picked up without a restart;
+# PIPELINE_PATH is served while the directory holds none
+MODEL_VERSIONS_PATH = os.environ.get("MODEL_VERSIONS_PATH", './machine_learning/versions')
+MODEL_RESIDENT_VERSIONS = int(os.environ.get("MODEL_RESIDENT_VERSIONS", 2))
+MODEL_POLL_INTERVAL = float(os.environ.get("MODEL_POLL_INTERVAL", 5))
+
+# Candidate pipeline (as saved by ModelSaver.save_pipeline) scored in the
+# background on a sample of live traffic and compared with the served one;
+# shadow evaluation is off when unset
+SHADOW_PIPELINE_PATH = os.environ.get("SHADOW_PIPELINE_PATH")
+SHADOW_FRACTION = float(os.environ.get("SHADOW_FRACTION", 0.1))
+SHADOW_WORKERS = int(os.environ.get("SHADOW_WORKERS", 2))
+SHADOW_MAX_PENDING = int(os.environ.get("SHADOW_MAX_PENDING", 1000))
+
+# Inference backend: "compiled" scores with plain NumPy (see CompiledPipeline)
+# and falls back to "sklearn" for pipelines it cannot compile
+INFERENCE_ENGINE = os.environ.get("INFERENCE_ENGINE", "compiled")
+
+# Largest number of patients accepted by a single batch request
+MAX_BATCH_SIZE = 1000
+
+# Message returned when a patient name is already taken
+DUPLICATE_MESSAGE = "Patient already exists in the database :/"
+
+# Rows fetched from the database per chunk of an export
+EXPORT_CHUNK_SIZE = 1000
+
+# Encoder, content type and file extension of each export format
+EXPORT_FORMATS = {
+    "ndjson": (Exporter.to_ndjson, "application/x-ndjson", "ndjson"),
+    "csv": (Exporter.to_csv, "text/csv", "csv"),
+    "parquet": (Exporter.to_parquet, "application/vnd.apache.parquet", "parquet")
+}
+
+# Micro-batching of concurrent single-patient predictions
+MICRO_BATCH_WINDOW_MS = float(os.environ.get("MICRO_BATCH_WINDOW_MS", 2))
+MICRO_BATCH_MAX_ROWS = int(os.environ.get("MICRO_BATCH_MAX_ROWS", 64))
+
+# Group commit of single-patient inserts: when enabled, the inserts of the
+# requests arriving within the window are committed in one transaction
+DB_GROUP_COMMIT = os.environ.get("DB_GROUP_COMMIT", "0") == "1"
+DB_GROUP_COMMIT_WINDOW_MS = float(os.environ.get("DB_GROUP_COMMIT_WINDOW_MS", 2))
+DB_GROUP_COMMIT_MAX_ROWS = int(os.environ.get("DB_GROUP_COMMIT_MAX_ROWS", 256))
+
+# Cache of predictions keyed on the feature vector (a size of 0 disables it)
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", 4096))
+PREDICTION_CACHE_TTL = float(os.environ.get("PREDICTION_CACHE_TTL", 3600))
+
+def json_response(payload, status: int) -> Response:
+    """Build a JSON response with the fast encoder instead of Flask's default one.
+
+    Args:
+        payload: Dictionaries, lists and scalars to encode.
+        status (int): HTTP status code.
+
+    Returns:
+        Response: The encoded response.
+    """
+    return Response(dumps(payload), status=status, mimetype="application/json")
 
 class PatientService:
     """Service class to handle patient-related operations."""
 
     def __init__(self):
-        """Initialize the PatientService with a database session and ML model."""
-        self.session = Session()
-        self.model_path = './machine_learning/pipelines/svc_breast_cancer_pipeline.pkl'
-        self.pipeline = Pipeline.load_pipeline(self.model_path)
+        """Initialize the PatientService with the model registry, which loads the ML model."""
+        self.registry = ModelRegistry(
+            MODEL_VERSIONS_PATH, PIPELINE_PATH, self._load_version,
+            keep=MODEL_RESIDENT_VERSIONS, poll_interval=MODEL_POLL_INTERVAL,
+            warmup_input=PreProcessor.prepare_form(PatientSchema())
+        )
+        self.writer = None
+        if DB_GROUP_COMMIT:
+            self.writer = GroupCommitWriter(Session.session_factory, DB_GROUP_COMMIT_WINDOW_MS, DB_GROUP_COMMIT_MAX_ROWS)
+        self.shadow = None
+        if SHADOW_PIPELINE_PATH:
+            self.shadow = ShadowEvaluator(
+                self._build_engine(Pipeline.load_pipeline(SHADOW_PIPELINE_PATH)), file_version(SHADOW_PIPELINE_PATH),
+                SHADOW_FRACTION, SHADOW_WORKERS, SHADOW_MAX_PENDING
+            )
+
+    @classmethod
+    def _load_version(cls, version: str, path: str) -> ModelVersion:
+        """Load a pipeline and build the objects serving it.
+
+        Args:
+            version (str): Identifier of the version.
+            path (str): Path of the pipeline artifact.
+
+        Returns:
+            ModelVersion: The version with its pipeline, scoring engine, micro-batcher and cache.
+
+        Raises:
+            ValueError: If the pipeline was trained on other features than those the API sends.
+        """
+        pipeline = Pipeline.load_pipeline(path)
+        PreProcessor.check_features(pipeline, path)
+        engine = cls._build_engine(pipeline)
+        batcher = MicroBatcher(engine, MICRO_BATCH_WINDOW_MS, MICRO_BATCH_MAX_ROWS)
+        cache = None
+        if PREDICTION_CACHE_SIZE > 0:
+            cache = PredictionCache(batcher, version, PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL)
+        return ModelVersion(
+            version, path, cache or batcher, pipeline=pipeline, engine=engine, batcher=batcher, cache=cache
+        )
+
+    @staticmethod
+    def _build_engine(pipeline):
+        """Select the backend that scores rows for the loaded pipeline.
+
+        Args:
+            pipeline: The fitted sklearn pipeline.
+
+        Returns:
+            The CompiledPipeline of the pipeline, or the pipeline itself.
+        """
+        if INFERENCE_ENGINE != "compiled":
+            return pipeline
+        try:
+            return CompiledPipeline.compile(pipeline)
+        except ValueError as e:
+            logger.warning("Serving with sklearn, the pipeline cannot be compiled: %s", e)
+            return pipeline
+
+    @property
+    def session(self):
+        """The database session of the current thread, created on first use."""
+        return Session()
 
     def add_patient(self, form: PatientSchema):
         """Add a new patient to the database.
@@ -35,39 +168,266 @@ class PatientService:
         Returns:
             tuple: Response dictionary and HTTP status code.
         """
-        X_input = PreProcessor.prepare_form(form)
-        diagnosis = int(Model.perform_prediction(self.pipeline, X_input)[0])
-
-        patient = Patient(
-            name=form.name,
-            concave_points_worst=form.concave_points_worst,
-            perimeter_worst=form.perimeter_worst,
-            concave_points_mean=form.concave_points_mean,
-            radius_worst=form.radius_worst,
-            perimeter_mean=form.perimeter_mean,
-            area_worst=form.area_worst,
-            radius_mean=form.radius_mean,
-            area_mean=form.area_mean,
-            diagnosis=diagnosis
-        )
-        logger.debug(f"Adding patient with name: '{patient.name}'")
+        with PHASE_SECONDS.time("add_patient", "prepare"):
+            X_input = PreProcessor.prepare_form(form)
+        model = self.registry.active
+        try:
+            with PHASE_SECONDS.time("add_patient", "predict"):
+                y_pred = Model.perform_prediction(model.predictor, X_input)
+        except Exception as e:
+            error_msg = f"Unable to predict the diagnosis: {str(e)}"
+            logger.error("Error adding patient '%s': %s", form.name, error_msg)
+            return {"message": error_msg}, 500
+        diagnosis = int(y_pred[0])
+        if self.shadow:
+            self.shadow.submit(model.engine, model.version, X_input, y_pred)
+
+        values = self._patient_values(form, diagnosis, model.version)
+        logger.debug("Adding patient with name: '%s'", form.name)
 
         try:
-            if self.session.query(Patient).filter(Patient.name == form.name).first():
-                error_msg = "Patient already exists in the database :/"
-                logger.warning(f"Error adding patient '{patient.name}': {error_msg}")
-                return {"message": error_msg}, 409
-
-            self.session.add(patient)
-            self.session.commit()
-            logger.debug(f"Added patient with name: '{patient.name}'")
+            if self.writer:
+                # Committed together with the inserts of concurrent requests
+                with PHASE_SECONDS.time("add_patient", "group_commit"):
+                    patient = self.writer.insert(values)
+            else:
+                # Insert and duplicate check in one statement, guarded by the unique index on name
+                with PHASE_SECONDS.time("add_patient", "insert"):
+                    statement = insert_new_patients(self.session).returning(Patient)
+                    patient = self.session.scalars(statement, [values]).first()
+                with PHASE_SECONDS.time("add_patient", "commit"):
+                    self.session.commit()
+
+            if patient is None:
+                logger.warning("Error adding patient '%s': %s", form.name, DUPLICATE_MESSAGE)
+                return {"message": DUPLICATE_MESSAGE}, 409
+
+            logger.debug("Added patient with name: '%s'", form.name)
             return present_patient(patient), 200
 
         except Exception as e:
+            self.session.rollback()
             error_msg = f"Unable to save the new item: {str(e)}"
-            logger.warning(f"Error adding patient '{patient.name}': {error_msg}")
+            logger.warning("Error adding patient '%s': %s", form.name, error_msg)
             return {"message": error_msg}, 400
 
+    def add_patients(self, rows: list):
+        """Add a batch of new patients to the database.
+
+        All valid rows are scored with a single prediction call and persisted
+        in a single transaction. Rows that fail validation or whose name is
+        already taken are reported individually and do not abort the batch.
+
+        Args:
+            rows (list): Raw patient payloads, one dictionary per patient.
+
+        Returns:
+            tuple: Response dictionary and HTTP status code.
+        """
+        if not isinstance(rows, list) or not rows:
+            error_msg = "Expected a non-empty list of patients :/"
+            logger.warning("Error adding patient batch: %s", error_msg)
+            return {"message": error_msg}, 400
+
+        if len(rows) > MAX_BATCH_SIZE:
+            error_msg = f"A batch may contain at most {MAX_BATCH_SIZE} patients :/"
+            logger.warning("Error adding patient batch: %s", error_msg)
+            return {"message": error_msg}, 400
+
+        logger.debug("Adding batch of %s patients", len(rows))
+        results = [None] * len(rows)
+
+        # Validate every row on its own so a bad row (e.g. a NaN feature) does not reject the batch
+        forms = {}
+        with PHASE_SECONDS.time("add_patients", "validation"):
+            for index, row in enumerate(rows):
+                try:
+                    forms[index] = PatientSchema(**row)
+                except Exception as e:
+                    results[index] = {"index": index, "status": 400, "message": f"Invalid input: {str(e)}"}
+
+        # Reject names repeated within the batch
+        seen = set()
+        for index, form in list(forms.items()):
+            if form.name in seen:
+                results[index] = {"index": index, "status": 409, "message": DUPLICATE_MESSAGE}
+                del forms[index]
+            seen.add(form.name)
+
+        if forms:
+            with PHASE_SECONDS.time("add_patients", "prepare"):
+                X_input = PreProcessor.prepare_batch(list(forms.values()))
+            model = self.registry.active
+            try:
+                with PHASE_SECONDS.time("add_patients", "predict"):
+                    diagnoses = Model.perform_prediction(model.predictor, X_input)
+            except Exception as e:
+                error_msg = f"Unable to predict the diagnoses: {str(e)}"
+                logger.error("Error adding patient batch: %s", error_msg)
+                return {"message": error_msg}, 500
+            if self.shadow:
+                self.shadow.submit(model.engine, model.version, X_input, diagnoses)
+            values = [
+                self._patient_values(form, int(diagnosis), model.version)
+                for form, diagnosis in zip(forms.values(), diagnoses)
+            ]
+
+            try:
+                # Rows whose name is already stored are skipped by the insert itself
+                with PHASE_SECONDS.time("add_patients", "insert"):
+                    stored = {
+                        patient.name: patient
+                        for patient in self.session.scalars(insert_new_patients(self.session).returning(Patient), values)
+                    }
+                with PHASE_SECONDS.time("add_patients", "commit"):
+                    self.session.commit()
+            except Exception as e:
+                self.session.rollback()
+                error_msg = f"Unable to save the new items: {str(e)}"
+                logger.warning("Error adding patient batch: %s", error_msg)
+                return {"message": error_msg}, 400
+
+            for index, form in forms.items():
+                if form.name in stored:
+                    results[index] = {"index": index, "status": 200,
+                                      "patient": present_patient(stored[form.name])}
+                else:
+                    results[index] = {"index": index, "status": 409, "message": DUPLICATE_MESSAGE}
+
+        logger.debug("Added %s of %s patients in batch", len(forms), len(rows))
+        return {"results": results}, 200
+
+    @staticmethod
+    def _patient_values(form: PatientSchema, diagnosis: int, model_version: str) -> dict:
+        """Build the column values of a patient from a validated form and its predicted diagnosis.
+
+        Args:
+            form (PatientSchema): Patient data from the request form.
+            diagnosis (int): Diagnosis predicted by the model.
+            model_version (str): Version of the model that predicted the diagnosis.
+
+        Returns:
+            dict: Column values of the new patient.
+        """
+        return {
+            "name": form.name,
+            "concave_points_worst": form.concave_points_worst,
+            "perimeter_worst": form.perimeter_worst,
+            "concave_points_mean": form.concave_points_mean,
+            "radius_worst": form.radius_worst,
+            "perimeter_mean": form.perimeter_mean,
+            "area_worst": form.area_worst,
+            "radius_mean": form.radius_mean,
+            "area_mean": form.area_mean,
+            "diagnosis": diagnosis,
+            "model_version": model_version
+        }
+
+    def get_patients(self, query: PatientListQuerySchema):
+        """Retrieve a page of patients, ordered by id.
+
+        Only the requested columns are selected, and the page starts right after
+        the `after` id using the primary key index, so the cost of a page does not
+        depend on the size of the table or on how deep the page is.
+
+        Args:
+            query (PatientListQuerySchema): Page size, cursor, projected fields and filters.
+
+        Returns:
+            tuple: Response dictionary and HTTP status code.
+        """
+        logger.debug("Fetching up to %s patients after id %s", query.limit, query.after)
+        columns = query.columns()
+        statement = select(*[getattr(Patient, column) for column in columns])
+
+        if query.after is not None:
+            statement = statement.where(Patient.id > query.after)
+        if query.diagnosis is not None:
+            statement = statement.where(Patient.diagnosis == query.diagnosis)
+        if query.inserted_from is not None:
+            statement = statement.where(Patient.insertion_date >= query.inserted_from)
+        if query.inserted_to is not None:
+            statement = statement.where(Patient.insertion_date < query.inserted_to)
+
+        try:
+            # Fetch one extra row to know whether there is a next page, as plain
+            # tuples that never enter the ORM identity map
+            rows = self.session.execute(statement.order_by(Patient.id).limit(query.limit + 1)).all()
+        except Exception as e:
+            error_msg = f"Unable to fetch patients: {str(e)}"
+            logger.warning("Error fetching patients: %s", error_msg)
+            return {"message": error_msg}, 400
+
+        patients = present_rows(rows[:query.limit], columns)
+        next_after = patients[-1]["id"] if len(rows) > query.limit else None
+        logger.debug("%s patients found", len(patients))
+        return json_response({"patients": patients, "next_after": next_after}, 200)
+
+    def export_patients(self, export_format: str):
+        """Stream the whole patients table in the given format.
+
+        Rows are read through a server-side cursor in chunks of EXPORT_CHUNK_SIZE
+        and encoded chunk by chunk, so memory use does not grow with the table.
+
+        Args:
+            export_format (str): One of the EXPORT_FORMATS keys.
+
+        Returns:
+            Response: Streaming response with the encoded table.
+        """
+        logger.debug("Exporting patients as %s", export_format)
+        encode, mimetype, extension = EXPORT_FORMATS[export_format]
+        result = self.session.execute(
+            select(*Patient.__table__.columns)
+            .order_by(Patient.id)
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+
+        return Response(
+            stream_with_context(encode(result.partitions())),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f"attachment; filename=patients.{extension}"}
+        )
+
+    def import_patients(self, file):
+        """Import every patient of an uploaded CSV or Parquet file.
+
+        The file is scored and inserted in chunks. If a chunk fails, uploading
+        the same file again resumes from that chunk.
+
+        Args:
+            file (FileStorage): The uploaded file.
+
+        Returns:
+            tuple: Response dictionary and HTTP status code.
+        """
+        name_prefix, extension = os.path.splitext(os.path.basename(file.filename or ""))
+        if extension not in (".csv", ".parquet"):
+            error_msg = "Only .csv and .parquet files can be imported :/"
+            logger.warning("Error importing '%s': %s", file.filename, error_msg)
+            return {"message": error_msg}, 400
+
+        fd, path = tempfile.mkstemp(suffix=extension)
+        os.close(fd)
+        # The whole file is scored by the version active when the import starts
+        model = self.registry.active
+        importer = Importer(Session.session_factory, model.engine, IMPORT_CHECKPOINT_PATH, model_version=model.version)
+        try:
+            file.save(path)
+            summary = importer.import_file(
+                path, name_prefix,
+                progress=lambda summary: logger.debug("Importing '%s': %s", file.filename, summary)
+            )
+        except Exception as e:
+            error_msg = f"Unable to import the file, upload it again to resume: {str(e)}"
+            logger.warning("Error importing '%s': %s", file.filename, error_msg)
+            return {"message": error_msg}, 400
+        finally:
+            os.remove(path)
+
+        logger.debug("Imported '%s': %s", file.filename, summary)
+        return summary, 200
+
     def get_patient(self, name: str):
         """Retrieve a patient from the database by name.
 
@@ -80,10 +440,10 @@ class PatientService:
         patient = self.session.query(Patient).filter(Patient.name == name).first()
         if not patient:
             error_msg = f"Patient {name} not found in the database :/"
-            logger.warning(f"Error searching for patient '{name}': {error_msg}")
+            logger.warning("Error searching for patient '%s': %s", name, error_msg)
             return {"message": error_msg}, 404
 
-        logger.debug(f"Patient found: '{patient.name}'")
+        logger.debug("Patient found: '%s'", patient.name)
         return present_patient(patient), 200
 
     def delete_patient(self, name: str):
@@ -96,21 +456,78 @@ class PatientService:
             tuple: Response dictionary and HTTP status code.
         """
         patient_name = unquote(name)
-        logger.debug(f"Deleting data for patient #{patient_name}")
+        logger.debug("Deleting data for patient #%s", patient_name)
 
         patient = self.session.query(Patient).filter(Patient.name == patient_name).first()
         if not patient:
             error_msg = "Patient not found in the database :/"
-            logger.warning(f"Error deleting patient '{patient_name}': {error_msg}")
+            logger.warning("Error deleting patient '%s': %s", patient_name, error_msg)
             return {"message": error_msg}, 404
 
         self.session.delete(patient)
         self.session.commit()
-        logger.debug(f"Deleted patient #{patient_name}")
+        logger.debug("Deleted patient #%s", patient_name)
         return {"message": f"Patient {patient_name} removed successfully!"}, 200
 
-# Instantiate the service class
-patient_service = PatientService()
+# The service class is instantiated by create_app, so importing this module
+# does not load the model
+patient_service = None
+
+def create_app() -> OpenAPI:
+    """Application factory: sets up the database schema, loads the ML model and returns the app.
+
+    Under gunicorn with preload_app (see gunicorn.conf.py) this runs once in the
+    master process, and the forked workers share the loaded model's memory.
+    The schema is left alone when DB_SETUP_ON_START is off (see create_schema.py).
+
+    Returns:
+        OpenAPI: The app, ready to serve requests.
+    """
+    global patient_service
+    if patient_service is None:
+        if DB_SETUP_ON_START:
+            setup_database(engine)
+        patient_service = PatientService()
+    return app
+
+@app.before_request
+def start_timer():
+    """Records when the request started and the id its log records are tagged with.
+
+    The id is taken from the X-Request-ID header, so a request can be followed
+    from a proxy to the API logs, or generated when the header is missing.
+    """
+    g.request_started = time.perf_counter()
+    g.request_id = request.headers.get("X-Request-ID", "")[:128] or uuid.uuid4().hex
+    g.request_id_token = request_id.set(g.request_id)
+
+@app.after_request
+def record_request(response):
+    """Counts the request by route, method and status, records its duration and logs it."""
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    REQUESTS.inc(route, request.method, str(response.status_code))
+    if "request_started" in g:
+        latency = time.perf_counter() - g.request_started
+        REQUEST_SECONDS.observe(latency, route)
+        access_logger.info(
+            "%s %s %s", request.method, request.path, response.status_code,
+            extra={"method": request.method, "route": route, "status": response.status_code,
+                   "latency_ms": round(latency * 1000, 3)}
+        )
+    if "request_id" in g:
+        response.headers["X-Request-ID"] = g.request_id
+    return response
+
+@app.teardown_request
+def reset_request_id(exception=None):
+    """Stops tagging the log records of the thread with the id of the finished request."""
+    if "request_id_token" in g:
+        request_id.reset(g.pop("request_id_token"))
+
+@app.teardown_appcontext
+def remove_session(exception=None):
+    """Closes the session of the current request, rolling back anything left uncommitted."""
+    Session.remove()
 
 @app.get('/', tags=[home_tag])
 def home():
@@ -118,25 +535,49 @@ def home():
     return redirect('/openapi')
 
 @app.get('/patients', tags=[patient_tag],
-         responses={"200": PatientViewSchema, "404": ErrorSchema})
-def get_patients():
-    """Lists all patients registered in the database.
+         responses={"200": PatientPageSchema, "400": ErrorSchema})
+def get_patients(query: PatientListQuerySchema):
+    """Lists the patients registered in the database, one page at a time.
+
+    Args:
+        query (PatientListQuerySchema): Page size, cursor, projected fields and filters.
 
     Returns:
         tuple: Response dictionary and HTTP status code.
     """
-    logger.debug("Fetching data about all patients")
-    try:
-        patients = patient_service.session.query(Patient).all()
-        if not patients:
-            return {"patients": []}, 200
-        logger.debug(f"{len(patients)} patients found")
-        return present_patients(patients), 200
-    except Exception as e:
-        error_msg = f"Unable to fetch patients: {str(e)}"
-        logger.warning(f"Error fetching patients: {error_msg}")
+    return patient_service.get_patients(query)
+
+@app.get('/patients/export', tags=[patient_tag])
+def export_patients(query: PatientExportQuerySchema):
+    """Streams every patient in the database as NDJSON, CSV or Parquet.
+
+    Args:
+        query (PatientExportQuerySchema): Format of the export.
+
+    Returns:
+        Response: Streaming response with the encoded table.
+    """
+    return patient_service.export_patients(query.format)
+
+@app.post('/patients/import', tags=[patient_tag],
+          responses={"200": PatientImportViewSchema, "400": ErrorSchema})
+def import_patients():
+    """Imports patients from a CSV or Parquet file, predicting their diagnoses in chunks.
+
+    Expects a multipart upload with the file in the "file" field. The file has the
+    columns of the test dataset and, optionally, a name column.
+
+    Returns:
+        tuple: Response dictionary and HTTP status code.
+    """
+    file = request.files.get("file")
+    if file is None:
+        error_msg = "Expected a file in the 'file' field :/"
+        logger.warning("Error importing patients: %s", error_msg)
         return {"message": error_msg}, 400
 
+    return patient_service.import_patients(file)
+
 @app.post('/patient', tags=[patient_tag],
           responses={"200": PatientViewSchema, "400": ErrorSchema, "409": ErrorSchema})
 def add_patient(form: PatientSchema):
@@ -148,6 +589,8 @@ def add_patient(form: PatientSchema):
     Returns:
         tuple: Response dictionary and HTTP status code.
     """
+    # flask-openapi3 parses and validates the form before calling the view
+    PHASE_SECONDS.observe(time.perf_counter() - g.request_started, "add_patient", "validation")
     return patient_service.add_patient(form)
 
 @app.route('/patient_streamlit', methods=['POST'])
@@ -159,14 +602,30 @@ def add_patient_streamlit():
     """
     data = request.json
     try:
-        form = PatientSchema(**data)
+        with PHASE_SECONDS.time("add_patient", "validation"):
+            form = PatientSchema(**data)
     except Exception as e:
         error_msg = f"Invalid input: {str(e)}"
-        logger.warning(f"Error adding patient: {error_msg}")
+        logger.warning("Error adding patient: %s", error_msg)
         return {"message": error_msg}, 400
 
     return patient_service.add_patient(form)
 
+@app.post('/patients/batch', tags=[patient_tag],
+          responses={"200": PatientBatchViewSchema, "400": ErrorSchema})
+def add_patients():
+    """Adds a batch of patients to the database with a single model call.
+
+    Expects a JSON body of the form {"patients": [PatientSchema, ...]}.
+    Each row is reported individually with its own status.
+
+    Returns:
+        tuple: Response dictionary and HTTP status code.
+    """
+    data = request.get_json(silent=True)
+    rows = data.get("patients") if isinstance(data, dict) else None
+    return patient_service.add_patients(rows)
+
 @app.get('/patient', tags=[patient_tag],
          responses={"200": PatientViewSchema, "404": ErrorSchema})
 def get_patient(query: PatientSearchSchema):
@@ -193,5 +652,93 @@ def delete_patient(query: PatientSearchSchema):
     """
     return patient_service.delete_patient(query.name)
 
+@app.get('/inference/stats', tags=[inference_tag],
+         responses={"200": InferenceStatsSchema})
+def get_inference_stats():
+    """Returns statistics of the model registry, and of the micro-batcher and
+    prediction cache of the active model version.
+
+    Returns:
+        tuple: Response dictionary and HTTP status code.
+    """
+    model = patient_service.registry.active
+    return {
+        "registry": patient_service.registry.stats(),
+        "batcher": model.batcher.stats(),
+        "cache": model.cache.stats() if model.cache else None
+    }, 200
+
+@app.get('/inference/shadow', tags=[inference_tag],
+         responses={"200": ShadowStatsSchema, "404": ErrorSchema})
+def get_shadow_stats():
+    """Returns the agreement and latency of the candidate model scored in shadow.
+
+    Returns:
+        tuple: Response dictionary and HTTP status code.
+    """
+    if patient_service.shadow is None:
+        return {"message": "Shadow evaluation is disabled, set SHADOW_PIPELINE_PATH :/"}, 404
+    return patient_service.shadow.stats(), 200
+
+@app.get('/inference/shadow/report', tags=[inference_tag])
+def get_shadow_report():
+    """Returns a plain text report comparing the candidate model with the production one.
+
+    Returns:
+        Response: The report, or an error message when shadow evaluation is disabled.
+    """
+    if patient_service.shadow is None:
+        return {"message": "Shadow evaluation is disabled, set SHADOW_PIPELINE_PATH :/"}, 404
+    return Response(patient_service.shadow.report(), mimetype="text/plain")
+
+@app.get('/metrics', tags=[inference_tag])
+def get_metrics():
+    """Returns request, phase, database pool and model metrics in the Prometheus text format.
+
+    Each process keeps its own metrics: under gunicorn, every worker is scraped separately.
+
+    Returns:
+        Response: The metrics as text/plain.
+    """
+    pool = engine.pool
+    registry = patient_service.registry
+    model = registry.active
+    registry_stats = registry.stats()
+    lines = [*REQUESTS.render(), *REQUEST_SECONDS.render(), *PHASE_SECONDS.render()]
+    if isinstance(pool, QueuePool):
+        # An in-memory SQLite database keeps one connection per thread, with no pool size or overflow
+        lines.extend([
+            *snapshot("db_pool_connections", "Database connections by state.", [
+                (("checked_out",), pool.checkedout()),
+                (("checked_in",), pool.checkedin()),
+                # Negative while the pool holds fewer than pool_size connections
+                (("overflow",), max(pool.overflow(), 0))
+            ], ("state",)),
+            *snapshot("db_pool_size", "Connections kept open by the database pool.", [((), pool.size())])
+        ])
+    lines.extend([
+        *snapshot("model_info", "Model version serving predictions.", [((model.version,), 1)], ("version",)),
+        *snapshot("model_swaps_total", "Times the served model version changed.",
+                  [((), registry_stats["swaps"])], kind="counter"),
+        *snapshot("micro_batcher_queue_depth", "Requests waiting for the next batch.",
+                  [((), model.batcher.stats()["queue_depth"])])
+    ])
+    if patient_service.writer:
+        writer_stats = patient_service.writer.stats()
+        lines.extend([
+            *snapshot("db_group_commit_queue_depth", "Inserts waiting for the next group commit.",
+                      [((), writer_stats["queue_depth"])]),
+            *snapshot("db_group_commits_total", "Transactions committed by the group-commit writer.",
+                      [((), writer_stats["groups"])], kind="counter"),
+            *snapshot("db_group_commit_rows_total", "Patients inserted by the group-commit writer.",
+                      [((), writer_stats["rows"])], kind="counter")
+        ])
+    if model.cache:
+        cache_stats = model.cache.stats()
+        lines.extend(snapshot("prediction_cache_lookups_total", "Prediction cache lookups by outcome.", [
+            (("hit",), cache_stats["hits"]), (("miss",), cache_stats["misses"])
+        ], ("outcome",), kind="counter"))
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
\ No newline at end of file
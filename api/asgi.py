@@ -0,0 +1,24 @@
+"""
+ASGI entry point of the API, for production deployments.
+
+Run it from the api directory with an ASGI server, e.g.:
+
+    uvicorn asgi:application --host 0.0.0.0 --port 5000 --workers 4
+
+The server's event loop owns every client connection, so idle, slow or
+keep-alive clients do not hold a thread. Only requests being processed borrow
+one of the ASGI_WORKER_THREADS threads, where the Flask handlers and their
+database calls run. Inference is offloaded once more: each handler hands its
+rows to the micro-batcher thread, which scores concurrent requests together.
+"""
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import create_app
+from model import DB_MAX_OVERFLOW, DB_POOL_SIZE
+
+# Threads running request handlers; by default one per pooled database connection
+ASGI_WORKER_THREADS = int(os.environ.get("ASGI_WORKER_THREADS", DB_POOL_SIZE + DB_MAX_OVERFLOW))
+
+application = WSGIMiddleware(create_app(), workers=ASGI_WORKER_THREADS)
@@ -0,0 +1,338 @@
+"""
+Load-tests the patient routes of the API and compares the latencies with a
+stored baseline.
+
+Concurrent clients send a weighted mix of POST /patient, GET /patient,
+GET /patients and DELETE /patient requests to a database seeded with the
+given numbers of patients. Throughput and p50/p95/p99 latencies are reported
+per route; a route whose p95 latency or throughput is worse than the baseline
+by more than the tolerance makes the run exit with status 1.
+
+Run it from the api directory:
+
+    python -m benchmarks.bench_api --rows 1000 100000 --concurrency 8
+    python -m benchmarks.bench_api --transport server --rows 1000000
+
+The `client` transport calls the app through Flask's test client, measuring
+the request handling alone; the `server` transport starts a local threaded
+HTTP server and sends real requests to it, or to --url. The database of
+--url must be the one DB_URL points to, since that is the one seeded.
+Record a new baseline with --update-baseline.
+"""
+import argparse
+import csv
+import http.client
+import itertools
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+# Keep the benchmark away from the real database, and the access records out of the timings
+os.environ.setdefault("DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')}")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from sqlalchemy import insert
+from werkzeug.serving import make_server
+
+from app import create_app
+from model import Patient, Session
+
+PATH_DATASET = "./machine_learning/data/test_dataset_breast_cancer.csv"
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "api.json")
+
+ROUTES = ("post_patient", "get_patient", "get_patients", "delete_patient")
+DEFAULT_MIX = "post_patient=2,get_patient=5,get_patients=2,delete_patient=1"
+
+# Rows inserted per statement while seeding
+SEED_CHUNK_SIZE = 10_000
+
+
+def load_features() -> list:
+    """
+    Returns the feature rows of the test dataset, used as request payloads.
+    """
+    with open(PATH_DATASET, newline="") as file:
+        rows = list(csv.DictReader(file))
+    for row in rows:
+        row.pop("diagnosis")
+    return rows
+
+
+def parse_mix(text: str) -> dict:
+    """
+    Parses a payload mix such as "get_patient=5,post_patient=1" into weights by route.
+    """
+    mix = {}
+    for item in text.split(","):
+        route, _, weight = item.partition("=")
+        if route not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown route {route!r}, expected one of {', '.join(ROUTES)}")
+        mix[route] = float(weight or 1)
+    return mix
+
+
+def seed(rows: int, features: list, prefix: str = "patient", start: int = 0):
+    """
+    Inserts patients named {prefix}-{start} to {prefix}-{rows - 1}, reusing the dataset's features.
+    """
+    with Session.session_factory() as session:
+        for chunk_start in range(start, rows, SEED_CHUNK_SIZE):
+            values = [
+                {**features[i % len(features)], "name": f"{prefix}-{i}", "diagnosis": i % 2}
+                for i in range(chunk_start, min(chunk_start + SEED_CHUNK_SIZE, rows))
+            ]
+            session.execute(insert(Patient), values)
+            session.commit()
+
+
+class ClientTransport:
+    """
+    Sends requests through Flask's test client, one client per thread.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, query: dict = None, form: dict = None) -> int:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client.open(path, method=method, query_string=query, data=form).status_code
+
+    def close(self):
+        pass
+
+
+class ServerTransport:
+    """
+    Sends HTTP requests over one keep-alive connection per thread, to --url or
+    to a threaded server started on a free local port.
+    """
+
+    def __init__(self, app, url: str = None):
+        self.server = None
+        if url is None:
+            # Keep the server's per-request log lines out of the timings
+            logging.getLogger("werkzeug").setLevel(logging.WARNING)
+            self.server = make_server("127.0.0.1", 0, app, threaded=True)
+            threading.Thread(target=self.server.serve_forever, name="bench-server", daemon=True).start()
+            url = f"http://127.0.0.1:{self.server.server_port}"
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, query: dict = None, form: dict = None) -> int:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port)
+        if query:
+            path = f"{path}?{urlencode(query)}"
+        body, headers = None, {}
+        if form:
+            body = urlencode(form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            # Reconnect on the next request of this thread
+            connection.close()
+            self._local.connection = None
+            raise
+        return response.status
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+
+def run(transport, operations: list, concurrency: int, rows: int, features: list, tag: str) -> dict:
+    """
+    Sends the operations from `concurrency` threads and times each request.
+
+    Args:
+        transport: ClientTransport or ServerTransport.
+        operations (list): Route of each request, in the order they are sent.
+        concurrency (int): Number of threads sending requests.
+        rows (int): Number of seeded patients, looked up by GET /patient.
+        features (list): Feature rows posted by POST /patient.
+        tag (str): Prefix of the names created and deleted by this run.
+
+    Returns:
+        dict: Latencies in seconds and error counts by route, and the wall time of the run.
+    """
+    created = itertools.count()
+    deleted = itertools.count()
+    latencies = {route: [] for route in ROUTES}
+    errors = {route: 0 for route in ROUTES}
+    lock = threading.Lock()
+
+    def send(route: str):
+        if route == "post_patient":
+            i = next(created)
+            request = ("POST", "/patient", None, {**features[i % len(features)], "name": f"{tag}-new-{i}"})
+        elif route == "get_patient":
+            request = ("GET", "/patient", {"name": f"patient-{random.randrange(rows)}"}, None)
+        elif route == "get_patients":
+            request = ("GET", "/patients", {"limit": 100, "after": random.randrange(rows)}, None)
+        else:
+            request = ("DELETE", "/patient", {"name": f"{tag}-delete-{next(deleted)}"}, None)
+
+        started = time.perf_counter()
+        try:
+            ok = transport.request(*request) == 200
+        except Exception:
+            ok = False
+        latency = time.perf_counter() - started
+        with lock:
+            latencies[route].append(latency)
+            errors[route] += not ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, operations))
+    return {"latencies": latencies, "errors": errors, "elapsed": time.perf_counter() - started}
+
+
+def summarize(measurements: dict) -> dict:
+    """
+    Returns the request count, errors, throughput and p50/p95/p99 latencies of each route.
+    """
+    elapsed = measurements["elapsed"]
+    summary = {}
+    everything = []
+    for route in ROUTES:
+        latencies = measurements["latencies"][route]
+        everything.extend(latencies)
+        if latencies:
+            summary[route] = _route_summary(latencies, measurements["errors"][route], elapsed)
+    summary["total"] = _route_summary(everything, sum(measurements["errors"].values()), elapsed)
+    return summary
+
+
+def _route_summary(latencies: list, errors: int, elapsed: float) -> dict:
+    """
+    Returns the statistics of one route's latencies.
+    """
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3)
+    }
+
+
+def compare(summary: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Returns a message per route whose p95 latency or throughput regressed.
+
+    Args:
+        summary (dict): Statistics of the run, by route.
+        baseline (dict): Baseline statistics of the same configuration, by route.
+        tolerance (float): Allowed relative degradation, e.g. 0.25 for 25%.
+    """
+    regressions = []
+    for route, stats in summary.items():
+        if route not in baseline:
+            continue
+        expected = baseline[route]
+        if stats["errors"] > expected.get("errors", 0):
+            regressions.append(f"{route}: {stats['errors']} errors (baseline {expected.get('errors', 0)})")
+        if stats["p95_ms"] > expected["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{route}: p95 {stats['p95_ms']:.2f} ms (baseline {expected['p95_ms']:.2f} ms)")
+        if stats["throughput"] < expected["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{route}: {stats['throughput']:.1f} req/s (baseline {expected['throughput']:.1f} req/s)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the API and compare it with a baseline.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000], help="Seeded patients")
+    parser.add_argument("--requests", type=int, default=2_000, help="Requests per database size")
+    parser.add_argument("--concurrency", type=int, default=8, help="Threads sending requests")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help="Weights of the routes")
+    parser.add_argument("--transport", choices=("client", "server"), default="client")
+    parser.add_argument("--url", help="Base URL of a running API, for the server transport")
+    parser.add_argument("--seed", type=int, default=7, help="Seed of the request sequence")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Path of the baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--output", help="Path of a JSON file receiving the results")
+    args = parser.parse_args()
+
+    app = create_app()
+    transport = ServerTransport(app, args.url) if args.transport == "server" else ClientTransport(app)
+    features = load_features()
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baselines = json.load(file)
+
+    results = {}
+    regressions = []
+    seeded = 0
+    try:
+        for rows in sorted(args.rows):
+            operations = rng.choices(list(args.mix), weights=list(args.mix.values()), k=args.requests)
+            tag = f"bench-{rows}"
+            warmup = operations[:args.concurrency * 10]
+            # Each database size tops up the patients seeded for the previous one
+            seed(rows, features, start=seeded)
+            seeded = rows
+            seed(warmup.count("delete_patient"), features, prefix=f"{tag}-warmup-delete")
+            seed(operations.count("delete_patient"), features, prefix=f"{tag}-delete")
+
+            run(transport, warmup, args.concurrency, rows, features, f"{tag}-warmup")
+            summary = summarize(run(transport, operations, args.concurrency, rows, features, tag))
+
+            key = f"{args.transport}/rows={rows}/concurrency={args.concurrency}"
+            results[key] = summary
+            print(f"\n{key}")
+            print(f"{'route':<16}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+            for route, stats in summary.items():
+                print(
+                    f"{route:<16}{stats['requests']:>10}{stats['errors']:>8}{stats['throughput']:>10.1f}"
+                    f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+                )
+            if key in baselines and not args.update_baseline:
+                regressions.extend(f"{key} {message}" for message in compare(summary, baselines[key], args.tolerance))
+    finally:
+        transport.close()
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.update_baseline:
+        baselines.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(baselines, file, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+    elif regressions:
+        print("\nRegressions against the baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
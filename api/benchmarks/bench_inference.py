@@ -0,0 +1,165 @@
+"""
+Measures the prediction latency and throughput of each serving backend.
+
+Backends:
+    sklearn_pipeline: Pipeline.predict of svc_breast_cancer_pipeline.pkl.
+    sklearn_pipeline_mmap: The same pipeline loaded from its memory-mapped artifact.
+    scaler_model: The standalone scaler followed by svc_breast_cancer_classification.pkl,
+        the path used by test_models.py.
+    compiled: CompiledPipeline, the NumPy engine the API serves with.
+
+Each backend scores batches of 1, 8, 64, 1024 and 65536 rows drawn from the
+test dataset. Per batch size, the median, p95 and minimum latency of a call
+and the rows scored per second are written to inference.json and
+inference.csv, with the library versions and the machine they were measured
+on, so a model or backend change can be judged on speed as well as accuracy.
+
+Run it from the api directory:
+
+    python -m benchmarks.bench_inference --output-dir benchmarks/results
+"""
+import argparse
+import csv
+import datetime
+import json
+import os
+import platform
+import time
+import warnings
+
+import numpy as np
+import sklearn
+
+from model import CompiledPipeline, Loader, Model, Pipeline
+from model.preprocessor import FEATURES
+
+PATH_DATASET = "./machine_learning/data/test_dataset_breast_cancer.csv"
+PATH_PIPELINE = "./machine_learning/pipelines/svc_breast_cancer_pipeline.pkl"
+PATH_PIPELINE_ARTIFACT = "./machine_learning/pipelines/svc_breast_cancer_pipeline/manifest.json"
+PATH_MODEL = "./machine_learning/models/svc_breast_cancer_classification.pkl"
+PATH_SCALER = "./machine_learning/scalers/standard_scaler_breast_cancer.pkl"
+
+BATCH_SIZES = [1, 8, 64, 1024, 65536]
+
+
+class ScalerModel:
+    """
+    Scales the rows with the standalone scaler, then predicts with the standalone model.
+    """
+
+    def __init__(self, scaler, model):
+        self.scaler = scaler
+        self.model = model
+
+    def predict(self, X_input: np.ndarray) -> np.ndarray:
+        return self.model.predict(self.scaler.transform(X_input))
+
+
+def load_backends() -> dict:
+    """
+    Returns the available backends by name; those whose files are missing are skipped.
+    """
+    pipeline = Pipeline.load_pipeline(PATH_PIPELINE)
+    backends = {"sklearn_pipeline": pipeline}
+    if os.path.exists(PATH_PIPELINE_ARTIFACT):
+        backends["sklearn_pipeline_mmap"] = Pipeline.load_pipeline(PATH_PIPELINE_ARTIFACT)
+    backends["scaler_model"] = ScalerModel(Model.load_model(PATH_SCALER), Model.load_model(PATH_MODEL))
+    try:
+        backends["compiled"] = CompiledPipeline.compile(pipeline)
+    except ValueError as e:
+        print(f"Skipping the compiled backend: {e}")
+    return backends
+
+
+def measure(backend, X_input: np.ndarray, min_time: float, min_calls: int) -> dict:
+    """
+    Times predict calls on the batch until both min_time seconds and min_calls calls are reached.
+
+    Returns:
+        dict: Number of calls, median/p95/min latency in milliseconds and rows per second.
+    """
+    backend.predict(X_input)
+    timings = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < min_calls or time.perf_counter() < deadline:
+        started = time.perf_counter()
+        backend.predict(X_input)
+        timings.append(time.perf_counter() - started)
+
+    timings = np.asarray(timings)
+    median = float(np.median(timings))
+    return {
+        "calls": len(timings),
+        "median_ms": round(median * 1000, 4),
+        "p95_ms": round(float(np.percentile(timings, 95)) * 1000, 4),
+        "min_ms": round(float(timings.min()) * 1000, 4),
+        "rows_per_second": round(len(X_input) / median, 1)
+    }
+
+
+def environment() -> dict:
+    """
+    Returns the versions and machine the results were measured with.
+    """
+    return {
+        "measured_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prediction latency of each serving backend.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES, help="Rows per call")
+    parser.add_argument("--backends", nargs="+", help="Backends to measure (defaults to every available one)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds spent timing each batch size")
+    parser.add_argument("--min-calls", type=int, default=5, help="Fewest calls timed per batch size")
+    parser.add_argument("--output-dir", default="benchmarks/results", help="Directory of the result files")
+    parser.add_argument("--seed", type=int, default=7, help="Seed of the row sampling")
+    args = parser.parse_args()
+
+    # Scoring plain arrays with estimators fitted on data frames warns on every call
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+    # The header names the columns; select the features in the order the model scores them
+    dataset = Loader().load_data(PATH_DATASET)[FEATURES]
+    X_dataset = np.ascontiguousarray(dataset.values, dtype=np.float64)
+    rng = np.random.default_rng(args.seed)
+
+    backends = load_backends()
+    if args.backends:
+        backends = {name: backends[name] for name in args.backends}
+
+    # Every backend scores the same rows; agreement is measured against the sklearn pipeline
+    reference = backends.get("sklearn_pipeline") or next(iter(backends.values()))
+    y_reference = reference.predict(X_dataset)
+
+    results = []
+    print(f"{'backend':<24}{'rows':>8}{'median ms':>12}{'p95 ms':>10}{'rows/s':>14}")
+    for name, backend in backends.items():
+        agreement = float(np.mean(backend.predict(X_dataset) == y_reference))
+        for batch_size in args.batch_sizes:
+            X_input = np.ascontiguousarray(X_dataset[rng.integers(len(X_dataset), size=batch_size)])
+            stats = measure(backend, X_input, args.min_time, args.min_calls)
+            results.append({"backend": name, "batch_size": batch_size, "agreement": agreement, **stats})
+            print(
+                f"{name:<24}{batch_size:>8}{stats['median_ms']:>12.4f}{stats['p95_ms']:>10.4f}"
+                f"{stats['rows_per_second']:>14.1f}"
+            )
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    with open(os.path.join(args.output_dir, "inference.json"), "w") as file:
+        json.dump({"environment": environment(), "results": results}, file, indent=2)
+    with open(os.path.join(args.output_dir, "inference.csv"), "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"\nResults written to {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Compares the cost of listing patients through ORM objects and hand-built
+dictionaries encoded by the standard library (the original GET /patients path)
+with selecting plain row tuples encoded by the fast encoder.
+
+Run it from the api directory:
+
+    python -m benchmarks.bench_serialization --rows 10000 100000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+# Keep the benchmark away from the real database
+os.environ.setdefault("DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')}")
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from model import Base, Patient
+from schemas import VIEW_COLUMNS, dumps, present_patients, present_rows
+
+
+def seed(session_factory, rows: int):
+    """
+    Inserts the given number of synthetic patients.
+    """
+    values = [
+        {
+            "name": f"patient-{i}",
+            "concave_points_worst": 0.2654,
+            "perimeter_worst": 184.6,
+            "concave_points_mean": 0.1471,
+            "radius_worst": 25.38,
+            "perimeter_mean": 122.8,
+            "area_worst": 2019.0,
+            "radius_mean": 17.99,
+            "area_mean": 1001.0,
+            "diagnosis": i % 2
+        }
+        for i in range(rows)
+    ]
+    with session_factory() as session:
+        session.execute(insert(Patient), values)
+        session.commit()
+
+
+def orm_stdlib(session_factory) -> bytes:
+    """
+    Original path: hydrate Patient objects, build dicts by hand, encode with json.
+    """
+    with session_factory() as session:
+        patients = session.query(Patient).all()
+        return json.dumps(present_patients(patients)).encode()
+
+
+def rows_fast(session_factory) -> bytes:
+    """
+    New path: select plain row tuples and encode them with the fast encoder.
+    """
+    with session_factory() as session:
+        columns = [getattr(Patient, column) for column in VIEW_COLUMNS]
+        rows = session.execute(select(*columns).order_by(Patient.id)).all()
+        return dumps({"patients": present_rows(rows)})
+
+
+def measure(function, session_factory, repeat: int) -> float:
+    """
+    Returns the best wall time of the given number of runs, in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(session_factory)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark patient listing serialization.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'orm+json (ms)':>14} {'rows+fast (ms)':>15} {'speedup':>8}")
+    for rows in args.rows:
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        seed(session_factory, rows)
+
+        assert json.loads(orm_stdlib(session_factory)) == json.loads(rows_fast(session_factory))
+        baseline = measure(orm_stdlib, session_factory, args.repeat)
+        optimized = measure(rows_fast, session_factory, args.repeat)
+        print(f"{rows:>8} {baseline:>14.1f} {optimized:>15.1f} {baseline / optimized:>7.1f}x")
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
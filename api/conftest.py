@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# Point the API at a throwaway database before the app module is imported
+os.environ.setdefault(
+    "DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'patients.sqlite3')}"
+)
+
+# Let tests import the training modules of the notebooks (model_compressor, train_pipeline...)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "machine_learning", "notebooks"))
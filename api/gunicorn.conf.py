@@ -0,0 +1,44 @@
+"""
+Gunicorn configuration of the API.
+
+Run it from the api directory:
+
+    gunicorn -c gunicorn.conf.py
+
+The app factory runs once in the master process (preload_app), so the ML
+pipeline is unpickled a single time and every worker forks with it already
+in memory. Worker startup no longer deserializes the model, and the model's
+pages stay shared copy-on-write between workers instead of being duplicated.
+"""
+import gc
+import multiprocessing
+import os
+
+wsgi_app = "app:create_app()"
+preload_app = True
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+
+def when_ready(server):
+    """
+    Runs in the master after the app was preloaded and before workers are forked.
+
+    Moves every object allocated so far out of the garbage collector's reach.
+    Otherwise the first collection in each worker writes to the header of every
+    shared object, which copies all of its pages into the worker.
+    """
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """
+    Runs in each worker right after it is forked.
+
+    Database connections opened by the master must not be used by several
+    processes, so the worker drops them and opens its own.
+    """
+    from model import engine
+    engine.dispose(close=False)
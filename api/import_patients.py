@@ -0,0 +1,72 @@
+"""
+Imports patients from a CSV or Parquet file, predicting their diagnoses in chunks.
+
+Run it from the api directory, e.g.:
+
+    python import_patients.py machine_learning/data/test_dataset_breast_cancer.csv
+
+The diagnoses are predicted by the model version the API serves: the newest
+version of MODEL_VERSIONS_PATH that loads and was trained on the API's
+features, else PIPELINE_PATH, so a row gets the same diagnosis whichever way
+it is imported.
+
+If the import fails midway, running the same command again resumes at the
+chunk that failed.
+"""
+import argparse
+
+from app import MODEL_VERSIONS_PATH, PIPELINE_PATH, PatientService
+from model import (
+    DB_SETUP_ON_START, IMPORT_CHECKPOINT_PATH, IMPORT_CHUNK_SIZE, Importer, ModelRegistry, Session, engine,
+    file_version, setup_database
+)
+
+
+def resolve_model(pipeline_path: str = None, versions_dir: str = MODEL_VERSIONS_PATH,
+                  fallback_path: str = PIPELINE_PATH):
+    """
+    Loads the model version the import scores with.
+
+    Args:
+        pipeline_path (str): Pipeline to use instead of the version the API serves.
+        versions_dir (str): Directory of the versions served by the API.
+        fallback_path (str): Pipeline served while the directory holds no valid version.
+
+    Returns:
+        ModelVersion: The loaded version, checked against the API's features.
+    """
+    if pipeline_path:
+        return PatientService._load_version(file_version(pipeline_path), pipeline_path)
+    return ModelRegistry(versions_dir, fallback_path, PatientService._load_version, poll_interval=0).active
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import patients from a CSV or Parquet file.")
+    parser.add_argument("path", help="Path of the .csv or .parquet file to import")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--name-prefix", help="Prefix of generated names (defaults to the file name)")
+    parser.add_argument("--pipeline", help="Path of a trained pipeline to use instead of the version the API serves")
+    args = parser.parse_args()
+
+    if DB_SETUP_ON_START:
+        setup_database(engine)
+    model = resolve_model(args.pipeline)
+    print(f"Scoring with model version {model.version} ({model.path})")
+    importer = Importer(
+        Session.session_factory, model.engine, IMPORT_CHECKPOINT_PATH, args.chunk_size, model_version=model.version
+    )
+    try:
+        summary = importer.import_file(
+            args.path, args.name_prefix,
+            progress=lambda summary: print(
+                f"chunk {summary['chunks']}: {summary['rows']} rows read, "
+                f"{summary['inserted']} inserted, {summary['skipped']} skipped, {summary['invalid']} invalid"
+            )
+        )
+    finally:
+        model.close()
+    print(f"Done: {summary}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,62 +1,199 @@
+import atexit
+import contextvars
+import copy
+import datetime
+import json
 import logging
 import os
-from logging.config import dictConfig
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # Define the path for log files
 log_path = "log/"
 
+# Level of the application loggers; debug records below it are dropped before being formatted
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+
+# Size at which a log file is rotated, and number of rotated files kept
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get("LOG_BACKUP_COUNT", 5))
+
+# Identifier of the request being served by the current thread, added to every record
+request_id = contextvars.ContextVar("request_id", default=None)
+
+# Formats the tracebacks of records before they are handed to a listener thread
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+# Attributes every LogRecord has; any other attribute was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line.
+
+    Besides the time, level, origin and message of the record, the object holds
+    the id of the request it was logged in and every field passed through
+    `extra` (e.g. method, route, status and latency_ms of access records).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "function": record.funcName,
+            "line": record.lineno,
+            "path": record.pathname,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None)
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Adds the id of the current request to a record, on the thread that logged it.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class AsyncHandler(QueueHandler):
+    """
+    Hands records to a background thread, which writes them to the wrapped handlers.
+
+    The logging thread only formats the message and puts the record in a queue,
+    so file writes and rotations never add to the latency of a request. The
+    listener thread is started on the first record, again in a forked child
+    whose parent owned it (e.g. the gunicorn workers of a preloaded app).
+    """
+
+    def __init__(self, *handlers: logging.Handler):
+        """
+        Args:
+            *handlers (logging.Handler): Handlers writing the records, each with its own level.
+        """
+        super().__init__(queue.SimpleQueue())
+        self.handlers = handlers
+        self.listener = None
+        self._pid = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self.addFilter(RequestIdFilter())
+
+    def emit(self, record: logging.LogRecord):
+        if self._closed:
+            # Records logged at interpreter exit, after the listener stopped, are written directly
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            return
+        self._ensure_listener()
+        super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Returns a copy of the record whose message is merged with its arguments,
+        as QueueHandler does, but whose traceback is kept in exc_text instead of
+        being appended to the message, so the JSON files get it as a field.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def close(self):
+        """
+        Writes the queued records and stops the listener thread.
+        """
+        with self._lock:
+            self._closed = True
+            if self.listener is not None and self._pid == os.getpid():
+                self.listener.stop()
+            self.listener = None
+        super().close()
+
+    def _ensure_listener(self):
+        """
+        Starts the listener thread, again in a forked child whose parent owned it.
+        """
+        if self.listener is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self.listener is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self.queue = queue.SimpleQueue()
+                self.listener = QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+                self.listener.start()
+
+
+class StdoutHandler(logging.StreamHandler):
+    """
+    Writes records to the current sys.stdout, even if it was replaced after
+    the handler was created (e.g. by a test runner capturing the output).
+    """
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, stream):
+        pass
+
+
+def _file_handler(filename: str) -> RotatingFileHandler:
+    """
+    Returns a handler writing JSON records to a file of the log directory, rotated by size.
+    """
+    handler = RotatingFileHandler(
+        os.path.join(log_path, filename), maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True
+    )
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
 # Check if the directory for storing logs exists
 if not os.path.exists(log_path):
     # Create the directory if it does not exist
     os.makedirs(log_path)
 
-# Configure logging
-dictConfig({
-    "version": 1,
-    "disable_existing_loggers": True,
-    "formatters": {
-        "default": {
-            "format": "[%(asctime)s] %(levelname)-4s %(funcName)s() L%(lineno)-4d %(message)s",
-        },
-        "detailed": {
-            "format": "[%(asctime)s] %(levelname)-4s %(funcName)s() L%(lineno)-4d %(message)s - call_trace=%(pathname)s L%(lineno)-4d",
-        }
-    },
-    "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "default",
-            "stream": "ext://sys.stdout",
-        },
-        "error_file": {
-            "class": "logging.handlers.RotatingFileHandler",
-            "formatter": "detailed",
-            "filename": "log/gunicorn.error.log",
-            "maxBytes": 10000,
-            "backupCount": 10,
-            "delay": True,
-        },
-        "detailed_file": {
-            "class": "logging.handlers.RotatingFileHandler",
-            "formatter": "detailed",
-            "filename": "log/gunicorn.detailed.log",
-            "maxBytes": 10000,
-            "backupCount": 10,
-            "delay": True,
-        }
-    },
-    "loggers": {
-        "gunicorn.error": {
-            "handlers": ["console", "error_file"],
-            "level": "INFO",
-            "propagate": False,
-        }
-    },
-    "root": {
-        "handlers": ["console", "detailed_file"],
-        "level": "INFO",
-    }
-})
+# Configure logging: console lines for humans, JSON lines in the files, all written by listener threads
+console = StdoutHandler()
+console.setFormatter(logging.Formatter(
+    "[%(asctime)s] %(levelname)-4s %(funcName)s() L%(lineno)-4d %(message)s request_id=%(request_id)s"
+))
+
+root_handler = AsyncHandler(console, _file_handler("gunicorn.detailed.log"))
+root = logging.getLogger()
+root.addHandler(root_handler)
+root.setLevel(LOG_LEVEL)
+
+error_handler = AsyncHandler(console, _file_handler("gunicorn.error.log"))
+gunicorn_error = logging.getLogger("gunicorn.error")
+gunicorn_error.addHandler(error_handler)
+gunicorn_error.setLevel("INFO")
+gunicorn_error.propagate = False
+
+atexit.register(root_handler.close)
+atexit.register(error_handler.close)
 
 # Create a logger instance
 logger = logging.getLogger(__name__)
+
+# Logger of the access records: one per request, with its method, route, status and latency
+access_logger = logging.getLogger("access")
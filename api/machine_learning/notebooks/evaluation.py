@@ -0,0 +1,133 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from joblib import Parallel, delayed
+from matplotlib.figure import Figure
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import check_cv
+
+
+def cross_validate_parallel(estimators, X, y, kfold, scoring='accuracy', n_jobs=None):
+    """
+    Cross-validates several estimators at once, with one task per estimator and fold.
+
+    All the (estimator, fold) fits are submitted to a single joblib process pool,
+    so a slow model does not keep the other cores idle as a loop of
+    cross_val_score calls would.
+
+    Args:
+        estimators (list of tuples): (name, estimator) pairs to evaluate.
+        X (pd.DataFrame): Training features.
+        y (pd.Series): Training target.
+        kfold (int or StratifiedKFold): Cross-validation strategy.
+        scoring (str): Scoring method for evaluation.
+        n_jobs (int): Number of worker processes (None runs sequentially, -1 uses all cores).
+
+    Returns:
+        dict: For each estimator name, its per-fold scores, fit times and score times (in seconds).
+    """
+    folds = list(check_cv(kfold, y, classifier=True).split(X, y))
+    outcomes = Parallel(n_jobs=n_jobs)(
+        delayed(fit_and_score)(estimator, X, y, train, test, scoring)
+        for _, estimator in estimators
+        for train, test in folds
+    )
+
+    results = {}
+    for index, (name, _) in enumerate(estimators):
+        scores, fit_times, score_times = zip(*outcomes[index * len(folds):(index + 1) * len(folds)])
+        results[name] = {
+            'scores': np.array(scores),
+            'fit_times': np.array(fit_times),
+            'score_times': np.array(score_times)
+        }
+    return results
+
+
+def write_results(path, results, scoring):
+    """
+    Writes cross-validation results to a JSON file.
+
+    Args:
+        path (str): Destination file.
+        results (dict): Results returned by cross_validate_parallel.
+        scoring (str): Scoring method used for evaluation.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    report = {
+        'scoring': scoring,
+        'results': [
+            {
+                'name': name,
+                'mean_score': float(result['scores'].mean()),
+                'std_score': float(result['scores'].std()),
+                'scores': result['scores'].tolist(),
+                'fit_times': result['fit_times'].tolist(),
+                'score_times': result['score_times'].tolist()
+            }
+            for name, result in results.items()
+        ]
+    }
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2)
+
+
+def save_boxplot(path, data, labels, title, figsize, rotation=0):
+    """
+    Renders a boxplot straight to an image file.
+
+    The figure is built without pyplot, so it never opens a window or needs a
+    display, whatever the active backend is.
+
+    Args:
+        path (str): Destination image file.
+        data (list): One array of scores per box.
+        labels (list): One label per box.
+        title (str): Title of the figure.
+        figsize (tuple): Size of the figure in inches.
+        rotation (int): Rotation of the labels in degrees.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    fig = Figure(figsize=figsize)
+    fig.suptitle(title)
+    ax = fig.subplots()
+    ax.boxplot(data)
+    ax.set_xticks(range(1, len(labels) + 1), labels, rotation=rotation)
+    fig.savefig(path, bbox_inches='tight')
+
+
+def fit_and_score(estimator, X, y, train, test, scoring, params=None):
+    """
+    Fits a copy of the estimator on one fold and scores it.
+
+    Shared by cross_validate_parallel and ModelOptimizer, so both evaluate a fold the same way.
+
+    Args:
+        estimator: The estimator or pipeline to evaluate (it is not modified).
+        X (pd.DataFrame or np.ndarray): Training features.
+        y (pd.Series or np.ndarray): Training target.
+        train (np.ndarray): Positions of the rows the copy is fitted on.
+        test (np.ndarray): Positions of the rows it is scored on.
+        scoring (str): Scoring method for evaluation.
+        params (dict): Parameters set on the copy before fitting it.
+
+    Returns:
+        tuple: The score, the fit time and the score time of the fold.
+    """
+    estimator = clone(estimator).set_params(**(params or {}))
+    start = time.perf_counter()
+    estimator.fit(_take(X, train), _take(y, train))
+    fitted = time.perf_counter()
+    score = get_scorer(scoring)(estimator, _take(X, test), _take(y, test))
+    return score, fitted - start, time.perf_counter() - fitted
+
+
+def _take(data, indices):
+    """
+    Returns the rows of a DataFrame, Series or array at the given positions.
+    """
+    return data.iloc[indices] if hasattr(data, 'iloc') else np.take(data, indices, axis=0)
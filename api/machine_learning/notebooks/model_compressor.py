@@ -0,0 +1,236 @@
+import copy
+
+import numpy as np
+from scipy.optimize import minimize
+from sklearn.metrics import accuracy_score
+from sklearn.metrics.pairwise import rbf_kernel
+from sklearn.pipeline import Pipeline
+
+
+class ModelCompressor:
+    """
+    A class for shrinking a fitted StandardScaler -> SVC pipeline before it is saved,
+    so its decision function is cheaper to evaluate at serving time.
+
+    - Linear SVCs are collapsed into a single weight vector with the scaler folded
+      in: scoring a row costs O(n_features) instead of O(n_support_vectors).
+    - RBF SVCs can have their support vectors pruned, as long as accuracy stays
+      within a tolerance. The coefficients of the kept support vectors are refitted
+      on the training rows so the pruned decision function stays as close as
+      possible to the original; accuracy is only measured on held-out rows.
+
+    The result is still a StandardScaler -> SVC pipeline, so it is saved with
+    ModelSaver and served by the API like any other.
+
+    Attributes:
+        X_train (array-like): Rows the pipeline was fitted on, used to refit pruned coefficients.
+        X_val (array-like): Held-out features used to check and calibrate the compressed model.
+        y_val (array-like): Held-out labels used to check and calibrate the compressed model.
+        tolerance (float): Largest accuracy drop accepted when pruning support vectors.
+        min_accuracy (float): Accuracy the compressed model must keep (the threshold of test_models.py).
+    """
+
+    def __init__(self, X_train, X_val, y_val, tolerance=0.01, min_accuracy=0.94):
+        """
+        Initializes the ModelCompressor with training rows, held-out data and accuracy constraints.
+
+        Args:
+            X_train (array-like): Training features of the pipeline.
+            X_val (array-like): Held-out features, not seen by the pipeline.
+            y_val (array-like): Held-out labels.
+            tolerance (float): Largest accuracy drop accepted when pruning support vectors.
+            min_accuracy (float): Accuracy the compressed model must keep.
+        """
+        self.X_train = X_train
+        self.X_val = X_val
+        self.y_val = np.asarray(y_val)
+        self.tolerance = tolerance
+        self.min_accuracy = min_accuracy
+
+    def compress(self, pipeline, prune=False):
+        """
+        Returns a cheaper equivalent of the pipeline: collapsed when its kernel is
+        linear, pruned when its kernel is RBF and prune is True, unchanged otherwise
+        (including when its final estimator is not an SVC).
+
+        Args:
+            pipeline (Pipeline): Fitted StandardScaler -> SVC pipeline.
+            prune (bool): Whether support vectors of RBF models may be removed.
+
+        Returns:
+            Pipeline: The compressed pipeline.
+        """
+        svc = pipeline.steps[-1][1]
+        if not hasattr(svc, 'support_vectors_'):
+            return pipeline
+        if svc.kernel == 'linear':
+            compressed = self.collapse_linear(pipeline)
+        elif svc.kernel == 'rbf' and prune:
+            compressed = self.prune_support_vectors(pipeline)
+        else:
+            compressed = pipeline
+
+        n_before = len(svc.support_vectors_)
+        n_after = len(compressed.steps[-1][1].support_vectors_)
+        print(f"Kernel: {svc.kernel} - Support vectors: {n_before} -> {n_after} - "
+              f"Accuracy: {self._accuracy(pipeline):.4f} -> {self._accuracy(compressed):.4f}")
+        return compressed
+
+    @staticmethod
+    def collapse_linear(pipeline):
+        """
+        Folds the scaler and every support vector of a linear SVC into one weight vector.
+
+        The decision function sum_i a_i <sv_i, (x - mean) / scale> + b equals
+        <w / scale, x> + b - <w, mean / scale> with w = sum_i a_i sv_i. The result
+        is an SVC with a single weight vector as support vector (plus a zero vector,
+        as libsvm expects one per class) behind an identity scaler. The decision
+        values are unchanged, so the Platt scaling of predict_proba still holds.
+
+        Args:
+            pipeline (Pipeline): Fitted StandardScaler -> SVC pipeline with a linear kernel.
+
+        Returns:
+            Pipeline: An equivalent pipeline with two support vectors.
+        """
+        scaler, svc = pipeline.steps[0][1], pipeline.steps[-1][1]
+        weights = svc.dual_coef_[0] @ svc.support_vectors_ / scaler.scale_
+        bias = svc.intercept_[0] - weights @ scaler.mean_
+
+        identity = copy.deepcopy(scaler)
+        identity.mean_ = np.zeros_like(scaler.mean_)
+        identity.var_ = np.ones_like(scaler.var_)
+        identity.scale_ = np.ones_like(scaler.scale_)
+
+        collapsed = copy.deepcopy(svc)
+        ModelCompressor._set_support_vectors(
+            collapsed, np.vstack([weights, np.zeros_like(weights)]), np.array([1.0, 0.0]), bias,
+            support=np.array([-1, -1]), n_support=np.array([1, 1])
+        )
+        return Pipeline([(pipeline.steps[0][0], identity), (pipeline.steps[-1][0], collapsed)])
+
+    def prune_support_vectors(self, pipeline):
+        """
+        Keeps the fewest support vectors whose accuracy on the held-out data
+        stays within the tolerance of the original model and above min_accuracy,
+        and whose predictions on the training rows differ from the original ones
+        for at most a tolerance share of them (a small held-out set alone can
+        accept a model that no longer generalizes).
+
+        Support vectors are kept in order of decreasing |dual coefficient|, taking
+        each class in turn. Dropping some of them unbalances the others, so the
+        dual coefficients and intercept of the kept ones are refitted by least
+        squares to reproduce the original decision values on the training rows.
+        Accuracy does not necessarily drop steadily as support vectors are removed,
+        so every count is tried, from the fewest up, and the first one meeting the
+        requirement is kept. The pruned decision values differ from the original
+        ones, so when the SVC has probability estimates its Platt scaling is
+        refitted on the held-out data.
+
+        Args:
+            pipeline (Pipeline): Fitted StandardScaler -> SVC pipeline with an RBF kernel.
+
+        Returns:
+            Pipeline: The pruned pipeline, or the original one if nothing can be removed.
+        """
+        scaler, svc = pipeline.steps[0][1], pipeline.steps[-1][1]
+        required = max(self._accuracy(pipeline) - self.tolerance, self.min_accuracy)
+        order = self._support_vector_order(svc)
+        references = np.vstack([scaler.transform(self.X_train), svc.support_vectors_])
+        targets = svc.decision_function(references)
+        predictions = pipeline.predict(self.X_train)
+
+        for count in range(len(svc._n_support), len(order)):
+            candidate = self._keep(pipeline, np.sort(order[:count]), references, targets)
+            agreement = np.mean(candidate.predict(self.X_train) == predictions)
+            if agreement >= 1 - self.tolerance and self._accuracy(candidate) >= required:
+                if svc.probability:
+                    self._calibrate(candidate)
+                return candidate
+        return pipeline
+
+    @staticmethod
+    def _support_vector_order(svc):
+        """
+        Returns the support vector indices by decreasing |dual coefficient|,
+        alternating between classes so every prefix keeps both of them.
+        """
+        boundaries = np.cumsum(svc._n_support)[:-1]
+        groups = np.split(np.arange(len(svc.support_vectors_)), boundaries)
+        ranked = [group[np.argsort(-np.abs(svc.dual_coef_[0][group]), kind='stable')] for group in groups]
+
+        order = []
+        for position in range(max(len(group) for group in ranked)):
+            order.extend(group[position] for group in ranked if position < len(group))
+        return np.array(order)
+
+    @staticmethod
+    def _keep(pipeline, kept, references, targets):
+        """
+        Returns a copy of the pipeline whose SVC only keeps the given (sorted)
+        support vectors, with coefficients refitted to the target decision values.
+        """
+        svc = pipeline.steps[-1][1]
+        support_vectors = svc.support_vectors_[kept]
+        kernel = rbf_kernel(references, support_vectors, gamma=svc._gamma)
+        design = np.hstack([kernel, np.ones((len(references), 1))])
+        solution = np.linalg.lstsq(design, targets, rcond=None)[0]
+
+        # Support vectors are stored grouped by class, _n_support[k] for class k
+        boundaries = np.cumsum(svc._n_support)[:-1]
+        class_of = np.searchsorted(boundaries, kept, side='right')
+        n_support = np.bincount(class_of, minlength=len(svc._n_support))
+
+        pruned = copy.deepcopy(svc)
+        ModelCompressor._set_support_vectors(
+            pruned, support_vectors, solution[:-1], solution[-1],
+            support=svc.support_[kept], n_support=n_support
+        )
+        return Pipeline([pipeline.steps[0], (pipeline.steps[-1][0], pruned)])
+
+    @staticmethod
+    def _set_support_vectors(svc, support_vectors, dual_coef, intercept, support, n_support):
+        """
+        Replaces the fitted decision function of a binary SVC, keeping sklearn's
+        public attributes and libsvm's internal (sign-flipped) ones consistent.
+        """
+        svc.support_vectors_ = np.ascontiguousarray(support_vectors, dtype=np.float64)
+        svc.dual_coef_ = np.ascontiguousarray(np.asarray(dual_coef, dtype=np.float64).reshape(1, -1))
+        svc._dual_coef_ = -svc.dual_coef_
+        svc.intercept_ = np.array([intercept], dtype=np.float64)
+        svc._intercept_ = -svc.intercept_
+        svc.support_ = np.asarray(support, dtype=np.int32)
+        svc._n_support = np.asarray(n_support, dtype=np.int32)
+
+    def _calibrate(self, pipeline):
+        """
+        Refits the Platt scaling of the pipeline's SVC on the held-out data.
+
+        For a binary SVC, libsvm computes P(classes_[1] | x) = 1 / (1 + exp(probA_ * f(x) - probB_))
+        from the decision value f(x). Following Platt, the sigmoid is fitted by
+        maximum likelihood against the regularized targets (N+ + 1) / (N+ + 2)
+        and 1 / (N- + 2), which keeps it finite on separable data.
+        """
+        svc = pipeline.steps[-1][1]
+        decision = pipeline.decision_function(self.X_val)
+        positive = self.y_val == svc.classes_[1]
+        n_positive, n_negative = positive.sum(), (~positive).sum()
+        target = np.where(positive, (n_positive + 1) / (n_positive + 2), 1 / (n_negative + 2))
+
+        # P(classes_[1]) = 1 / (1 + exp(z)) with z = a * f + b
+        def loss(parameters):
+            z = parameters[0] * decision + parameters[1]
+            weights = target - 1 / (1 + np.exp(z))
+            value = np.sum(target * np.logaddexp(0, z) + (1 - target) * np.logaddexp(0, -z))
+            return value, np.array([weights @ decision, weights.sum()])
+
+        start = np.array([0.0, np.log((n_negative + 1) / (n_positive + 1))])
+        a, b = minimize(loss, start, jac=True, method='BFGS').x
+        svc._probA = np.array([a], dtype=np.float64)
+        svc._probB = np.array([-b], dtype=np.float64)
+
+    def _accuracy(self, pipeline):
+        """
+        Returns the accuracy of the pipeline on the held-out data.
+        """
+        return accuracy_score(self.y_val, pipeline.predict(self.X_val))
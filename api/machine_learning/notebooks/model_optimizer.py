@@ -1,6 +1,13 @@
+import hashlib
+import json
+import os
+
 import numpy as np
+import sklearn
 
-from sklearn.model_selection import GridSearchCV
+from joblib import Memory, Parallel, delayed
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, ParameterGrid, ParameterSampler, check_cv
 from sklearn.naive_bayes import GaussianNB
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.pipeline import Pipeline
@@ -8,40 +15,85 @@ from sklearn.preprocessing import MinMaxScaler, StandardScaler
 from sklearn.svm import SVC
 from sklearn.tree import DecisionTreeClassifier
 
+from evaluation import fit_and_score
+
 np.random.seed(7)
 
+# Search strategies accepted by ModelOptimizer
+STRATEGIES = ('grid', 'random', 'halving')
+
 
 class ModelOptimizer:
     """
-    A class to optimize machine learning models using GridSearchCV with various preprocessing steps.
+    A class to optimize machine learning models with a hyperparameter search over various preprocessing steps.
+
+    Every (pipeline, parameters, fold) fit runs as its own joblib task, so the
+    search is spread over all cores across pipelines and folds at once. Fitted
+    scalers are cached on disk with joblib Memory and reused by every candidate
+    of the same fold, and the score of each candidate is persisted so a rerun
+    only evaluates the configurations it has not seen yet.
     """
 
-    def __init__(self, X_train, y_train, kfold=5, scoring='accuracy'):
+    def __init__(self, X_train, y_train, kfold=5, scoring='accuracy', strategy='grid', n_iter=10,
+                 n_jobs=-1, cache_dir='.cache/model_optimizer',
+                 results_path='.cache/model_optimizer/results.json', random_state=7, param_grids=None,
+                 pipeline_names=None):
         """
         Initialize the ModelOptimizer with training data, cross-validation settings, and scoring metric.
-        
+
         Parameters:
         - X_train: array-like, shape (n_samples, n_features)
             Training data features.
         - y_train: array-like, shape (n_samples,)
             Training data labels.
-        - kfold: int, default=5
-            Number of folds in cross-validation.
+        - kfold: int or cross-validation generator, default=5
+            Number of folds in cross-validation, or the splitter to use.
         - scoring: str, default='accuracy'
             Scoring metric for model evaluation.
+        - strategy: str, default='grid'
+            'grid' evaluates every candidate, 'random' n_iter sampled candidates per
+            pipeline and 'halving' runs a successive-halving grid search.
+        - n_iter: int, default=10
+            Number of candidates sampled per pipeline by the 'random' strategy.
+        - n_jobs: int, default=-1
+            Number of parallel jobs (-1 uses all cores).
+        - cache_dir: str or None, default='.cache/model_optimizer'
+            Directory where fitted preprocessing steps are cached (None disables the cache).
+        - results_path: str or None, default='.cache/model_optimizer/results.json'
+            File where candidate scores are persisted (None disables persistence).
+        - random_state: int, default=7
+            Seed of the 'random' and 'halving' strategies.
+        - param_grids: dict or None, default=None
+            Parameter grids by model name, replacing the default ones.
+        - pipeline_names: list or None, default=None
+            Names of the pipelines to optimize (e.g. 'SVM-std'); None optimizes all of them.
         """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy} (expected one of {', '.join(STRATEGIES)})")
+
         self.X_train = X_train
         self.y_train = y_train
         self.kfold = kfold
         self.scoring = scoring
+        self.strategy = strategy
+        self.n_iter = n_iter
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.memory = Memory(cache_dir, verbose=0) if cache_dir else None
+        self.results_path = results_path
+        self.results = self._load_results()
         self.models = self._initialize_models()
-        self.pipelines = self._create_pipelines()
-        self.param_grids = self._initialize_param_grids()
+        self.pipelines = [
+            (name, pipeline) for name, pipeline in self._create_pipelines()
+            if pipeline_names is None or name in pipeline_names
+        ]
+        self.param_grids = param_grids if param_grids is not None else self._initialize_param_grids()
+        self._definitions = {name: self._definition(pipeline) for name, pipeline in self.pipelines}
 
     def _initialize_models(self):
         """
         Initialize the models for optimization.
-        
+
         Returns:
         - list of tuples containing model names and instances.
         """
@@ -55,7 +107,10 @@ class ModelOptimizer:
     def _create_pipelines(self):
         """
         Create pipelines with different scalers and models.
-        
+
+        Pipelines with a scaler share the Memory cache, so the scaler fitted on
+        a fold is loaded from disk instead of refitted for every candidate.
+
         Returns:
         - list of tuples containing pipeline names and Pipeline instances.
         """
@@ -65,15 +120,15 @@ class ModelOptimizer:
 
         for name, model in self.models:
             pipelines.append((f"{name}-orig", Pipeline(steps=[(name, model)])))
-            pipelines.append((f"{name}-std", Pipeline(steps=[standard_scaler, (name, model)])))
-            pipelines.append((f"{name}-norm", Pipeline(steps=[min_max_scaler, (name, model)])))
-        
+            pipelines.append((f"{name}-std", Pipeline(steps=[standard_scaler, (name, model)], memory=self.memory)))
+            pipelines.append((f"{name}-norm", Pipeline(steps=[min_max_scaler, (name, model)], memory=self.memory)))
+
         return pipelines
 
     def _initialize_param_grids(self):
         """
         Define parameter grids for each model.
-        
+
         Returns:
         - dict of parameter grids for different models.
         """
@@ -99,30 +154,200 @@ class ModelOptimizer:
 
     def optimize_models(self):
         """
-        Run GridSearchCV for each pipeline and print the best model configurations.
-        """
-        for name, pipeline in self.pipelines:
-            model_type = name.split('-')[0]
-            if model_type in self.param_grids:
-                param_grid = self.param_grids[model_type]
-                grid = GridSearchCV(
-                    estimator=pipeline,
-                    param_grid=param_grid,
-                    scoring=self.scoring,
-                    cv=self.kfold
-                )
-                grid.fit(self.X_train, self.y_train)
-                self._print_best_model(name, grid)
+        Run the hyperparameter search for each pipeline and print the best model configurations.
+
+        Returns:
+        - dict mapping each pipeline name to its best score and parameters.
+        """
+        searches = [
+            (name, pipeline, self.param_grids[name.split('-')[0]])
+            for name, pipeline in self.pipelines if name.split('-')[0] in self.param_grids
+        ]
+
+        if self.strategy == 'halving':
+            for name, pipeline, param_grid in searches:
+                self._run_halving(name, pipeline, param_grid)
+        else:
+            self._run_cross_validation(searches)
+
+        best = {}
+        for name, _, param_grid in searches:
+            best[name] = self._best_candidate(name, self._candidates(param_grid))
+            self._print_best_model(name, *best[name])
+        return best
+
+    def _candidates(self, param_grid):
+        """
+        Return the candidates of a parameter grid that the current strategy evaluates.
+
+        Parameters:
+        - param_grid: dict
+            The parameter grid of a model.
+
+        Returns:
+        - list of parameter dicts.
+        """
+        candidates = list(ParameterGrid(param_grid))
+        if self.strategy == 'random' and self.n_iter < len(candidates):
+            candidates = list(ParameterSampler(param_grid, n_iter=self.n_iter, random_state=self.random_state))
+        return candidates
+
+    def _run_cross_validation(self, searches):
+        """
+        Cross-validate every candidate not evaluated on the whole training data yet,
+        with one parallel task per pipeline, candidate and fold, and persist their scores.
+
+        Parameters:
+        - searches: list of (name, pipeline, param_grid) tuples.
+        """
+        folds = list(check_cv(self.kfold, self.y_train, classifier=True).split(self.X_train, self.y_train))
+        pending = [
+            (name, pipeline, params)
+            for name, pipeline, param_grid in searches
+            for params in self._candidates(param_grid)
+            if self.results.get(self._key(name, params), {}).get('n_resources', 0) < len(self.y_train)
+        ]
+        if not pending:
+            return
+
+        outcomes = Parallel(n_jobs=self.n_jobs)(
+            delayed(fit_and_score)(pipeline, self.X_train, self.y_train, train, test, self.scoring, params)
+            for _, pipeline, params in pending
+            for train, test in folds
+        )
+
+        for index, (name, _, params) in enumerate(pending):
+            fold_scores = [score for score, _, _ in outcomes[index * len(folds):(index + 1) * len(folds)]]
+            self._record(name, params, np.mean(fold_scores), np.std(fold_scores), len(self.y_train))
+        self._save_results()
+
+    def _run_halving(self, name, pipeline, param_grid):
+        """
+        Run a successive-halving search over the candidates not evaluated yet and
+        persist the score of each candidate at the last iteration it reached.
+
+        Parameters:
+        - name: str
+            The name of the pipeline.
+        - pipeline: Pipeline
+            The pipeline to optimize.
+        - param_grid: dict
+            The parameter grid of the model.
+        """
+        pending = [params for params in self._candidates(param_grid) if self._key(name, params) not in self.results]
+        if not pending:
+            return
+
+        grid = HalvingGridSearchCV(
+            estimator=pipeline,
+            param_grid=[{key: [value] for key, value in params.items()} for params in pending],
+            scoring=self.scoring,
+            cv=self.kfold,
+            n_jobs=self.n_jobs,
+            random_state=self.random_state
+        )
+        grid.fit(self.X_train, self.y_train)
+
+        # Rows of cv_results_ are ordered by iteration, so later rows win
+        for params, score, std, n_resources in zip(
+            grid.cv_results_['params'], grid.cv_results_['mean_test_score'],
+            grid.cv_results_['std_test_score'], grid.cv_results_['n_resources']
+        ):
+            self._record(name, params, score, std, n_resources)
+        self._save_results()
+
+    def _best_candidate(self, name, candidates):
+        """
+        Return the best persisted score and parameters among the candidates of a pipeline.
+
+        Candidates scored on more samples (the survivors of successive halving) rank first.
+
+        Parameters:
+        - name: str
+            The name of the pipeline.
+        - candidates: list of parameter dicts.
+
+        Returns:
+        - tuple of the best score and its parameters.
+        """
+        results = [self.results[self._key(name, params)] for params in candidates]
+        best = max(results, key=lambda result: (result['n_resources'], result['score']))
+        return best['score'], best['params']
+
+    def _fingerprint(self):
+        """
+        Return a hash of the training data, cross-validation and scoring settings and of the sklearn version.
+        """
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(self.X_train).tobytes())
+        digest.update(np.ascontiguousarray(self.y_train).tobytes())
+        digest.update(f"{self.kfold!r}|{self.scoring}|{sklearn.__version__}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _definition(pipeline):
+        """
+        Return a hash of the steps and parameters of a pipeline, leaving out its cache.
+        """
+        params = {key: value for key, value in pipeline.get_params().items() if key != 'memory'}
+        return hashlib.sha256(repr(params).encode()).hexdigest()
+
+    def _key(self, name, params):
+        """
+        Return the key under which the score of a candidate is persisted.
+        """
+        if not hasattr(self, '_data_fingerprint'):
+            self._data_fingerprint = self._fingerprint()
+        return f"{self._data_fingerprint}|{self._definitions[name]}|{name}|{json.dumps(params, sort_keys=True)}"
+
+    def _record(self, name, params, score, std, n_resources):
+        """
+        Store the score of a candidate.
+        """
+        self.results[self._key(name, params)] = {
+            'pipeline': name,
+            'params': params,
+            'score': float(score),
+            'std': float(std),
+            'n_resources': int(n_resources)
+        }
+
+    def _load_results(self):
+        """
+        Load the persisted candidate scores.
+
+        Returns:
+        - dict of candidate scores by key (empty when nothing was persisted).
+        """
+        if not self.results_path or not os.path.exists(self.results_path):
+            return {}
+        with open(self.results_path) as file:
+            return json.load(file)
+
+    def _save_results(self):
+        """
+        Persist the candidate scores, replacing the file atomically.
+        """
+        if not self.results_path:
+            return
+        os.makedirs(os.path.dirname(self.results_path) or '.', exist_ok=True)
+        temporary_path = f"{self.results_path}.tmp"
+        with open(temporary_path, 'w') as file:
+            json.dump(self.results, file, indent=1)
+        os.replace(temporary_path, self.results_path)
 
     @staticmethod
-    def _print_best_model(name, grid):
+    def _print_best_model(name, score, params):
         """
         Print the best configuration found for the model.
-        
+
         Parameters:
         - name: str
             The name of the pipeline.
-        - grid: GridSearchCV
-            The fitted GridSearchCV instance.
+        - score: float
+            The mean cross-validation score of the best configuration.
+        - params: dict
+            The best configuration.
         """
-        print(f"Model: {name} - Best Score: {grid.best_score_} using {grid.best_params_}")
\ No newline at end of file
+        print(f"Model: {name} - Best Score: {score} using {params}")
+
@@ -1,15 +1,39 @@
+import hashlib
+import json
+import os
 import pickle
+import shutil
+import tempfile
 
+import numpy as np
 import pandas as pd
+import sklearn
+from sklearn.pipeline import Pipeline
+
+# Version of the array artifact format written by save_*_arrays
+ARTIFACT_FORMAT = 1
 
 
 class ModelSaver:
     """
     A class for saving models, scalers, pipelines, and test data to disk.
+
+    Attributes:
+        base_dir (str): Directory holding the models, scalers, pipelines, data and
+            versions subdirectories (the machine_learning directory by default,
+            relative to the notebooks).
     """
 
-    @staticmethod
-    def save_model(model, filename):
+    def __init__(self, base_dir='..'):
+        """
+        Initializes the ModelSaver with the directory artifacts are written under.
+
+        Parameters:
+        base_dir (str): The directory holding the artifact subdirectories.
+        """
+        self.base_dir = base_dir
+
+    def save_model(self, model, filename):
         """
         Save a trained model to a file.
 
@@ -17,12 +41,11 @@ class ModelSaver:
         model: The model to be saved.
         filename (str): The name of the file where the model will be saved.
         """
-        file_path = f"../models/{filename}"
+        file_path = os.path.join(self.base_dir, "models", filename)
         with open(file_path, 'wb') as file:
             pickle.dump(model, file)
 
-    @staticmethod
-    def save_scaler(scaler, filename):
+    def save_scaler(self, scaler, filename):
         """
         Save a scaler to a file.
 
@@ -30,12 +53,11 @@ class ModelSaver:
         scaler: The scaler to be saved.
         filename (str): The name of the file where the scaler will be saved.
         """
-        file_path = f"../scalers/{filename}"
+        file_path = os.path.join(self.base_dir, "scalers", filename)
         with open(file_path, 'wb') as file:
             pickle.dump(scaler, file)
 
-    @staticmethod
-    def save_pipeline(pipeline, filename):
+    def save_pipeline(self, pipeline, filename):
         """
         Save a pipeline to a file.
 
@@ -43,12 +65,118 @@ class ModelSaver:
         pipeline: The pipeline to be saved.
         filename (str): The name of the file where the pipeline will be saved.
         """
-        file_path = f"../pipelines/{filename}"
+        file_path = os.path.join(self.base_dir, "pipelines", filename)
         with open(file_path, 'wb') as file:
             pickle.dump(pipeline, file)
 
+    def save_pipeline_arrays(self, pipeline, dirname):
+        """
+        Save a pipeline as raw arrays that the API can memory-map.
+
+        Parameters:
+        pipeline: The fitted pipeline to be saved.
+        dirname (str): The name of the directory where the arrays and manifest will be saved.
+        """
+        self._save_arrays(pipeline, os.path.join(self.base_dir, "pipelines", dirname))
+
+    def save_model_arrays(self, model, dirname):
+        """
+        Save a model as raw arrays that the API can memory-map.
+
+        Parameters:
+        model: The fitted model to be saved.
+        dirname (str): The name of the directory where the arrays and manifest will be saved.
+        """
+        self._save_arrays(model, os.path.join(self.base_dir, "models", dirname))
+
+    def save_version(self, pipeline, metadata):
+        """
+        Save a pipeline to a content-addressed version directory.
+
+        The directory holds the array artifact (manifest.json and .npy files), a
+        pickle of the pipeline and a metadata.json. It is named after the SHA-256
+        of the manifest, which covers the hash of every fitted array, so saving
+        the same fitted pipeline twice yields the same version. The artifact is
+        written to a staging directory first and renamed into place, so a
+        version directory is never seen half written.
+
+        Parameters:
+        pipeline: The fitted pipeline to be saved.
+        metadata (dict): Information stored alongside the pipeline (metrics, parameters, lineage).
+
+        Returns:
+        str: The path of the version directory.
+        """
+        versions_dir = os.path.join(self.base_dir, "versions")
+        os.makedirs(versions_dir, exist_ok=True)
+        staging_path = tempfile.mkdtemp(prefix=".staging-", dir=versions_dir)
+
+        self._save_arrays(pipeline, staging_path)
+        with open(os.path.join(staging_path, "pipeline.pkl"), 'wb') as file:
+            pickle.dump(pipeline, file)
+        with open(os.path.join(staging_path, "manifest.json"), 'rb') as file:
+            version = hashlib.sha256(file.read()).hexdigest()[:16]
+        with open(os.path.join(staging_path, "metadata.json"), 'w') as file:
+            json.dump({**metadata, "version": version}, file, indent=2)
+
+        version_path = os.path.join(versions_dir, version)
+        if os.path.exists(version_path):
+            shutil.rmtree(staging_path)
+        else:
+            os.rename(staging_path, version_path)
+        return version_path
+
     @staticmethod
-    def save_test_data(X_test, y_test, df):
+    def _save_arrays(estimator, dir_path):
+        """
+        Write every fitted array of an estimator (or of each step of a pipeline)
+        to its own .npy file and describe the rest in a manifest.json.
+
+        Unlike a pickle, the arrays can be loaded with np.load(mmap_mode='c'):
+        nothing is copied at load time and, as long as nothing writes to them
+        (copy-on-write), the pages are shared by every process that maps the
+        same file.
+
+        Parameters:
+        estimator: The fitted model or pipeline to be saved.
+        dir_path (str): The directory where the artifact will be written.
+        """
+        os.makedirs(dir_path, exist_ok=True)
+        is_pipeline = isinstance(estimator, Pipeline)
+        steps = estimator.steps if is_pipeline else [(None, estimator)]
+
+        manifest_steps = []
+        for index, (name, step) in enumerate(steps):
+            attributes = {}
+            for key, value in vars(step).items():
+                if isinstance(value, np.ndarray) and value.dtype != object:
+                    filename = f"{index}-{key}.npy"
+                    np.save(os.path.join(dir_path, filename), np.ascontiguousarray(value))
+                    attributes[key] = {"type": "array", "file": filename,
+                                       "sha256": hashlib.sha256(value.tobytes()).hexdigest()}
+                elif isinstance(value, np.ndarray):
+                    attributes[key] = {"type": "strings", "value": value.tolist()}
+                elif isinstance(value, tuple):
+                    attributes[key] = {"type": "tuple", "value": list(value)}
+                else:
+                    attributes[key] = {"type": "value", "value": value.item() if isinstance(value, np.generic) else value}
+
+            manifest_steps.append({
+                "name": name,
+                "class": f"{type(step).__module__}.{type(step).__name__}",
+                "attributes": attributes
+            })
+
+        manifest = {
+            "format": ARTIFACT_FORMAT,
+            "sklearn_version": sklearn.__version__,
+            "pipeline": is_pipeline,
+            "steps": manifest_steps
+        }
+        with open(os.path.join(dir_path, "manifest.json"), 'w') as file:
+            json.dump(manifest, file, indent=2)
+
+    def save_test_data(self, X_test, y_test, df):
         """
         Save the test data to CSV files.
 
@@ -60,8 +188,8 @@ class ModelSaver:
         X_test_df = pd.DataFrame(X_test, columns=df.columns[:-1])
         y_test_df = pd.DataFrame(y_test, columns=[df.columns[-1]])
 
-        X_test_file_path = "../data/X_test_dataset_breast_cancer.csv"
-        y_test_file_path = "../data/y_test_dataset_breast_cancer.csv"
+        X_test_file_path = os.path.join(self.base_dir, "data", "X_test_dataset_breast_cancer.csv")
+        y_test_file_path = os.path.join(self.base_dir, "data", "y_test_dataset_breast_cancer.csv")
 
         X_test_df.to_csv(X_test_file_path, index=False)
         y_test_df.to_csv(y_test_file_path, index=False)
\ No newline at end of file
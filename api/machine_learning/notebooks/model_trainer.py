@@ -1,12 +1,15 @@
+import os
+
 import matplotlib.pyplot as plt
 import numpy as np
 
-from sklearn.model_selection import cross_val_score
 from sklearn.naive_bayes import GaussianNB
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.svm import SVC
 from sklearn.tree import DecisionTreeClassifier
 
+from evaluation import cross_validate_parallel, save_boxplot, write_results
+
 np.random.seed(7)
 
 
@@ -15,7 +18,7 @@ class ModelTrainer:
     Class for training and evaluating machine learning models.
     """
 
-    def __init__(self, X_train, y_train, models, scoring, kfold):
+    def __init__(self, X_train, y_train, models, scoring, kfold, n_jobs=None, output_dir=None):
         """
         Initializes the ModelTrainer with the dataset, models, scoring method, and other parameters.
 
@@ -25,14 +28,21 @@ class ModelTrainer:
             models (list of tuples): List of models to evaluate.
             scoring (str): Scoring method for evaluation.
             kfold (int): Number of folds for cross-validation.
+            n_jobs (int): Number of worker processes evaluating models and folds in parallel
+                (None runs sequentially, -1 uses all cores).
+            output_dir (str): Directory where the results and the plot are written instead
+                of showing the plot (None shows it).
         """
         self.X_train = X_train
         self.y_train = y_train
         self.scoring = scoring
         self.kfold = kfold
         self.models = models
+        self.n_jobs = n_jobs
+        self.output_dir = output_dir
         self.results = []
         self.names = []
+        self.timings = {}
 
     @staticmethod
     def _default_models():
@@ -52,18 +62,35 @@ class ModelTrainer:
     def evaluate_models(self):
         """
         Evaluates each model using cross-validation and prints the results.
+
+        When an output directory is set, the results (scores, fit and score times)
+        are written to model_comparison.json and the plot to model_comparison.png.
         """
-        for name, model in self.models:
-            cv_results = cross_val_score(model, self.X_train, self.y_train, cv=self.kfold, scoring=self.scoring)
+        results = cross_validate_parallel(
+            self.models, self.X_train, self.y_train, self.kfold, scoring=self.scoring, n_jobs=self.n_jobs
+        )
+        for name, result in results.items():
+            cv_results = result['scores']
             self.results.append(cv_results)
             self.names.append(name)
+            self.timings[name] = (result['fit_times'], result['score_times'])
             print(f"{name}: {cv_results.mean()} ({cv_results.std()})")
+
+        if self.output_dir is not None:
+            write_results(os.path.join(self.output_dir, 'model_comparison.json'), results, self.scoring)
         self._plot_model_comparison()
 
     def _plot_model_comparison(self):
         """
         Plots a boxplot comparing the performance of different models.
         """
+        if self.output_dir is not None:
+            save_boxplot(
+                os.path.join(self.output_dir, 'model_comparison.png'),
+                self.results, self.names, 'Model Comparison', figsize=(15, 10)
+            )
+            return
+
         fig = plt.figure(figsize=(15, 10))
         fig.suptitle('Model Comparison')
         plt.boxplot(self.results)
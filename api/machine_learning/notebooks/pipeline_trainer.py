@@ -1,7 +1,8 @@
+import os
+
 import matplotlib.pyplot as plt
 import numpy as np
 
-from sklearn.model_selection import cross_val_score
 from sklearn.naive_bayes import GaussianNB
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.pipeline import Pipeline
@@ -9,6 +10,8 @@ from sklearn.preprocessing import MinMaxScaler, StandardScaler
 from sklearn.svm import SVC
 from sklearn.tree import DecisionTreeClassifier
 
+from evaluation import cross_validate_parallel, save_boxplot, write_results
+
 np.random.seed(7)
 
 
@@ -20,10 +23,13 @@ class PipelineTrainer:
         X_train (pd.DataFrame): The training features.
         y_train (pd.Series): The training target variable.
         kfold (StratifiedKFold): Cross-validation strategy.
+        n_jobs (int): Number of worker processes evaluating pipelines and folds in parallel.
+        output_dir (str): Directory where the results and the plot are written, if any.
         results (list): List to store results of pipeline evaluations.
+        timings (dict): Fit and score times of each fold, by pipeline name.
     """
 
-    def __init__(self, X_train, y_train, kfold):
+    def __init__(self, X_train, y_train, kfold, n_jobs=None, output_dir=None):
         """
         Initializes the PipelineTrainer with training data, target, and cross-validation strategy.
 
@@ -31,28 +37,42 @@ class PipelineTrainer:
             X_train (pd.DataFrame): Features for training.
             y_train (pd.Series): Target variable for training.
             kfold (StratifiedKFold): Cross-validation strategy.
+            n_jobs (int): Number of worker processes evaluating pipelines and folds in parallel
+                (None runs sequentially, -1 uses all cores).
+            output_dir (str): Directory where the results and the plot are written instead
+                of showing the plot (None shows it).
         """
         self.X_train = X_train
         self.y_train = y_train
         self.kfold = kfold
+        self.n_jobs = n_jobs
+        self.output_dir = output_dir
         self.results = []
+        self.timings = {}
 
     def run_pipelines(self):
         """
         Runs the defined pipelines, evaluates their performance using cross-validation,
         and plots the comparison of their results.
+
+        When an output directory is set, the results (scores, fit and score times)
+        are written to pipeline_comparison.json and the plot to pipeline_comparison.png.
         """
         pipelines = self._create_pipelines()
-        
-        for name, pipeline in pipelines:
-            cv_results = cross_val_score(
-                pipeline, self.X_train, self.y_train, cv=self.kfold, scoring='accuracy'
-            )
+        results = cross_validate_parallel(
+            pipelines, self.X_train, self.y_train, self.kfold, scoring='accuracy', n_jobs=self.n_jobs
+        )
+
+        for name, result in results.items():
+            cv_results = result['scores']
+            self.timings[name] = (result['fit_times'], result['score_times'])
             mean_score = cv_results.mean()
             std_dev = cv_results.std()
             print(f"{name}: {mean_score} ({std_dev})")
             self.results.append((name, cv_results))
-        
+
+        if self.output_dir is not None:
+            write_results(os.path.join(self.output_dir, 'pipeline_comparison.json'), results, 'accuracy')
         self._plot_pipelines_comparison()
 
     @staticmethod
@@ -97,13 +117,19 @@ class PipelineTrainer:
         """
         Plots a boxplot comparing the results of the different pipelines.
         """
-        fig = plt.figure(figsize=(25, 6))
-        fig.suptitle('Pipeline Comparison')
-        
         # Extract results and labels for plotting
         data = [result[1] for result in self.results]
         labels = [result[0] for result in self.results]
-        
+
+        if self.output_dir is not None:
+            save_boxplot(
+                os.path.join(self.output_dir, 'pipeline_comparison.png'),
+                data, labels, 'Pipeline Comparison', figsize=(25, 6), rotation=90
+            )
+            return
+
+        fig = plt.figure(figsize=(25, 6))
+        fig.suptitle('Pipeline Comparison')
         plt.boxplot(data, labels=labels)
         plt.xticks(rotation=90)
         plt.show()
\ No newline at end of file
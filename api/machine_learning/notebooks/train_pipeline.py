@@ -0,0 +1,266 @@
+"""
+Trains the breast cancer pipeline end to end, replacing the notebook cells that
+glue DataLoader, Preprocessor, ModelOptimizer and ModelSaver together.
+
+Run it from the notebooks directory, e.g.:
+
+    python train_pipeline.py --pipelines SVM-std --output-dir ..
+
+The stages are load, feature-select, split, search, fit, evaluate and save.
+With --compress, a compress stage between fit and evaluate shrinks the fitted
+pipeline with ModelCompressor; the pipeline is then fitted without the
+--validation-size share of the training rows, which the compressor checks and
+calibrates the compressed pipeline on.
+Each stage caches its output under --cache-dir, keyed on its own parameters
+and on the key of the stage it consumes, so changing only the search grid
+reruns search and the stages after it while loading, feature selection and
+the split come from the cache. The fitted pipeline is written to a
+content-addressed directory, <output-dir>/versions/<sha256>, by
+ModelSaver.save_version.
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+import sklearn
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+from data_loader import DataLoader
+from model_compressor import ModelCompressor
+from model_optimizer import STRATEGIES, ModelOptimizer
+from model_saver import ModelSaver
+from preprocessor import Preprocessor
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wdbc.data')
+COLUMN_NAMES = [
+    'id_number', 'diagnosis',
+    'radius_mean', 'texture_mean', 'perimeter_mean', 'area_mean', 'smoothness_mean',
+    'compactness_mean', 'concavity_mean', 'concave_points_mean', 'symmetry_mean', 'fractal_dimension_mean',
+    'radius_se', 'texture_se', 'perimeter_se', 'area_se', 'smoothness_se',
+    'compactness_se', 'concavity_se', 'concave_points_se', 'symmetry_se', 'fractal_dimension_se',
+    'radius_worst', 'texture_worst', 'perimeter_worst', 'area_worst', 'smoothness_worst',
+    'compactness_worst', 'concavity_worst', 'concave_points_worst', 'symmetry_worst', 'fractal_dimension_worst'
+]
+TARGET_COLUMN = 'diagnosis'
+
+
+class StageCache:
+    """
+    Caches the output of each training stage on disk, keyed on its inputs.
+
+    Attributes:
+        cache_dir (str): Directory holding one pickle per stage output.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Initializes the StageCache.
+
+        Args:
+            cache_dir (str): Directory holding the cached stage outputs.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(stage, inputs):
+        """
+        Returns the cache key of a stage run.
+
+        Args:
+            stage (str): Name of the stage.
+            inputs (dict): JSON-serializable parameters of the stage, including the
+                key of the stage it consumes.
+
+        Returns:
+            str: The SHA-256 of the stage name and inputs.
+        """
+        payload = json.dumps({'stage': stage, 'sklearn': sklearn.__version__, 'inputs': inputs}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def run(self, stage, inputs, function):
+        """
+        Returns the cached output of a stage, or runs it and caches its output.
+
+        Args:
+            stage (str): Name of the stage.
+            inputs (dict): Parameters of the stage (see key).
+            function (callable): Computes the output of the stage.
+
+        Returns:
+            tuple: The stage output and its cache key.
+        """
+        key = self.key(stage, inputs)
+        path = os.path.join(self.cache_dir, f"{stage}-{key[:16]}.pkl")
+        if os.path.exists(path):
+            print(f"[{stage}] cached ({key[:16]})")
+            with open(path, 'rb') as file:
+                return pickle.load(file), key
+
+        start = time.perf_counter()
+        output = function()
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'wb') as file:
+            pickle.dump(output, file)
+        os.replace(temporary_path, path)
+        print(f"[{stage}] done in {time.perf_counter() - start:.2f}s ({key[:16]})")
+        return output, key
+
+
+def file_digest(path):
+    """
+    Returns the SHA-256 of a file, or of the string itself when it is a URL.
+    """
+    if not os.path.exists(path):
+        return hashlib.sha256(path.encode()).hexdigest()
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def _support_vector_count(pipeline):
+    """
+    Returns the number of support vectors of the pipeline's final estimator, or None if it has none.
+    """
+    support_vectors = getattr(pipeline.steps[-1][1], 'support_vectors_', None)
+    return None if support_vectors is None else len(support_vectors)
+
+
+def train(args):
+    """
+    Runs every stage and returns the path of the saved version.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        str: The version directory written by ModelSaver.save_version.
+    """
+    cache = StageCache(args.cache_dir)
+    param_grids = None
+    if args.param_grids:
+        with open(args.param_grids) as file:
+            param_grids = json.load(file)
+
+    df, load_key = cache.run(
+        'load', {'source': file_digest(args.data), 'columns': COLUMN_NAMES},
+        lambda: DataLoader(args.data, ',', COLUMN_NAMES).load_data()
+    )
+
+    features, select_key = cache.run(
+        'feature-select', {'load': load_key, 'target': TARGET_COLUMN, 'corr_threshold': args.corr_threshold},
+        lambda: Preprocessor(df.copy(), TARGET_COLUMN, args.corr_threshold).preprocess()
+    )
+
+    def split():
+        X = features.drop(columns=[TARGET_COLUMN])
+        y = features[TARGET_COLUMN]
+        return train_test_split(X, y, test_size=args.test_size, random_state=args.seed)
+
+    (X_train, X_test, y_train, y_test), split_key = cache.run(
+        'split', {'feature-select': select_key, 'test_size': args.test_size, 'seed': args.seed}, split
+    )
+
+    def optimizer():
+        return ModelOptimizer(
+            X_train, y_train, kfold=StratifiedKFold(args.n_splits, shuffle=True, random_state=args.seed),
+            scoring='accuracy', strategy=args.strategy, n_iter=args.n_iter, n_jobs=args.n_jobs,
+            cache_dir=os.path.join(args.cache_dir, 'optimizer'),
+            results_path=os.path.join(args.cache_dir, 'optimizer', 'results.json'),
+            random_state=args.seed, param_grids=param_grids, pipeline_names=args.pipelines
+        )
+
+    def search():
+        best = optimizer().optimize_models()
+        name = max(best, key=lambda pipeline_name: best[pipeline_name][0])
+        return {'pipeline': name, 'score': best[name][0], 'params': best[name][1]}
+
+    best, search_key = cache.run('search', {
+        'split': split_key, 'strategy': args.strategy, 'n_iter': args.n_iter, 'n_splits': args.n_splits,
+        'seed': args.seed, 'param_grids': param_grids, 'pipelines': args.pipelines
+    }, search)
+
+    X_fit, y_fit = X_train, y_train
+    if args.compress:
+        # Rows the compressor checks the compressed pipeline on must not be fitted on
+        (X_fit, X_val, y_fit, y_val), _ = cache.run(
+            'validation-split', {'split': split_key, 'validation_size': args.validation_size, 'seed': args.seed},
+            lambda: train_test_split(X_train, y_train, test_size=args.validation_size, random_state=args.seed)
+        )
+
+    def fit():
+        pipeline = clone(dict(optimizer().pipelines)[best['pipeline']]).set_params(memory=None, **best['params'])
+        return pipeline.fit(X_fit, y_fit)
+
+    fit_inputs = {'search': search_key}
+    if args.compress:
+        fit_inputs['validation_size'] = args.validation_size
+    pipeline, fit_key = cache.run('fit', fit_inputs, fit)
+    n_support_vectors = _support_vector_count(pipeline)
+
+    stages = {'load': load_key, 'feature-select': select_key, 'split': split_key,
+              'search': search_key, 'fit': fit_key}
+    if args.compress:
+        pipeline, stages['compress'] = cache.run(
+            'compress', {'fit': fit_key, 'tolerance': args.compress_tolerance},
+            lambda: ModelCompressor(X_fit, X_val, y_val, tolerance=args.compress_tolerance).compress(
+                pipeline, prune=True
+            )
+        )
+
+    metrics, _ = cache.run(
+        'evaluate', {'fit': stages.get('compress', fit_key)},
+        lambda: {'accuracy': float(accuracy_score(y_test, pipeline.predict(X_test))), 'test_rows': len(y_test)}
+    )
+    print(f"{best['pipeline']} {best['params']}: cv accuracy {best['score']:.4f}, "
+          f"test accuracy {metrics['accuracy']:.4f}")
+
+    # Feature values are sent to the API as plain arrays, in this order
+    features_order = list(np.asarray(X_train.columns))
+    return ModelSaver(args.output_dir).save_version(pipeline, {
+        'pipeline': best['pipeline'],
+        'params': best['params'],
+        'cv_accuracy': best['score'],
+        'metrics': metrics,
+        'features': features_order,
+        'compression': {
+            'enabled': args.compress,
+            'support_vectors': [n_support_vectors, _support_vector_count(pipeline)]
+        },
+        'stages': stages,
+        'sklearn_version': sklearn.__version__
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the breast cancer pipeline and save a versioned artifact.")
+    parser.add_argument("--data", default=DATA_PATH, help="Path or URL of the wdbc.data file")
+    parser.add_argument("--corr-threshold", type=float, default=0.7, help="Correlation threshold of feature selection")
+    parser.add_argument("--test-size", type=float, default=0.2, help="Share of rows kept for evaluation")
+    parser.add_argument("--seed", type=int, default=7, help="Seed of the split and the cross-validation")
+    parser.add_argument("--n-splits", type=int, default=10, help="Cross-validation folds of the search")
+    parser.add_argument("--strategy", choices=STRATEGIES, default='grid', help="Hyperparameter search strategy")
+    parser.add_argument("--n-iter", type=int, default=10, help="Candidates per pipeline of the random strategy")
+    parser.add_argument("--param-grids", help="JSON file of parameter grids by model name (e.g. {\"SVM\": {...}})")
+    parser.add_argument("--pipelines", nargs="+", help="Pipelines to search (e.g. SVM-std); all by default")
+    parser.add_argument("--compress", action="store_true",
+                        help="Collapse linear SVCs and prune the support vectors of RBF SVCs before saving")
+    parser.add_argument("--validation-size", type=float, default=0.2,
+                        help="Share of the training rows held out to check the compressed pipeline")
+    parser.add_argument("--compress-tolerance", type=float, default=0.01,
+                        help="Largest accuracy drop accepted when pruning support vectors")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel jobs of the search")
+    parser.add_argument("--cache-dir", default='.cache/training', help="Directory of the stage cache")
+    parser.add_argument("--output-dir", default='..', help="Directory the versions directory is created in")
+    args = parser.parse_args()
+
+    print(f"Saved {train(args)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+import bisect
+import threading
+import time
+
+# Upper bounds of the latency histogram buckets in seconds (the last bucket is unbounded)
+LATENCY_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5]
+
+
+class Counter:
+    """
+    Monotonic counter with labels, rendered in the Prometheus text format.
+
+    Label values are passed positionally, in the order of `labelnames`.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        """
+        Args:
+            name (str): Metric name.
+            documentation (str): Help text of the metric.
+            labelnames (tuple): Names of the labels.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        """
+        Adds to the counter of the given label values.
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        """
+        Returns the exposition lines of the counter.
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """
+    Histogram with labels, rendered in the Prometheus text format.
+
+    Observing a value costs a lock and a bisect, so histograms stay on in production.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: list = LATENCY_BUCKETS):
+        """
+        Args:
+            name (str): Metric name.
+            documentation (str): Help text of the metric.
+            labelnames (tuple): Names of the labels.
+            buckets (list): Upper bounds of the buckets, in increasing order.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        """
+        Records a value for the given label values.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def time(self, *labels) -> "_Timer":
+        """
+        Returns a context manager recording the duration of its block, in seconds,
+        for the given label values.
+        """
+        return _Timer(self, labels)
+
+    def render(self) -> list:
+        """
+        Returns the exposition lines of the histogram.
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip([*self.buckets, "+Inf"], counts):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_labels((*self.labelnames, 'le'), (*labels, bound))} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    """
+    Context manager timing a block into a histogram; a plain class, which is
+    cheaper to enter and exit than a generator-based context manager.
+    """
+
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, labels: tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+        return False
+
+
+def snapshot(name: str, documentation: str, samples: list, labelnames: tuple = (), kind: str = "gauge") -> list:
+    """
+    Returns the exposition lines of a metric whose values are read at scrape time,
+    such as the counters kept by the connection pool or the prediction cache.
+
+    Args:
+        name (str): Metric name.
+        documentation (str): Help text of the metric.
+        samples (list): (label values, value) pairs.
+        labelnames (tuple): Names of the labels.
+        kind (str): Metric type, "gauge" or "counter".
+
+    Returns:
+        list: The exposition lines.
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_labels(labelnames, labels)} {value}" for labels, value in samples)
+    return lines
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    """
+    Formats label names and values as {name="value",...}, escaping the values.
+    """
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _escape(value) -> str:
+    """
+    Escapes a label value as the text format requires.
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Requests served, by route template, method and status code
+REQUESTS = Counter("http_requests_total", "HTTP requests by route, method and status.", ("route", "method", "status"))
+
+# Time from the start of a request to its response, by route template
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "HTTP request duration in seconds.", ("route",))
+
+# Time spent in each phase of adding patients: validation, prepare, predict, insert and commit
+# (or group_commit, when inserts are committed by the group-commit writer)
+PHASE_SECONDS = Histogram(
+    "patient_phase_duration_seconds", "Duration of each phase of adding patients, in seconds.",
+    ("operation", "phase")
+)
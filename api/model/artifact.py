@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import sklearn
+from sklearn.pipeline import Pipeline as SklearnPipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from logger import logger
+
+# Version of the array artifact format written by ModelSaver.save_*_arrays
+ARTIFACT_FORMAT = 1
+
+# Whether the arrays are checked against the SHA-256 of the manifest when loaded.
+# Off by default: checking reads every array, which defeats memory-mapping, so
+# turn it on only when the artifacts cannot be trusted (e.g. after a copy)
+ARTIFACT_VERIFY_CHECKSUMS = os.environ.get("ARTIFACT_VERIFY_CHECKSUMS", "0") == "1"
+
+# Estimators that may be rebuilt from an artifact; nothing else is ever imported
+ESTIMATORS = {
+    "sklearn.preprocessing._data.StandardScaler": StandardScaler,
+    "sklearn.svm._classes.SVC": SVC
+}
+
+
+def load_array_artifact(manifest_path: str, verify: bool = None):
+    """
+    Loads a model or pipeline saved by ModelSaver.save_pipeline_arrays or
+    ModelSaver.save_model_arrays.
+
+    Each fitted array is memory-mapped with np.load: nothing is read or copied
+    up front, so loading takes the same time whatever the size of the model,
+    and every process mapping the same files shares their pages. The mapping
+    is copy-on-write ('c') rather than read-only ('r') because libsvm asks for
+    writable buffers, although prediction never writes to them.
+
+    When verification is on, every array is checked against the SHA-256
+    recorded in the manifest, so a truncated or corrupted file is rejected
+    instead of silently serving wrong predictions. This reads each array in
+    full, so it is off by default to keep loading lazy.
+
+    Args:
+        manifest_path (str): Path of the artifact's manifest.json.
+        verify (bool): Whether to check the arrays' checksums (ARTIFACT_VERIFY_CHECKSUMS by default).
+
+    Returns:
+        The rebuilt estimator, or a sklearn Pipeline of the rebuilt steps.
+
+    Raises:
+        ValueError: If the artifact format or an estimator class is not supported,
+            or an array does not match its checksum.
+    """
+    if verify is None:
+        verify = ARTIFACT_VERIFY_CHECKSUMS
+    with open(manifest_path) as file:
+        manifest = json.load(file)
+
+    if manifest["format"] != ARTIFACT_FORMAT:
+        raise ValueError(f"Unsupported artifact format: {manifest['format']}")
+    if manifest["sklearn_version"] != sklearn.__version__:
+        logger.warning(
+            "Artifact %s was saved with scikit-learn %s, running %s",
+            manifest_path, manifest["sklearn_version"], sklearn.__version__
+        )
+
+    base_path = os.path.dirname(manifest_path)
+    steps = [
+        (step["name"], _build_estimator(step, base_path, verify)) for step in manifest["steps"]
+    ]
+
+    if manifest["pipeline"]:
+        return SklearnPipeline(steps)
+    return steps[0][1]
+
+
+def _build_estimator(step: dict, base_path: str, verify: bool):
+    """
+    Creates an estimator without calling fit and restores its fitted state.
+    """
+    if step["class"] not in ESTIMATORS:
+        raise ValueError(f"Unsupported estimator in artifact: {step['class']}")
+
+    estimator_class = ESTIMATORS[step["class"]]
+    estimator = estimator_class.__new__(estimator_class)
+    for key, attribute in step["attributes"].items():
+        setattr(estimator, key, _decode(attribute, base_path, verify))
+    return estimator
+
+
+def _decode(attribute: dict, base_path: str, verify: bool):
+    """
+    Turns a manifest attribute back into the value stored on the estimator.
+    """
+    if attribute["type"] == "array":
+        path = os.path.join(base_path, attribute["file"])
+        array = np.load(path, mmap_mode="c")
+        if verify and "sha256" in attribute:
+            checksum = hashlib.sha256(np.ascontiguousarray(array).tobytes()).hexdigest()
+            if checksum != attribute["sha256"]:
+                raise ValueError(f"Array {path} does not match the checksum of the manifest")
+        return array
+    if attribute["type"] == "strings":
+        return np.array(attribute["value"], dtype=object)
+    if attribute["type"] == "tuple":
+        return tuple(attribute["value"])
+    return attribute["value"]
@@ -0,0 +1,188 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+# Upper bounds of the histogram buckets (the last bucket is unbounded)
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+WAIT_MS_BUCKETS = [0.5, 1, 2, 5, 10, 25, 50, 100, 250]
+
+
+class MicroBatcher:
+    """
+    Gathers prediction requests from concurrent callers and scores them
+    together with a single call to the wrapped model.
+
+    A batch is closed when `max_rows` rows are pending or when `window_ms`
+    milliseconds have passed since its first request arrived, whichever
+    comes first. Exposes the same `predict` method as the wrapped model.
+    """
+
+    def __init__(self, model, window_ms: float = 2.0, max_rows: int = 64):
+        """
+        Args:
+            model: Trained model or pipeline with a `predict` method.
+            window_ms (float): How long a batch waits for more requests.
+            max_rows (int): Largest number of rows scored in a single call.
+        """
+        self.model = model
+        self.window = window_ms / 1000
+        self.max_rows = max_rows
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._pid = None
+        self._closed = False
+        self._batches = 0
+        self._rows = 0
+        self._batch_sizes = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._waits = [0] * (len(WAIT_MS_BUCKETS) + 1)
+        self._wait_ms_sum = 0.0
+        self._wait_ms_max = 0.0
+
+    def predict(self, X_input: np.ndarray) -> np.ndarray:
+        """
+        Queues the rows for the next batch and blocks until they are scored.
+
+        Once the batcher is closed, the rows are scored directly by the model.
+
+        Args:
+            X_input (np.ndarray): Input data for prediction, one row per instance.
+
+        Returns:
+            np.ndarray: Predictions for the given rows, in order.
+        """
+        self._ensure_worker()
+        future = Future()
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._queue.put((X_input, future, time.perf_counter()))
+        if closed:
+            return self.model.predict(X_input)
+        return future.result()
+
+    def close(self):
+        """
+        Stops the worker thread once the requests already queued are scored.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._worker is not None and self._pid == os.getpid():
+                self._queue.put(None)
+
+    def stats(self) -> dict:
+        """
+        Returns the queue depth, batch size and wait time statistics.
+        """
+        with self._lock:
+            return {
+                "window_ms": self.window * 1000,
+                "max_rows": self.max_rows,
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "rows": self._rows,
+                "batch_size_histogram": _histogram(BATCH_SIZE_BUCKETS, self._batch_sizes),
+                "wait_ms_histogram": _histogram(WAIT_MS_BUCKETS, self._waits),
+                "wait_ms_sum": self._wait_ms_sum,
+                "wait_ms_max": self._wait_ms_max
+            }
+
+    def _ensure_worker(self):
+        """
+        Starts the worker thread, again in a forked child whose parent owned it.
+        """
+        if self._closed or (self._worker is not None and self._pid == os.getpid()):
+            return
+        with self._lock:
+            if not self._closed and (self._worker is None or self._pid != os.getpid()):
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        """
+        Worker loop: collects a batch, scores it and hands back each result,
+        until it takes the None queued by close.
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            rows = len(item[0])
+            deadline = time.perf_counter() + self.window
+
+            while rows < self.max_rows:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._score(batch, rows)
+                    return
+                batch.append(item)
+                rows += len(item[0])
+
+            self._score(batch, rows)
+
+    def _score(self, batch: list, rows: int):
+        """
+        Scores the stacked rows of a batch and resolves each caller's future.
+        """
+        started = time.perf_counter()
+        try:
+            y_pred = self.model.predict(np.vstack([X_input for X_input, _, _ in batch]))
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # Score each request on its own, so one bad request only fails its own caller
+            for X_input, future, _ in batch:
+                try:
+                    future.set_result(self.model.predict(X_input))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for X_input, future, _ in batch:
+            future.set_result(y_pred[offset:offset + len(X_input)])
+            offset += len(X_input)
+
+        with self._lock:
+            self._batches += 1
+            self._rows += rows
+            self._batch_sizes[_bucket(BATCH_SIZE_BUCKETS, rows)] += 1
+            for _, _, enqueued in batch:
+                wait_ms = (started - enqueued) * 1000
+                self._waits[_bucket(WAIT_MS_BUCKETS, wait_ms)] += 1
+                self._wait_ms_sum += wait_ms
+                self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+
+
+def _bucket(bounds: list, value: float) -> int:
+    """
+    Returns the index of the first bucket whose upper bound holds the value.
+    """
+    for index, bound in enumerate(bounds):
+        if value <= bound:
+            return index
+    return len(bounds)
+
+
+def _histogram(bounds: list, counts: list) -> dict:
+    """
+    Labels bucket counts with their upper bounds.
+    """
+    labels = [str(bound) for bound in bounds] + ["+Inf"]
+    return dict(zip(labels, counts))
@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    LRU cache with expiry in front of a model, keyed on each input row.
+
+    Keys combine the exact float64 bytes of the feature row with the version
+    of the model, so a cached diagnosis is only reused for the same
+    measurements scored by the same model. The cache never looks at the
+    model file: every version loaded by the registry gets its own cache, so
+    a new model on disk is only reflected once it is actually loaded.
+    Exposes the same `predict` method as the wrapped model.
+    """
+
+    def __init__(self, model, model_version: str, max_size: int = 4096, ttl: float = 3600):
+        """
+        Args:
+            model: Trained model, pipeline or micro-batcher with a `predict` method.
+            model_version (str): Version of the loaded model (see ModelRegistry).
+            max_size (int): Largest number of rows kept in the cache.
+            ttl (float): Seconds after which a cached prediction expires.
+        """
+        self.model = model
+        self.model_version = model_version
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def predict(self, X_input: np.ndarray) -> np.ndarray:
+        """
+        Returns cached predictions for known rows and scores the others in one call.
+
+        Args:
+            X_input (np.ndarray): Input data for prediction, one row per instance.
+
+        Returns:
+            np.ndarray: Predictions for the given rows, in order.
+        """
+        X_input = np.ascontiguousarray(X_input, dtype=np.float64)
+        keys = [(self.model_version, row.tobytes()) for row in X_input]
+        now = time.monotonic()
+        predictions = [None] * len(keys)
+        missing = []
+
+        with self._lock:
+            for index, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(key)
+                    predictions[index] = entry[0]
+                    self._hits += 1
+                else:
+                    missing.append(index)
+                    self._misses += 1
+
+        if missing:
+            y_pred = self.model.predict(X_input[missing])
+            with self._lock:
+                for index, prediction in zip(missing, y_pred):
+                    predictions[index] = prediction
+                    self._entries[keys[index]] = (prediction, now + self.ttl)
+                    self._entries.move_to_end(keys[index])
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+
+        return np.array(predictions)
+
+    def stats(self) -> dict:
+        """
+        Returns the size of the cache and its hit, miss and eviction counters.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "fingerprint": self.model_version
+            }
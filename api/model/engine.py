@@ -0,0 +1,118 @@
+import numpy as np
+from sklearn.pipeline import Pipeline as SklearnPipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+
+class CompiledPipeline:
+    """
+    Plain NumPy version of a fitted StandardScaler -> SVC pipeline.
+
+    Calling sklearn's Pipeline.predict validates the input and dispatches
+    through both estimators and libsvm, which costs far more than the
+    arithmetic for a handful of rows. Here the scaler is folded into the
+    support vectors (or, for a linear kernel, into a single weight vector)
+    once, so scoring is a couple of matrix products.
+
+    Only binary classifiers with an RBF or linear kernel are supported.
+    """
+
+    def __init__(self, classes: np.ndarray, intercept: float, kernel: str, **arrays):
+        """
+        Prefer CompiledPipeline.compile; the arguments are the precomputed arrays.
+        """
+        self.classes_ = classes
+        self.intercept = intercept
+        self.kernel = kernel
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+    @staticmethod
+    def compile(pipeline) -> "CompiledPipeline":
+        """
+        Precomputes the decision function of a fitted StandardScaler -> SVC pipeline.
+
+        Args:
+            pipeline: The fitted sklearn Pipeline.
+
+        Returns:
+            CompiledPipeline: An engine predicting the same labels as the pipeline.
+
+        Raises:
+            ValueError: If the pipeline is not a supported StandardScaler -> SVC chain.
+        """
+        if not isinstance(pipeline, SklearnPipeline) or len(pipeline.steps) != 2:
+            raise ValueError("Only StandardScaler -> SVC pipelines can be compiled")
+        scaler, svc = pipeline.steps[0][1], pipeline.steps[1][1]
+        if not isinstance(scaler, StandardScaler) or not isinstance(svc, SVC):
+            raise ValueError("Only StandardScaler -> SVC pipelines can be compiled")
+        if len(svc.classes_) != 2 or svc.kernel not in ("rbf", "linear"):
+            raise ValueError("Only binary SVCs with an rbf or linear kernel can be compiled")
+
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(svc.n_features_in_)
+        scale = scaler.scale_ if scaler.with_std else np.ones(svc.n_features_in_)
+        dual_coef = np.asarray(svc.dual_coef_[0], dtype=np.float64)
+        support_vectors = np.asarray(svc.support_vectors_, dtype=np.float64)
+        intercept = float(svc.intercept_[0])
+
+        if svc.kernel == "linear":
+            # w.((x - mean) / scale) + b == (w / scale).x + (b - w.(mean / scale))
+            coef = dual_coef @ support_vectors
+            return CompiledPipeline(
+                np.asarray(svc.classes_), intercept - float(coef @ (mean / scale)), "linear",
+                weights=np.ascontiguousarray(coef / scale)
+            )
+
+        # ||(x - mean) / scale - sv||^2 == sum_j w_j (x_j - c_ij)^2 with
+        # w = 1 / scale^2 and c = mean + scale * sv, expanded so a batch needs
+        # one matrix product: x^2.w - 2 x.(w c)^T + (c^2).w
+        feature_weights = 1.0 / scale ** 2
+        centers = mean + scale * support_vectors
+        return CompiledPipeline(
+            np.asarray(svc.classes_), intercept, "rbf",
+            gamma=float(svc._gamma),
+            dual_coef=np.ascontiguousarray(dual_coef),
+            feature_weights=np.ascontiguousarray(feature_weights),
+            weighted_centers=np.ascontiguousarray((feature_weights * centers).T),
+            center_norms=np.ascontiguousarray((centers ** 2) @ feature_weights)
+        )
+
+    def decision_function(self, X_input: np.ndarray) -> np.ndarray:
+        """
+        Returns the signed distance of each row to the separating hyperplane.
+
+        Args:
+            X_input (np.ndarray): Unscaled input data, one row per instance.
+
+        Returns:
+            np.ndarray: One value per row; positive values predict classes_[1].
+
+        Raises:
+            ValueError: If a feature is NaN or infinite, as sklearn does.
+        """
+        X_input = np.asarray(X_input, dtype=np.float64)
+        if not np.isfinite(X_input).all():
+            raise ValueError("Input X contains NaN or infinity")
+        if self.kernel == "linear":
+            return X_input @ self.weights + self.intercept
+
+        distances = (
+            ((X_input * X_input) @ self.feature_weights)[:, None]
+            - 2.0 * (X_input @ self.weighted_centers)
+            + self.center_norms
+        )
+        # Rounding in the expansion can leave tiny negative distances
+        np.maximum(distances, 0.0, out=distances)
+        return np.exp(-self.gamma * distances) @ self.dual_coef + self.intercept
+
+    def predict(self, X_input: np.ndarray) -> np.ndarray:
+        """
+        Predicts the class of each row.
+
+        Args:
+            X_input (np.ndarray): Unscaled input data, one row per instance.
+
+        Returns:
+            np.ndarray: The predicted labels.
+        """
+        return self.classes_[(self.decision_function(X_input) > 0).astype(np.intp)]
@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from model.patient import Patient
+
+# Columns of the patients table, in export order
+EXPORT_COLUMNS = [column.name for column in Patient.__table__.columns]
+
+# Arrow types of the exported columns
+ARROW_TYPES = {
+    "id": pa.int64(),
+    "name": pa.string(),
+    "diagnosis": pa.int64(),
+    "insertion_date": pa.timestamp("us"),
+    "model_version": pa.string()
+}
+
+
+class Exporter:
+    """
+    Turns partitions of patient rows into a stream of encoded chunks, so a
+    table of any size can be exported without holding it in memory.
+
+    Each method takes an iterable of partitions (lists of row tuples in
+    EXPORT_COLUMNS order) and yields one chunk per partition.
+    """
+
+    @staticmethod
+    def to_ndjson(partitions):
+        """
+        Encodes the rows as newline-delimited JSON, one object per row.
+        """
+        for rows in partitions:
+            yield "".join(
+                json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=_isoformat) + "\n"
+                for row in rows
+            )
+
+    @staticmethod
+    def to_csv(partitions):
+        """
+        Encodes the rows as CSV with a header line.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+
+        for rows in partitions:
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Header of an empty table
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def to_parquet(partitions):
+        """
+        Encodes the rows as a Parquet file with one row group per partition.
+
+        Parquet keeps its metadata in a footer, so the file is written to a
+        temporary path and each row group is streamed out as soon as it is on disk.
+        """
+        schema = pa.schema([
+            (column, ARROW_TYPES.get(column, pa.float64())) for column in EXPORT_COLUMNS
+        ])
+        fd, path = tempfile.mkstemp(suffix=".parquet")
+        os.close(fd)
+
+        try:
+            with open(path, "rb") as reader:
+                writer = pq.ParquetWriter(path, schema)
+                try:
+                    for rows in partitions:
+                        columns = list(zip(*rows))
+                        writer.write_table(pa.table(columns, schema=schema))
+                        yield reader.read()
+                finally:
+                    writer.close()
+                yield reader.read()
+        finally:
+            os.remove(path)
+
+
+def _isoformat(value):
+    """
+    Serializes values the json module does not know, such as datetimes.
+    """
+    return value.isoformat()
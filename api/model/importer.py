@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from model.loader import Loader
+from model.model import Model
+from model.patient import Patient, insert_new_patients
+from model.preprocessor import FEATURES
+
+# Rows read, scored and inserted together
+IMPORT_CHUNK_SIZE = 1000
+
+
+class Importer:
+    """
+    Imports patients from CSV or Parquet files shaped like
+    machine_learning/data/test_dataset_breast_cancer.csv.
+
+    The file is read in chunks; every chunk is scored with a single
+    prediction call and written with a single bulk insert in its own
+    transaction. A checkpoint with the last committed chunk is kept per
+    file, so importing the same file again after a failure resumes at
+    the chunk that failed.
+    """
+
+    def __init__(self, session_factory, model, checkpoint_dir: str, chunk_size: int = IMPORT_CHUNK_SIZE,
+                 model_version: str = None):
+        """
+        Args:
+            session_factory: Callable returning a database session.
+            model: Trained model or pipeline used to predict the diagnoses.
+            checkpoint_dir (str): Directory where import checkpoints are kept.
+            chunk_size (int): Number of rows processed per chunk.
+            model_version (str): Version of the model, recorded with each imported patient.
+        """
+        self.session_factory = session_factory
+        self.model = model
+        self.checkpoint_dir = checkpoint_dir
+        self.chunk_size = chunk_size
+        self.model_version = model_version
+
+    def import_file(self, path: str, name_prefix: str = None, progress=None) -> dict:
+        """
+        Imports every patient of a file, skipping chunks already committed.
+
+        Files without a `name` column get names built from the prefix (the
+        file name by default) and the row number, so re-importing a file
+        never creates duplicates.
+
+        Args:
+            path (str): Path of the .csv or .parquet file.
+            name_prefix (str): Prefix of generated patient names.
+            progress: Optional callable receiving the summary after each chunk.
+
+        Returns:
+            dict: Summary with the chunks and rows read, inserted, skipped and invalid.
+        """
+        name_prefix = name_prefix or os.path.splitext(os.path.basename(path))[0]
+        checkpoint_path = os.path.join(
+            self.checkpoint_dir, f"{_checkpoint_key(path, name_prefix, self.chunk_size)}.json"
+        )
+        completed = _read_checkpoint(checkpoint_path)
+        summary = {"chunks": 0, "resumed_chunks": 0, "rows": 0, "inserted": 0, "skipped": 0, "invalid": 0}
+
+        offset = 0
+        for index, chunk in enumerate(self._read_chunks(path)):
+            summary["chunks"] += 1
+            summary["rows"] += len(chunk)
+            if index < completed:
+                summary["resumed_chunks"] += 1
+            else:
+                inserted, invalid = self._import_chunk(chunk, offset, name_prefix)
+                summary["inserted"] += inserted
+                summary["invalid"] += invalid
+                summary["skipped"] += len(chunk) - inserted - invalid
+                _write_checkpoint(checkpoint_path, index + 1)
+
+            offset += len(chunk)
+            if progress:
+                progress(dict(summary))
+
+        # The whole file is in, so a future import of it starts over
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        return summary
+
+    def _read_chunks(self, path: str):
+        """
+        Yields the file as DataFrames of at most chunk_size rows.
+        """
+        if path.endswith(".parquet"):
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=self.chunk_size):
+                yield batch.to_pandas()
+        else:
+            yield from Loader.load_data(path, chunksize=self.chunk_size)
+
+    def _import_chunk(self, chunk, offset: int, name_prefix: str) -> tuple:
+        """
+        Scores a chunk with one prediction call and inserts it in one transaction.
+
+        Returns:
+            tuple: Number of rows inserted and number of rows with missing features.
+        """
+        X_input = np.ascontiguousarray(chunk[FEATURES].to_numpy(dtype=np.float64))
+        valid = ~np.isnan(X_input).any(axis=1)
+        if not valid.any():
+            return 0, len(chunk)
+
+        if "name" in chunk:
+            names = chunk["name"].astype(str).to_numpy()
+        else:
+            names = np.array([f"{name_prefix}-{offset + row}" for row in range(len(chunk))])
+
+        diagnoses = Model.perform_prediction(self.model, X_input[valid])
+        values = [
+            {"name": name, **dict(zip(FEATURES, features.tolist())), "diagnosis": int(diagnosis),
+             "model_version": self.model_version}
+            for name, features, diagnosis in zip(names[valid], X_input[valid], diagnoses)
+        ]
+
+        session = self.session_factory()
+        try:
+            inserted = len(session.scalars(insert_new_patients(session).returning(Patient.id), values).all())
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        return inserted, int((~valid).sum())
+
+
+def _checkpoint_key(path: str, name_prefix: str, chunk_size: int) -> str:
+    """
+    Returns the SHA-256 identifying the checkpoint of an import: the file
+    content, the prefix of generated names and the chunk size. An import of
+    the same file with another prefix or chunking starts over, since the
+    chunks committed before hold other names or other rows.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(json.dumps([name_prefix, chunk_size]).encode())
+    return digest.hexdigest()
+
+
+def _read_checkpoint(path: str) -> int:
+    """
+    Returns the number of chunks already committed for a file.
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path) as file:
+        return json.load(file)["completed_chunks"]
+
+
+def _write_checkpoint(path: str, completed_chunks: int):
+    """
+    Records the number of chunks committed for a file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump({"completed_chunks": completed_chunks}, file)
+    os.replace(temporary_path, path)
@@ -4,10 +4,15 @@ import pandas as pd
 class Loader:
 
     @staticmethod
-    def load_data(url: str, attributes: list) -> pd.DataFrame:
+    def load_data(url: str, attributes: list = None, chunksize: int = None):
         """
         Loads and returns a DataFrame. There are various parameters 
         in read_csv that could be used to provide additional options.
+
+        When attributes is None the column names are taken from the header.
+        When chunksize is given, an iterator of DataFrames with at most
+        chunksize rows each is returned instead, so large files can be
+        processed without loading them whole.
         """
 
         return pd.read_csv(
@@ -15,5 +20,6 @@ class Loader:
             names=attributes,
             header=0,
             skiprows=0,
-            delimiter=','
-        )
\ No newline at end of file
+            delimiter=',',
+            chunksize=chunksize
+        )
@@ -0,0 +1,80 @@
+from sqlalchemy import inspect, text
+
+from logger import logger
+
+
+def migrate(engine):
+    """
+    Brings databases created by older versions of the API up to date with the
+    current models. Each step is idempotent, so it is safe to run on every start.
+    """
+    add_unique_name_index(engine)
+    add_insertion_date_index(engine)
+    add_model_version_column(engine)
+
+
+class MigrationError(RuntimeError):
+    """
+    Raised when a database cannot be upgraded without losing data.
+    """
+
+
+def add_unique_name_index(engine):
+    """
+    Adds the unique index on patients.name to tables created before it existed.
+
+    Older databases may hold several patients with the same name. Those are
+    patient records, so they are never removed here: the migration stops with
+    the list of duplicated names, to be renamed or merged by hand. Patients
+    without a name do not conflict, since a unique index allows several NULLs.
+
+    Raises:
+        MigrationError: If several patients share a name.
+    """
+    indexes = inspect(engine).get_indexes("patients")
+    if any(index["column_names"] == ["name"] and index["unique"] for index in indexes):
+        return
+
+    with engine.begin() as connection:
+        duplicates = connection.execute(text(
+            "SELECT name, COUNT(*) FROM patients WHERE name IS NOT NULL "
+            "GROUP BY name HAVING COUNT(*) > 1 ORDER BY name"
+        )).all()
+        if duplicates:
+            listed = ", ".join(f"'{name}' ({count} patients)" for name, count in duplicates[:20])
+            more = f" and {len(duplicates) - 20} more" if len(duplicates) > 20 else ""
+            raise MigrationError(
+                f"Cannot create the unique index on patients.name, {len(duplicates)} names are "
+                f"shared by several patients: {listed}{more}. Rename or merge them, then restart."
+            )
+
+        connection.execute(text("DROP INDEX IF EXISTS ix_patients_name"))
+        connection.execute(text("CREATE UNIQUE INDEX ix_patients_name ON patients (name)"))
+    logger.info("Created unique index ix_patients_name on patients.name")
+
+
+def add_insertion_date_index(engine):
+    """
+    Adds the index on patients.insertion_date used by date range filters.
+    """
+    indexes = inspect(engine).get_indexes("patients")
+    if any(index["column_names"] == ["insertion_date"] for index in indexes):
+        return
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE INDEX ix_patients_insertion_date ON patients (insertion_date)"))
+    logger.info("Created index ix_patients_insertion_date on patients.insertion_date")
+
+
+def add_model_version_column(engine):
+    """
+    Adds patients.model_version, the version of the model that predicted the
+    diagnosis. Patients stored before it existed keep a NULL version.
+    """
+    columns = inspect(engine).get_columns("patients")
+    if any(column["name"] == "model_version" for column in columns):
+        return
+
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE patients ADD COLUMN model_version VARCHAR(64)"))
+    logger.info("Added column patients.model_version")
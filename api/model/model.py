@@ -2,13 +2,16 @@ import joblib
 import numpy as np
 import pickle
 
+from model.artifact import load_array_artifact
+
 
 class Model:
     
     @staticmethod
     def load_model(path: str):
         """
-        Loads the model based on the file extension. Supports .pkl and .joblib formats.
+        Loads the model based on the file extension. Supports .pkl and .joblib formats,
+        and memory-mapped array artifacts given by the path of their manifest .json.
 
         Args:
             path (str): Path to the model file.
@@ -24,8 +27,10 @@ class Model:
                 model = pickle.load(file)
         elif path.endswith('.joblib'):
             model = joblib.load(path)
+        elif path.endswith('.json'):
+            model = load_array_artifact(path)
         else:
-            raise ValueError('Unsupported file format. Supported formats: .pkl, .joblib')
+            raise ValueError('Unsupported file format. Supported formats: .pkl, .joblib, .json')
         
         return model
     
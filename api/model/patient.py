@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Union
 
 from sqlalchemy import Column, DateTime, Float, Integer, String
+from sqlalchemy.dialects import postgresql, sqlite
 
 from model.base import Base
 
@@ -10,7 +11,7 @@ class Patient(Base):
     __tablename__ = 'patients'
 
     id = Column(Integer, primary_key=True)
-    name = Column("name", String(50))
+    name = Column("name", String(50), unique=True, index=True)
     concave_points_worst = Column("concave_points_worst", Float)
     perimeter_worst = Column("perimeter_worst", Float)
     concave_points_mean = Column("concave_points_mean", Float)
@@ -20,7 +21,8 @@ class Patient(Base):
     radius_mean = Column("radius_mean", Float)
     area_mean = Column("area_mean", Float)
     diagnosis = Column("diagnosis", Integer, nullable=True)
-    insertion_date = Column(DateTime, default=datetime.now())
+    model_version = Column("model_version", String(64), nullable=True)
+    insertion_date = Column(DateTime, default=datetime.now, index=True)
 
     def __init__(
         self, 
@@ -34,7 +36,8 @@ class Patient(Base):
         radius_mean: float,
         area_mean: float,
         diagnosis: int,
-        insertion_date: Union[DateTime, None] = None
+        insertion_date: Union[DateTime, None] = None,
+        model_version: Union[str, None] = None
     ):
         """
         Creates a Patient object.
@@ -51,6 +54,7 @@ class Patient(Base):
             area_mean: Mean area measurement.
             diagnosis: Diagnostic result (e.g., positive/negative for a condition).
             insertion_date: Date when the patient was added to the database.
+            model_version: Version of the model that predicted the diagnosis.
         """
         self.name = name
         self.concave_points_worst = concave_points_worst
@@ -62,7 +66,28 @@ class Patient(Base):
         self.radius_mean = radius_mean
         self.area_mean = area_mean
         self.diagnosis = diagnosis
+        self.model_version = model_version
 
         # Set the current date/time if no insertion date is provided.
         if insertion_date:
-            self.insertion_date = insertion_date
\ No newline at end of file
+            self.insertion_date = insertion_date
+
+
+# INSERT constructs supporting ON CONFLICT, by dialect name
+INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def insert_new_patients(session):
+    """
+    Builds an INSERT that skips patients whose name is already stored.
+
+    The unique index on name makes the duplicate check part of the insert,
+    so adding patients takes one round trip and cannot race. Add a
+    RETURNING clause to learn which rows were actually inserted.
+
+    Args:
+        session: Session the statement will run in; its database selects the
+            SQL dialect of the ON CONFLICT clause.
+    """
+    insert = INSERTS[session.get_bind().dialect.name]
+    return insert(Patient).on_conflict_do_nothing(index_elements=[Patient.name])
@@ -1,5 +1,7 @@
 import pickle
 
+from model.artifact import load_array_artifact
+
 
 class Pipeline:
 
@@ -7,7 +9,13 @@ class Pipeline:
     def load_pipeline(path: str):
         """
         Load the pipeline constructed during the training phase.
+
+        Supports pickles (.pkl) and memory-mapped array artifacts, given by the
+        path of their manifest.json (see ModelSaver.save_pipeline_arrays).
         """
+        if path.endswith('.json'):
+            return load_array_artifact(path)
+
         with open(path, 'rb') as file:
             pipeline = pickle.load(file)
-        return pipeline
\ No newline at end of file
+        return pipeline
@@ -1,8 +1,22 @@
+import json
+import os
 import pickle
 
 import numpy as np
 from sklearn.model_selection import train_test_split
 
+# Order of the features expected by the trained model
+FEATURES = [
+    'concave_points_worst',
+    'perimeter_worst',
+    'concave_points_mean',
+    'radius_worst',
+    'perimeter_mean',
+    'area_worst',
+    'radius_mean',
+    'area_mean'
+]
+
 
 class PreProcessor:
 
@@ -39,20 +53,48 @@ class PreProcessor:
         """
         Prepares the data received from the front-end for use in the model.
         """
-        X_input = np.array([
-            form.concave_points_worst,
-            form.perimeter_worst, 
-            form.concave_points_mean, 
-            form.radius_worst, 
-            form.perimeter_mean, 
-            form.area_worst, 
-            form.radius_mean, 
-            form.area_mean
-        ])
-
-        # Reshape the input so the model understands we are passing a single instance
-        X_input = X_input.reshape(1, -1)
-        return X_input
+        # A single instance is a batch with one row, so the model receives shape (1, 8)
+        return PreProcessor.prepare_batch([form])
+
+    @staticmethod
+    def prepare_batch(forms):
+        """
+        Stacks several forms into a single contiguous float64 matrix, one row per
+        form, so the model can score all of them with one vectorized call.
+        """
+        X_input = np.array(
+            [[getattr(form, feature) for feature in FEATURES] for form in forms],
+            dtype=np.float64
+        )
+        return np.ascontiguousarray(X_input.reshape(len(forms), len(FEATURES)))
+
+    @staticmethod
+    def check_features(pipeline, path: str):
+        """
+        Checks that a pipeline was trained on FEATURES, in that order, since the
+        rows it scores are built in that order from the form fields.
+
+        The training columns come from the metadata.json saved next to the
+        artifact by ModelSaver.save_version and from the feature_names_in_ of
+        the pipeline (set when it was fitted on a data frame); whichever is
+        available is checked.
+
+        Raises:
+            ValueError: If the pipeline was trained on other columns.
+        """
+        metadata_path = os.path.join(os.path.dirname(path), "metadata.json")
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as file:
+                features = json.load(file).get("features")
+            if features is not None and list(features) != FEATURES:
+                raise ValueError(f"{metadata_path} lists the features {features}, expected {FEATURES}")
+
+        names = getattr(pipeline, "feature_names_in_", None)
+        if names is not None and list(names) != FEATURES:
+            raise ValueError(f"The pipeline was fitted on the features {list(names)}, expected {FEATURES}")
+        n_features = getattr(pipeline, "n_features_in_", len(FEATURES))
+        if n_features != len(FEATURES):
+            raise ValueError(f"The pipeline was fitted on {n_features} features, expected {len(FEATURES)}")
 
     @staticmethod
     def scale_data(X_train):
@@ -0,0 +1,258 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from logger import logger
+
+
+class ModelVersion:
+    """
+    A loaded model version and the objects serving it.
+
+    Attributes:
+        version (str): Identifier of the version (the name of its content-addressed
+            directory, or the SHA-256 prefix of a standalone artifact file).
+        path (str): Path of the artifact the version was loaded from.
+        predictor: Object whose `predict` method scores rows with this version.
+        loaded_at (float): UNIX time at which the version was loaded.
+
+    Any other keyword argument (pipeline, engine, batcher, ...) is kept as an
+    attribute; those with a `close` method are closed when the version is evicted.
+    """
+
+    def __init__(self, version: str, path: str, predictor, **components):
+        self.version = version
+        self.path = path
+        self.predictor = predictor
+        self.loaded_at = time.time()
+        self.components = components
+        for name, component in components.items():
+            setattr(self, name, component)
+
+    def close(self):
+        """
+        Releases the resources of the version (e.g. the micro-batcher thread).
+        """
+        for component in self.components.values():
+            if hasattr(component, "close"):
+                component.close()
+
+
+class ModelRegistry:
+    """
+    Serves the newest model version of a directory and loads new ones in the background.
+
+    The directory holds one subdirectory per version, as written by
+    ModelSaver.save_version (a manifest.json with its arrays); the newest is
+    the one whose manifest.json was written last, so touching an older one
+    rolls back to it. A watcher thread scans the directory; a new version is
+    loaded and warmed up on that thread while the current one keeps serving,
+    then replaces it with a single reference assignment, so no request waits
+    for a load or sees a half-built model. The last `keep` versions stay in
+    memory, making a rollback to any of them immediate.
+
+    When the directory holds no version, the fallback artifact is served; its
+    version is only hashed again when its modification time or size change.
+    A version that fails to load is skipped until its manifest.json changes.
+    """
+
+    def __init__(self, versions_dir: str, fallback_path: str, load, keep: int = 2,
+                 poll_interval: float = 5.0, warmup_input: np.ndarray = None):
+        """
+        Args:
+            versions_dir (str): Directory watched for new versions.
+            fallback_path (str): Artifact served when the directory holds no version.
+            load: Callable (version, path) -> ModelVersion loading an artifact.
+            keep (int): Number of versions kept in memory, the active one included.
+            poll_interval (float): Seconds between scans of the directory.
+            warmup_input (np.ndarray): Rows scored by a new version before it is activated.
+        """
+        self.versions_dir = versions_dir
+        self.fallback_path = fallback_path
+        self.load = load
+        self.keep = max(keep, 1)
+        self.poll_interval = poll_interval
+        self.warmup_input = warmup_input
+        self._versions = OrderedDict()
+        # Versions that failed to load, with the modification time of their manifest at the time
+        self._failed = {}
+        # (modification time, size) of the fallback artifact and its version
+        self._fallback = None
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._pid = None
+        self._swaps = 0
+        self._failures = 0
+
+        self._active = self._load_newest()
+        self._versions[self._active.version] = self._active
+
+    @property
+    def active(self) -> ModelVersion:
+        """
+        The version serving predictions. Read it once per request and use that
+        object throughout, so a swap never mixes two versions in one response.
+        """
+        self._ensure_watcher()
+        return self._active
+
+    def refresh(self) -> bool:
+        """
+        Activates the newest version of the directory, loading it if needed.
+
+        A version that failed to load is tried again once its manifest.json is
+        rewritten or touched.
+
+        Returns:
+            bool: Whether the active version changed.
+        """
+        version, path, modified = self._latest()
+        if version == self._active.version or self._failed.get(version) == modified:
+            return False
+
+        loaded = self._versions.get(version)
+        if loaded is None:
+            try:
+                loaded = self._load(version, path)
+            except Exception as e:
+                self._failed[version] = modified
+                self._failures += 1
+                logger.warning("Keeping model version %s, unable to load %s: %s", self._active.version, path, e)
+                return False
+
+        self._failed.pop(version, None)
+        self._activate(loaded)
+        return True
+
+    def stats(self) -> dict:
+        """
+        Returns the active version, the resident versions and the swap counters.
+        """
+        with self._lock:
+            return {
+                "active": self._active.version,
+                "path": self._active.path,
+                "loaded_at": self._active.loaded_at,
+                "resident": list(self._versions),
+                "swaps": self._swaps,
+                "failures": self._failures
+            }
+
+    def _latest(self) -> tuple:
+        """
+        Returns the version, artifact path and modification time (in ns) of the
+        newest version of the directory, or of the fallback artifact.
+        """
+        candidates = self._candidates()
+        return candidates[0] if candidates else self._fallback_version()
+
+    def _candidates(self) -> list:
+        """
+        Returns the version, artifact path and modification time (in ns) of
+        every version of the directory, newest first.
+        """
+        candidates = []
+        if os.path.isdir(self.versions_dir):
+            for entry in os.scandir(self.versions_dir):
+                manifest_path = os.path.join(entry.path, "manifest.json")
+                if entry.is_dir() and not entry.name.startswith(".") and os.path.exists(manifest_path):
+                    candidates.append((os.stat(manifest_path).st_mtime_ns, entry.name, manifest_path))
+        return [(version, path, modified) for modified, version, path in sorted(candidates, reverse=True)]
+
+    def _fallback_version(self) -> tuple:
+        """
+        Returns the version, path and modification time (in ns) of the fallback
+        artifact, hashing it only when its modification time or size changed.
+        """
+        stat = os.stat(self.fallback_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._fallback is None or self._fallback[0] != key:
+            self._fallback = (key, file_version(self.fallback_path))
+        return self._fallback[1], self.fallback_path, stat.st_mtime_ns
+
+    def _load_newest(self) -> ModelVersion:
+        """
+        Loads the newest version of the directory that loads, or else the fallback artifact.
+
+        Versions that fail to load are skipped like refresh skips them, so one
+        broken or refused version does not keep the API from starting.
+        """
+        for version, path, modified in self._candidates():
+            try:
+                return self._load(version, path)
+            except Exception as e:
+                self._failed[version] = modified
+                self._failures += 1
+                logger.warning("Skipping model version %s, unable to load %s: %s", version, path, e)
+        version, path, _ = self._fallback_version()
+        return self._load(version, path)
+
+    def _load(self, version: str, path: str) -> ModelVersion:
+        """
+        Loads a version and scores the warm-up rows with it.
+        """
+        started = time.perf_counter()
+        loaded = self.load(version, path)
+        if self.warmup_input is not None:
+            loaded.predictor.predict(self.warmup_input)
+        logger.info("Loaded model version %s from %s in %.3fs", version, path, time.perf_counter() - started)
+        return loaded
+
+    def _activate(self, loaded: ModelVersion):
+        """
+        Makes a loaded version the active one and evicts the oldest beyond `keep`.
+        """
+        with self._lock:
+            previous = self._active
+            self._versions[loaded.version] = loaded
+            self._versions.move_to_end(loaded.version)
+            self._active = loaded
+            self._swaps += 1
+
+            evicted = []
+            while len(self._versions) > self.keep:
+                _, oldest = self._versions.popitem(last=False)
+                evicted.append(oldest)
+
+        logger.info("Switched model version %s -> %s", previous.version, loaded.version)
+        for version in evicted:
+            version.close()
+
+    def _ensure_watcher(self):
+        """
+        Starts the watcher thread, again in a forked child whose parent owned it.
+        """
+        if self.poll_interval <= 0 or (self._watcher is not None and self._pid == os.getpid()):
+            return
+        with self._lock:
+            if self._watcher is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._watcher = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+                self._watcher.start()
+
+    def _watch(self):
+        """
+        Watcher loop: looks for a new version every poll_interval seconds.
+        """
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("Unable to scan %s for model versions: %s", self.versions_dir, e)
+
+
+def file_version(path: str) -> str:
+    """
+    Returns the version of a standalone artifact: the SHA-256 prefix of its
+    content, as ModelSaver.save_version names version directories.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
@@ -0,0 +1,207 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from logger import logger
+from model.batcher import _bucket, _histogram
+
+# Upper bounds of the latency histogram buckets in milliseconds (the last bucket is unbounded)
+LATENCY_MS_BUCKETS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100]
+
+
+class ShadowEvaluator:
+    """
+    Scores a sample of live traffic with a candidate model, off the request path.
+
+    The request is answered with the production prediction as usual; its rows
+    and that prediction are handed to a small thread pool, which scores the
+    rows with both the candidate and the production model, so their latencies
+    are measured on the same rows in the same conditions, and counts how often
+    the candidate agrees with the production prediction. When the pool falls
+    behind, new samples are dropped instead of queued, so shadowing never
+    builds up memory or delays responses.
+
+    The comparison (rows, agreements, latencies) is against one production
+    version: it starts over when a request is served by another version, and
+    samples of the previous version still being scored are left out of it.
+    """
+
+    def __init__(self, candidate, candidate_version: str, fraction: float = 0.1, workers: int = 2,
+                 max_pending: int = 1000):
+        """
+        Args:
+            candidate: Model or pipeline being evaluated, with a `predict` method.
+            candidate_version (str): Identifier of the candidate model.
+            fraction (float): Share of requests scored by the candidate (0 to 1).
+            workers (int): Number of threads scoring the candidate.
+            max_pending (int): Largest number of samples waiting for a worker.
+        """
+        self.candidate = candidate
+        self.candidate_version = candidate_version
+        self.fraction = fraction
+        self.workers = workers
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._pending = 0
+        self._sampled = 0
+        self._dropped = 0
+        self._errors = 0
+        self._production_version = None
+        self._reset_comparison()
+
+    def submit(self, production_model, production_version: str, X_input: np.ndarray, y_pred: np.ndarray):
+        """
+        Samples a request for shadow scoring; returns at once.
+
+        Args:
+            production_model: Model that produced y_pred, timed against the candidate.
+            production_version (str): Identifier of the production model.
+            X_input (np.ndarray): Rows of the request.
+            y_pred (np.ndarray): Predictions returned to the client.
+        """
+        if random.random() >= self.fraction:
+            return
+        with self._lock:
+            if production_version != self._production_version:
+                self._production_version = production_version
+                self._reset_comparison()
+            self._sampled += 1
+            if self._pending >= self.max_pending:
+                self._dropped += 1
+                return
+            self._pending += 1
+        self._ensure_executor().submit(self._score, production_model, production_version, X_input, y_pred)
+
+    def stats(self) -> dict:
+        """
+        Returns the agreement rate and latencies of the candidate and production models.
+        """
+        with self._lock:
+            return {
+                "candidate_version": self.candidate_version,
+                "production_version": self._production_version,
+                "fraction": self.fraction,
+                "sampled": self._sampled,
+                "dropped": self._dropped,
+                "pending": self._pending,
+                "errors": self._errors,
+                "rows": self._rows,
+                "agreements": self._agreements,
+                "agreement_rate": self._agreements / self._rows if self._rows else None,
+                "disagreements": dict(self._disagreements),
+                "production_latency_ms": self._latencies["production"].summary(),
+                "candidate_latency_ms": self._latencies["candidate"].summary()
+            }
+
+    def report(self) -> str:
+        """
+        Returns a plain text summary of the comparison.
+        """
+        stats = self.stats()
+        lines = [
+            f"Shadow evaluation of {stats['candidate_version']} against {stats['production_version']}",
+            f"Rows compared: {stats['rows']} (sampled requests: {stats['sampled']}, "
+            f"dropped: {stats['dropped']}, errors: {stats['errors']})"
+        ]
+        if stats["rows"]:
+            lines.append(f"Agreement: {stats['agreement_rate']:.2%} ({stats['agreements']} of {stats['rows']})")
+        for pair, count in sorted(stats["disagreements"].items()):
+            production, candidate = pair.split("->")
+            lines.append(f"Production {production}, candidate {candidate}: {count}")
+        lines.append(f"{'Latency (ms)':<14}{'mean':>10}{'max':>10}")
+        for model in ("production", "candidate"):
+            latency = stats[f"{model}_latency_ms"]
+            lines.append(f"{model:<14}{latency['mean']:>10.3f}{latency['max']:>10.3f}")
+        return "\n".join(lines) + "\n"
+
+    def _score(self, production_model, production_version: str, X_input: np.ndarray, y_pred: np.ndarray):
+        """
+        Worker task: times both models on the rows and records the agreement.
+        """
+        try:
+            started = time.perf_counter()
+            production_model.predict(X_input)
+            production_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            y_candidate = self.candidate.predict(X_input)
+            candidate_ms = (time.perf_counter() - started) * 1000
+        except Exception as e:
+            logger.warning("Shadow scoring with %s failed: %s", self.candidate_version, e)
+            with self._lock:
+                self._pending -= 1
+                self._errors += 1
+            return
+
+        with self._lock:
+            self._pending -= 1
+            if production_version != self._production_version:
+                # Sampled before a swap, the comparison it belongs to was reset
+                return
+            self._rows += len(y_pred)
+            for production, candidate in zip(np.asarray(y_pred).tolist(), np.asarray(y_candidate).tolist()):
+                if production == candidate:
+                    self._agreements += 1
+                else:
+                    pair = f"{production}->{candidate}"
+                    self._disagreements[pair] = self._disagreements.get(pair, 0) + 1
+            self._latencies["production"].add(production_ms)
+            self._latencies["candidate"].add(candidate_ms)
+
+    def _reset_comparison(self):
+        """
+        Clears the comparison counters, when the production version changes. Called with the lock held.
+        """
+        self._rows = 0
+        self._agreements = 0
+        self._disagreements = {}
+        self._latencies = {"production": _LatencyStats(), "candidate": _LatencyStats()}
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        """
+        Creates the worker pool, again in a forked child whose parent owned it.
+        """
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._pid = os.getpid()
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="shadow")
+        return self._executor
+
+
+class _LatencyStats:
+    """
+    Running count, mean, maximum and histogram of latencies in milliseconds.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_MS_BUCKETS) + 1)
+
+    def add(self, value: float):
+        """
+        Records one latency.
+        """
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.buckets[_bucket(LATENCY_MS_BUCKETS, value)] += 1
+
+    def summary(self) -> dict:
+        """
+        Returns the count, mean, maximum and histogram of the recorded latencies.
+        """
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "histogram": _histogram(LATENCY_MS_BUCKETS, self.buckets)
+        }
@@ -0,0 +1,64 @@
+from sqlalchemy import event
+
+# PRAGMA settings applied to every new SQLite connection, by profile
+SQLITE_PROFILES = {
+    # SQLite's own defaults: rollback journal, synchronous FULL, no busy timeout
+    "default": {},
+    # Readers never block the writer and the writer never blocks readers (WAL);
+    # a commit no longer waits for the disk to sync, only checkpoints do, which
+    # can lose the last transactions on a power failure but never corrupts the
+    # database; a writer waits for the lock instead of failing with "database
+    # is locked"; pages are read through a memory map and cached per connection
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY"
+    }
+}
+
+
+def sqlite_pragmas(profile: str, **overrides) -> dict:
+    """
+    Returns the PRAGMA settings of a storage profile.
+
+    Args:
+        profile (str): Name of a profile of SQLITE_PROFILES.
+        **overrides: Settings replacing those of the profile; None values are ignored.
+
+    Returns:
+        dict: The PRAGMA values by name.
+
+    Raises:
+        ValueError: If the profile does not exist.
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile {profile!r}, expected one of {', '.join(SQLITE_PROFILES)}")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    pragmas.update((name, value) for name, value in overrides.items() if value is not None)
+    return pragmas
+
+
+def configure_sqlite(engine, pragmas: dict):
+    """
+    Applies the PRAGMA settings to every connection the engine opens.
+
+    Must be called before the engine's first connection, which is then configured too.
+
+    Args:
+        engine: SQLAlchemy engine of a SQLite database.
+        pragmas (dict): The PRAGMA values by name, as returned by sqlite_pragmas.
+    """
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
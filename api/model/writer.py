@@ -0,0 +1,179 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from model.batcher import BATCH_SIZE_BUCKETS, _bucket, _histogram
+from model.patient import Patient, insert_new_patients
+
+
+class GroupCommitWriter:
+    """
+    Gathers patient inserts from concurrent requests and writes them in a
+    single transaction.
+
+    SQLite has a single writer: each commit takes the write lock and, outside
+    WAL mode, syncs the journal to disk. Committing the inserts of all the
+    requests that arrived within `window_ms` together pays that cost once per
+    group instead of once per patient. A group is closed when `max_rows`
+    inserts are pending or when `window_ms` milliseconds have passed since
+    its first insert arrived, whichever comes first.
+    """
+
+    def __init__(self, session_factory, window_ms: float = 2.0, max_rows: int = 256):
+        """
+        Args:
+            session_factory: Session factory bound to the database (e.g. Session.session_factory).
+            window_ms (float): How long a group waits for more inserts.
+            max_rows (int): Largest number of patients inserted in a single transaction.
+        """
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_rows = max_rows
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._pid = None
+        self._closed = False
+        self._groups = 0
+        self._rows = 0
+        self._failures = 0
+        self._group_sizes = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+
+    def insert(self, values: dict):
+        """
+        Queues a patient for the next group and blocks until its transaction is committed.
+
+        Once the writer is closed, the patient is inserted in a transaction of its own.
+
+        Args:
+            values (dict): Column values of the patient.
+
+        Returns:
+            Patient: The stored patient, detached from any session, or None when
+            its name was already taken.
+
+        Raises:
+            Exception: The error that made the insert fail.
+        """
+        self._ensure_worker()
+        future = Future()
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._queue.put((values, future))
+        if closed:
+            return self._write([values])[0]
+        return future.result()
+
+    def close(self):
+        """
+        Stops the worker thread once the inserts already queued are committed.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._worker is not None and self._pid == os.getpid():
+                self._queue.put(None)
+
+    def stats(self) -> dict:
+        """
+        Returns the queue depth and the group size statistics.
+        """
+        with self._lock:
+            return {
+                "window_ms": self.window * 1000,
+                "max_rows": self.max_rows,
+                "queue_depth": self._queue.qsize(),
+                "groups": self._groups,
+                "rows": self._rows,
+                "failures": self._failures,
+                "group_size_histogram": _histogram(BATCH_SIZE_BUCKETS, self._group_sizes)
+            }
+
+    def _ensure_worker(self):
+        """
+        Starts the worker thread, again in a forked child whose parent owned it.
+        """
+        if self._closed or (self._worker is not None and self._pid == os.getpid()):
+            return
+        with self._lock:
+            if not self._closed and (self._worker is None or self._pid != os.getpid()):
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._worker = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        """
+        Worker loop: collects a group, commits it and hands back each result,
+        until it takes the None queued by close.
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            group = [item]
+            deadline = time.perf_counter() + self.window
+
+            while len(group) < self.max_rows:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._commit(group)
+                    return
+                group.append(item)
+
+            self._commit(group)
+
+    def _commit(self, group: list):
+        """
+        Inserts the patients of a group in one transaction and resolves each caller's future.
+        """
+        try:
+            patients = self._write([values for values, _ in group])
+        except Exception as e:
+            with self._lock:
+                self._failures += 1
+            if len(group) == 1:
+                group[0][1].set_exception(e)
+                return
+            # Retry each insert on its own, so one bad row only fails its own request
+            for values, future in group:
+                try:
+                    future.set_result(self._write([values])[0])
+                except Exception as e:
+                    future.set_exception(e)
+            return
+
+        for patient, (_, future) in zip(patients, group):
+            future.set_result(patient)
+
+        with self._lock:
+            self._groups += 1
+            self._rows += len(group)
+            self._group_sizes[_bucket(BATCH_SIZE_BUCKETS, len(group))] += 1
+
+    def _write(self, rows: list) -> list:
+        """
+        Inserts the rows in one transaction.
+
+        Returns:
+            list: The stored patient of each row, or None for a row whose name was
+            already taken, including by an earlier row of the same group.
+        """
+        with self.session_factory(expire_on_commit=False) as session:
+            stored = {
+                patient.name: patient
+                for patient in session.scalars(insert_new_patients(session).returning(Patient), rows)
+            }
+            session.commit()
+
+        return [stored.pop(values["name"], None) for values in rows]
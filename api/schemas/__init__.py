@@ -1,9 +1,26 @@
+from schemas.encoder import dumps
 from schemas.error import ErrorSchema
+from schemas.inference import (
+    BatcherStatsSchema,
+    CacheStatsSchema,
+    InferenceStatsSchema,
+    LatencyStatsSchema,
+    RegistryStatsSchema,
+    ShadowStatsSchema
+)
 from schemas.patient import (
+    PatientBatchResultSchema,
+    PatientBatchViewSchema,
     PatientDeleteSchema,
+    PatientExportQuerySchema,
+    PatientImportViewSchema,
+    PatientListQuerySchema,
+    PatientPageSchema,
     PatientSchema,
     PatientSearchSchema,
     PatientViewSchema,
+    VIEW_COLUMNS,
     present_patient,
-    present_patients
+    present_patients,
+    present_rows
 )
\ No newline at end of file
@@ -0,0 +1,24 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+def dumps(payload) -> bytes:
+    """
+    Encodes a payload as UTF-8 JSON bytes.
+
+    Uses orjson, which encodes lists of row dictionaries several times faster
+    than the standard library, and falls back to json when it is not installed.
+
+    Args:
+        payload: Dictionaries, lists and scalars to encode.
+
+    Returns:
+        bytes: The encoded payload.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
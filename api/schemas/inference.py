@@ -0,0 +1,136 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class BatcherStatsSchema(BaseModel):
+    """
+    Schema that defines how the micro-batcher statistics will be returned.
+
+    Attributes:
+        window_ms (float): How long a batch waits for more requests.
+        max_rows (int): Largest number of rows scored in a single call.
+        queue_depth (int): Requests waiting for the next batch.
+        batches (int): Batches scored since startup.
+        rows (int): Rows scored since startup.
+        batch_size_histogram (Dict[str, int]): Batches per batch size bucket, keyed by upper bound.
+        wait_ms_histogram (Dict[str, int]): Requests per queue wait bucket in milliseconds.
+        wait_ms_sum (float): Total time requests spent waiting in the queue.
+        wait_ms_max (float): Longest time a request spent waiting in the queue.
+    """
+    window_ms: float = 2.0
+    max_rows: int = 64
+    queue_depth: int = 0
+    batches: int = 0
+    rows: int = 0
+    batch_size_histogram: Dict[str, int] = {}
+    wait_ms_histogram: Dict[str, int] = {}
+    wait_ms_sum: float = 0.0
+    wait_ms_max: float = 0.0
+
+
+class CacheStatsSchema(BaseModel):
+    """
+    Schema that defines how the prediction cache statistics will be returned.
+
+    Attributes:
+        size (int): Rows currently cached.
+        max_size (int): Largest number of rows kept in the cache.
+        ttl (float): Seconds after which a cached prediction expires.
+        hits (int): Rows answered from the cache since startup.
+        misses (int): Rows scored by the model since startup.
+        evictions (int): Rows dropped to make room for newer ones.
+        fingerprint (str): Version of the model the cached predictions belong to.
+    """
+    size: int = 0
+    max_size: int = 4096
+    ttl: float = 3600
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    fingerprint: str = ""
+
+
+class RegistryStatsSchema(BaseModel):
+    """
+    Schema that defines how the model registry statistics will be returned.
+
+    Attributes:
+        active (str): Version serving predictions.
+        path (str): Artifact the active version was loaded from.
+        loaded_at (float): UNIX time at which the active version was loaded.
+        resident (List[str]): Versions kept in memory, oldest first.
+        swaps (int): Times the active version changed since startup.
+        failures (int): Versions that could not be loaded since startup.
+    """
+    active: str = ""
+    path: str = ""
+    loaded_at: float = 0.0
+    resident: List[str] = []
+    swaps: int = 0
+    failures: int = 0
+
+
+class InferenceStatsSchema(BaseModel):
+    """
+    Schema that defines how the statistics of the model serving layer will be returned.
+
+    Attributes:
+        registry (RegistryStatsSchema): Statistics of the model registry.
+        batcher (BatcherStatsSchema): Statistics of the micro-batcher of the active version.
+        cache (Optional[CacheStatsSchema]): Statistics of the prediction cache of the active version, if enabled.
+    """
+    registry: RegistryStatsSchema
+    batcher: BatcherStatsSchema
+    cache: Optional[CacheStatsSchema] = None
+
+
+class LatencyStatsSchema(BaseModel):
+    """
+    Schema that defines how latency statistics will be returned.
+
+    Attributes:
+        count (int): Measured calls.
+        mean (float): Mean latency in milliseconds.
+        max (float): Longest latency in milliseconds.
+        histogram (Dict[str, int]): Calls per latency bucket, keyed by upper bound in milliseconds.
+    """
+    count: int = 0
+    mean: float = 0.0
+    max: float = 0.0
+    histogram: Dict[str, int] = {}
+
+
+class ShadowStatsSchema(BaseModel):
+    """
+    Schema that defines how the shadow evaluation of a candidate model will be returned.
+
+    Attributes:
+        candidate_version (str): Version of the candidate model.
+        production_version (Optional[str]): Version of the production model it is compared with;
+            the counts below start over when it changes.
+        fraction (float): Share of requests scored by the candidate.
+        sampled (int): Requests sampled for shadow scoring.
+        dropped (int): Sampled requests skipped because the workers were behind.
+        pending (int): Sampled requests waiting for a worker.
+        errors (int): Sampled requests the candidate failed to score.
+        rows (int): Rows scored by both models.
+        agreements (int): Rows where both models predicted the same diagnosis.
+        agreement_rate (Optional[float]): Share of rows where both models agreed.
+        disagreements (Dict[str, int]): Rows per "production->candidate" pair of differing diagnoses.
+        production_latency_ms (LatencyStatsSchema): Latency of the production model on the sampled rows.
+        candidate_latency_ms (LatencyStatsSchema): Latency of the candidate model on the same rows.
+    """
+    candidate_version: str = ""
+    production_version: Optional[str] = None
+    fraction: float = 0.1
+    sampled: int = 0
+    dropped: int = 0
+    pending: int = 0
+    errors: int = 0
+    rows: int = 0
+    agreements: int = 0
+    agreement_rate: Optional[float] = None
+    disagreements: Dict[str, int] = {}
+    production_latency_ms: LatencyStatsSchema
+    candidate_latency_ms: LatencyStatsSchema
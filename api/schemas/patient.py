@@ -1,6 +1,7 @@
-from typing import List
+from datetime import datetime
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from model.patient import Patient
 
@@ -19,7 +20,11 @@ class PatientSchema(BaseModel):
         area_worst (float): Largest (mean of the three largest values) area of the cell nucleus.
         radius_mean (float): Mean of distances from center to points on the perimeter.
         area_mean (float): Mean area of the cell nucleus.
+
+    NaN and infinite feature values are refused: the model cannot score them.
     """
+    model_config = ConfigDict(allow_inf_nan=False)
+
     name: str = "Maria"
     concave_points_worst: float = 0.2654
     perimeter_worst: float = 184.6
@@ -47,7 +52,11 @@ class PatientViewSchema(BaseModel):
         radius_mean (float): Mean of distances from center to points on the perimeter.
         area_mean (float): Mean area of the cell nucleus.
         diagnosis (Optional[int]): The diagnostic outcome (e.g., 0 or 1, can be None).
+        model_version (Optional[str]): Version of the model that predicted the diagnosis.
     """
+    # model_version is a patient field, not pydantic's model_ namespace
+    model_config = ConfigDict(protected_namespaces=())
+
     id: int = 1
     name: str = "Maria"
     concave_points_worst: float = 0.2654
@@ -59,6 +68,7 @@ class PatientViewSchema(BaseModel):
     radius_mean: float = 17.99
     area_mean: float = 1001.0
     diagnosis: int = None
+    model_version: Optional[str] = None
 
 
 class PatientSearchSchema(BaseModel):
@@ -83,6 +93,120 @@ class PatientListSchema(BaseModel):
     patients: List[PatientSchema]
 
 
+class PatientListQuerySchema(BaseModel):
+    """
+    Schema that defines how a page of the patient listing is requested.
+
+    Pages are ordered by id; pass the `next_after` value of a page as `after`
+    to fetch the following one.
+
+    Attributes:
+        limit (int): Largest number of patients returned in the page.
+        after (Optional[int]): Only patients with an id greater than this one are returned.
+        fields (Optional[str]): Comma-separated PatientViewSchema fields to return (id is always included).
+        diagnosis (Optional[int]): Only patients with this diagnosis are returned.
+        inserted_from (Optional[datetime]): Only patients inserted at or after this date are returned.
+        inserted_to (Optional[datetime]): Only patients inserted before this date are returned.
+    """
+    limit: int = Field(100, ge=1, le=1000)
+    after: Optional[int] = None
+    fields: Optional[str] = None
+    diagnosis: Optional[int] = None
+    inserted_from: Optional[datetime] = None
+    inserted_to: Optional[datetime] = None
+
+    @field_validator("fields")
+    @classmethod
+    def check_fields(cls, fields: Optional[str]) -> Optional[str]:
+        """Rejects field names that are not part of PatientViewSchema."""
+        if fields is None:
+            return fields
+        unknown = set(cls.split_fields(fields)) - set(PatientViewSchema.model_fields)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return fields
+
+    @staticmethod
+    def split_fields(fields: str) -> List[str]:
+        """Splits a comma-separated list of fields, ignoring blanks."""
+        return [field.strip() for field in fields.split(",") if field.strip()]
+
+    def columns(self) -> List[str]:
+        """Returns the requested fields, always starting with id, in schema order."""
+        if self.fields is None:
+            return list(PatientViewSchema.model_fields)
+        requested = {"id", *self.split_fields(self.fields)}
+        return [field for field in PatientViewSchema.model_fields if field in requested]
+
+
+class PatientPageSchema(BaseModel):
+    """
+    Schema that defines how a page of patients will be returned.
+
+    Attributes:
+        patients (List[PatientViewSchema]): The patients of the page, ordered by id.
+        next_after (Optional[int]): Cursor of the next page, or None on the last page.
+    """
+    patients: List[PatientViewSchema]
+    next_after: Optional[int] = None
+
+
+class PatientExportQuerySchema(BaseModel):
+    """
+    Schema that defines how an export of the patients table is requested.
+
+    Attributes:
+        format (str): Encoding of the export: ndjson, csv or parquet.
+    """
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson"
+
+
+class PatientImportViewSchema(BaseModel):
+    """
+    Schema that defines how the summary of an import will be returned.
+
+    Attributes:
+        chunks (int): Chunks read from the file.
+        resumed_chunks (int): Chunks skipped because a previous import had committed them.
+        rows (int): Rows read from the file.
+        inserted (int): Patients added to the database.
+        skipped (int): Rows whose name was already in the database.
+        invalid (int): Rows with missing features.
+    """
+    chunks: int = 0
+    resumed_chunks: int = 0
+    rows: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    invalid: int = 0
+
+
+class PatientBatchResultSchema(BaseModel):
+    """
+    Schema that defines the outcome of a single row of a patient batch.
+
+    Attributes:
+        index (int): Position of the row in the submitted batch.
+        status (int): HTTP-like status of the row (200, 400 or 409).
+        patient (Optional[PatientViewSchema]): The stored patient, when the row was added.
+        message (Optional[str]): The error message, when the row was rejected.
+    """
+    index: int = 0
+    status: int = 200
+    patient: Optional[PatientViewSchema] = None
+    message: Optional[str] = None
+
+
+class PatientBatchViewSchema(BaseModel):
+    """
+    Schema that defines how the results of a patient batch will be returned.
+
+    Attributes:
+        results (List[PatientBatchResultSchema]): One result per submitted row, in order.
+    """
+    results: List[PatientBatchResultSchema]
+
+
 class PatientDeleteSchema(BaseModel):
     """
     Schema that defines how a patient for deletion is represented.
@@ -93,6 +217,10 @@ class PatientDeleteSchema(BaseModel):
     name: str = "Maria"
 
 
+# Fields of PatientViewSchema, in the order they are presented
+VIEW_COLUMNS = list(PatientViewSchema.model_fields)
+
+
 def present_patient(patient: Patient) -> dict:
     """
     Returns a dictionary representation of a patient following the PatientViewSchema.
@@ -114,7 +242,8 @@ def present_patient(patient: Patient) -> dict:
         "area_worst": patient.area_worst,
         "radius_mean": patient.radius_mean,
         "area_mean": patient.area_mean,
-        "diagnosis": patient.diagnosis
+        "diagnosis": patient.diagnosis,
+        "model_version": patient.model_version
     }
 
 
@@ -128,20 +257,21 @@ def present_patients(patients: List[Patient]) -> dict:
     Returns:
         dict: A dictionary with a key "patients", containing a list of patient details.
     """
-    result = []
-    for patient in patients:
-        result.append({
-            "id": patient.id,
-            "name": patient.name,
-            "concave_points_worst": patient.concave_points_worst,
-            "perimeter_worst": patient.perimeter_worst,
-            "concave_points_mean": patient.concave_points_mean,
-            "radius_worst": patient.radius_worst,
-            "perimeter_mean": patient.perimeter_mean,
-            "area_worst": patient.area_worst,
-            "radius_mean": patient.radius_mean,
-            "area_mean": patient.area_mean,
-            "diagnosis": patient.diagnosis
-        })
-
-    return {"patients": result}
\ No newline at end of file
+    return {"patients": [present_patient(patient) for patient in patients]}
+
+
+def present_rows(rows: list, columns: List[str] = VIEW_COLUMNS) -> list:
+    """
+    Returns dictionary representations of plain row tuples selected from the patients table.
+
+    Selecting columns instead of Patient objects skips the ORM identity map and
+    attribute instrumentation, which dominate the cost of large listings.
+
+    Args:
+        rows (list): Row tuples with one value per column.
+        columns (List[str]): Names of the selected columns, in row order.
+
+    Returns:
+        list: A list of dictionaries keyed by column name.
+    """
+    return [dict(zip(columns, row)) for row in rows]
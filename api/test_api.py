@@ -0,0 +1,224 @@
+import csv
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import delete
+
+from app import create_app
+from model import Model, Patient, Session, create_db_engine, engine
+
+PATH_DATASET = "./machine_learning/data/test_dataset_breast_cancer.csv"
+
+PATIENT = {
+    "name": "Maria",
+    "concave_points_worst": 0.2654,
+    "perimeter_worst": 184.6,
+    "concave_points_mean": 0.1471,
+    "radius_worst": 25.38,
+    "perimeter_mean": 122.8,
+    "area_worst": 2019.0,
+    "radius_mean": 17.99,
+    "area_mean": 1001.0
+}
+BENIGN_PATIENT = {
+    "name": "Ana",
+    "concave_points_worst": 0.04262,
+    "perimeter_worst": 83.61,
+    "concave_points_mean": 0.01162,
+    "radius_worst": 13.28,
+    "perimeter_mean": 73.7,
+    "area_worst": 542.5,
+    "radius_mean": 11.66,
+    "area_mean": 421.0
+}
+
+app = create_app()
+
+@pytest.fixture()
+def client():
+    """Fixture that yields a test client and removes every patient afterwards."""
+    client = app.test_client()
+    yield client
+    # The listing is paged, so empty the table directly instead of deleting what it returns
+    with engine.begin() as connection:
+        connection.execute(delete(Patient))
+
+def test_add_patients_batch(client):
+    """Test that a batch is scored row by row with one result per row."""
+    rows = [
+        {**PATIENT, "name": "batch-1"},
+        {**BENIGN_PATIENT, "name": "batch-2"},
+        {**PATIENT, "name": "batch-1"},
+        {**PATIENT, "name": "batch-3", "area_mean": "not a number"}
+    ]
+    response = client.post('/patients/batch', json={"patients": rows})
+
+    assert response.status_code == 200
+    results = response.json["results"]
+    assert [result["status"] for result in results] == [200, 200, 409, 400]
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[0]["patient"]["diagnosis"] == 1
+    assert results[1]["patient"]["diagnosis"] == 0
+
+def test_add_patients_batch_matches_single_prediction(client):
+    """Test that batch predictions agree with the single patient endpoint."""
+    single = client.post('/patient', data={**BENIGN_PATIENT, "name": "single"})
+    batch = client.post('/patients/batch', json={"patients": [{**BENIGN_PATIENT, "name": "batched"}]})
+
+    assert single.status_code == 200
+    assert batch.json["results"][0]["patient"]["diagnosis"] == single.json["diagnosis"]
+
+def test_patients_record_the_model_version(client):
+    """Test that stored patients carry the version of the model that scored them."""
+    version = client.get('/inference/stats').json["registry"]["active"]
+    single = client.post('/patient', data={**PATIENT, "name": "versioned"})
+    batch = client.post('/patients/batch', json={"patients": [{**PATIENT, "name": "versioned-batch"}]})
+
+    assert single.json["model_version"] == version
+    assert batch.json["results"][0]["patient"]["model_version"] == version
+
+def test_metrics_report_phases_and_requests(client):
+    """Test that /metrics exposes phase timings, request counts, pool stats and the model version."""
+    client.post('/patient', data={**PATIENT, "name": "measured"})
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    text = response.data.decode()
+    for phase in ("validation", "prepare", "predict", "insert", "commit"):
+        assert f'patient_phase_duration_seconds_count{{operation="add_patient",phase="{phase}"}}' in text
+    assert 'http_requests_total{route="/patient",method="POST",status="200"}' in text
+    assert 'db_pool_connections{state="checked_out"}' in text
+    assert 'model_info{version="' in text
+
+def test_metrics_without_a_sized_pool(client, monkeypatch):
+    """Test that /metrics leaves out the pool gauges of an in-memory database, whose pool has no size."""
+    import app as app_module
+
+    memory_engine = create_db_engine("sqlite://")
+    monkeypatch.setattr(app_module, "engine", memory_engine)
+    response = client.get('/metrics')
+    memory_engine.dispose()
+
+    assert response.status_code == 200
+    assert "db_pool_connections" not in response.data.decode()
+    assert 'model_info{version="' in response.data.decode()
+
+def test_shadow_endpoints_without_candidate(client):
+    """Test that the shadow endpoints report that no candidate is configured."""
+    assert client.get('/inference/shadow').status_code == 404
+    assert client.get('/inference/shadow/report').status_code == 404
+
+def test_add_patient_rejects_non_finite_features(client):
+    """Test that NaN and infinite features are refused instead of being scored and stored."""
+    for value in ("nan", "inf", "-inf"):
+        response = client.post('/patient', data={**PATIENT, "radius_mean": value})
+        assert response.status_code == 422
+    assert client.get('/patient', query_string={"name": PATIENT["name"]}).status_code == 404
+
+def test_add_patients_batch_rejects_non_finite_rows(client):
+    """Test that a row with a NaN or infinite feature is refused on its own."""
+    rows = [
+        {**PATIENT, "name": "finite"},
+        {**PATIENT, "name": "not-a-number", "radius_mean": float("nan")},
+        {**PATIENT, "name": "infinite", "area_mean": float("inf")}
+    ]
+    response = client.post('/patients/batch', json={"patients": rows})
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.get_json()["results"]] == [200, 400, 400]
+
+def test_add_patients_batch_reports_prediction_errors(client, monkeypatch):
+    """Test that a failing prediction is answered with a JSON error and stores nothing."""
+    def fail(model, X_input):
+        raise ValueError("broken model")
+
+    monkeypatch.setattr(Model, "perform_prediction", staticmethod(fail))
+    response = client.post('/patients/batch', json={"patients": [PATIENT]})
+
+    assert response.status_code == 500
+    assert "broken model" in response.get_json()["message"]
+    assert client.get('/patient', query_string={"name": PATIENT["name"]}).status_code == 404
+
+def test_add_patients_batch_conflicts_with_existing(client):
+    """Test that names already stored are reported as conflicts."""
+    client.post('/patient', data=PATIENT)
+    response = client.post('/patients/batch', json={"patients": [PATIENT]})
+
+    assert response.json["results"][0]["status"] == 409
+
+def test_add_patients_batch_rejects_empty(client):
+    """Test that an empty or malformed batch is rejected as a whole."""
+    assert client.post('/patients/batch', json={"patients": []}).status_code == 400
+    assert client.post('/patients/batch', json=[PATIENT]).status_code == 400
+
+def test_session_is_released_after_request(client):
+    """Test that each request's session is removed once the request ends."""
+    client.get('/patients')
+
+    assert not Session.registry.has(), "Session should be removed at teardown"
+
+def test_request_id_is_echoed(client):
+    """Test that the X-Request-ID header is passed through, or generated when missing."""
+    assert client.get('/patients', headers={"X-Request-ID": "abc123"}).headers["X-Request-ID"] == "abc123"
+    assert len(client.get('/patients').headers["X-Request-ID"]) == 32
+
+def test_get_patients_pages_by_id(client):
+    """Test that the listing is split in pages linked by the next_after cursor."""
+    rows = [{**PATIENT, "name": f"page-{i}"} for i in range(5)]
+    client.post('/patients/batch', json={"patients": rows})
+
+    first = client.get('/patients', query_string={"limit": 2}).json
+    second = client.get('/patients', query_string={"limit": 2, "after": first["next_after"]}).json
+    last = client.get('/patients', query_string={"limit": 2, "after": second["next_after"]}).json
+
+    names = [patient["name"] for page in (first, second, last) for patient in page["patients"]]
+    assert names == [row["name"] for row in rows]
+    assert last["next_after"] is None
+
+def test_get_patients_projection_and_filters(client):
+    """Test that only the requested fields of matching patients are returned."""
+    client.post('/patients/batch', json={"patients": [PATIENT, BENIGN_PATIENT]})
+
+    response = client.get('/patients', query_string={"fields": "name,diagnosis", "diagnosis": 0})
+
+    assert response.status_code == 200
+    assert response.json["patients"] == [{"id": response.json["patients"][0]["id"], "name": "Ana", "diagnosis": 0}]
+    assert client.get('/patients', query_string={"fields": "password"}).status_code == 422
+    assert client.get('/patients', query_string={"inserted_from": "2999-01-01T00:00:00"}).json["patients"] == []
+
+def test_export_patients_formats(client):
+    """Test that the export returns every patient in each supported format."""
+    client.post('/patients/batch', json={"patients": [PATIENT, BENIGN_PATIENT]})
+
+    ndjson = client.get('/patients/export', query_string={"format": "ndjson"})
+    rows = [json.loads(line) for line in ndjson.get_data(as_text=True).splitlines()]
+    assert ndjson.mimetype == "application/x-ndjson"
+    assert [row["name"] for row in rows] == ["Maria", "Ana"]
+    assert rows[0]["insertion_date"]
+
+    csv_rows = list(csv.DictReader(io.StringIO(client.get('/patients/export?format=csv').get_data(as_text=True))))
+    assert [row["diagnosis"] for row in csv_rows] == ["1", "0"]
+
+    table = pq.read_table(pa.BufferReader(client.get('/patients/export?format=parquet').get_data()))
+    assert table.column("name").to_pylist() == ["Maria", "Ana"]
+    assert client.get('/patients/export?format=xml').status_code == 422
+
+def test_import_patients_csv(client):
+    """Test that an uploaded CSV is imported once, with predicted diagnoses."""
+    with open(PATH_DATASET, "rb") as file:
+        content = file.read()
+
+    first = client.post('/patients/import', data={"file": (io.BytesIO(content), "cohort.csv")},
+                        content_type="multipart/form-data")
+    second = client.post('/patients/import', data={"file": (io.BytesIO(content), "cohort.csv")},
+                         content_type="multipart/form-data")
+
+    assert first.status_code == 200
+    assert first.json["inserted"] == first.json["rows"] == 114
+    assert second.json["skipped"] == 114
+    assert client.get('/patient', query_string={"name": "cohort-0"}).json["diagnosis"] in (0, 1)
+    assert client.post('/patients/import', data={"file": (io.BytesIO(content), "cohort.txt")},
+                       content_type="multipart/form-data").status_code == 400
@@ -0,0 +1,61 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from model import Loader, Model, Pipeline
+from model.artifact import load_array_artifact
+
+PATH_DATASET = "./machine_learning/data/X_test_dataset_breast_cancer.csv"
+PATH_PIPELINE = "./machine_learning/pipelines/svc_breast_cancer_pipeline.pkl"
+PATH_PIPELINE_ARRAYS = "./machine_learning/pipelines/svc_breast_cancer_pipeline/manifest.json"
+PATH_MODEL = "./machine_learning/models/svc_breast_cancer_classification.pkl"
+PATH_MODEL_ARRAYS = "./machine_learning/models/svc_breast_cancer_classification/manifest.json"
+
+def load_test_features():
+    """Loads the features of the test dataset."""
+    return Loader.load_data(PATH_DATASET).to_numpy(dtype=np.float64)
+
+def test_array_pipeline_matches_pickle():
+    """Test that the memory-mapped pipeline predicts exactly like the pickled one."""
+    X_test = load_test_features()
+    pickled = Pipeline.load_pipeline(PATH_PIPELINE)
+    mapped = Pipeline.load_pipeline(PATH_PIPELINE_ARRAYS)
+
+    assert isinstance(mapped.steps[-1][1].support_vectors_, np.memmap)
+    assert np.array_equal(pickled.predict(X_test), mapped.predict(X_test))
+    assert np.array_equal(pickled.decision_function(X_test), mapped.decision_function(X_test))
+    assert np.allclose(pickled.predict_proba(X_test), mapped.predict_proba(X_test))
+
+def test_array_model_matches_pickle():
+    """Test that the memory-mapped model predicts exactly like the pickled one."""
+    X_test = Pipeline.load_pipeline(PATH_PIPELINE).steps[0][1].transform(load_test_features())
+    pickled = Model.load_model(PATH_MODEL)
+    mapped = Model.load_model(PATH_MODEL_ARRAYS)
+
+    assert np.array_equal(Model.perform_prediction(pickled, X_test), Model.perform_prediction(mapped, X_test))
+
+def test_corrupted_array_is_rejected(tmp_path):
+    """Test that an array whose content no longer matches the manifest checksum fails to load."""
+    artifact = tmp_path / "pipeline"
+    shutil.copytree(PATH_PIPELINE_ARRAYS.rsplit("/", 1)[0], artifact)
+    support_vectors = artifact / "1-support_vectors_.npy"
+    array = np.load(support_vectors)
+    array[0, 0] += 1
+    np.save(support_vectors, array)
+
+    with pytest.raises(ValueError, match="checksum"):
+        load_array_artifact(str(artifact / "manifest.json"), verify=True)
+
+
+def test_checksums_are_not_verified_by_default(tmp_path):
+    """Test that loading does not read the arrays unless verification is asked for."""
+    artifact = tmp_path / "pipeline"
+    shutil.copytree(PATH_PIPELINE_ARRAYS.rsplit("/", 1)[0], artifact)
+    support_vectors = artifact / "1-support_vectors_.npy"
+    array = np.load(support_vectors)
+    array[0, 0] += 1
+    np.save(support_vectors, array)
+
+    pipeline = Pipeline.load_pipeline(str(artifact / "manifest.json"))
+    assert isinstance(pipeline.steps[1][1].support_vectors_, np.memmap)
@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+from asgi import application
+
+def call(method: str, path: str, body: bytes = b"", query: bytes = b"") -> tuple:
+    """Sends one HTTP request through the ASGI application and returns its status and body."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query,
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode())
+        ],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80)
+    }
+    asyncio.run(application(scope, receive, send))
+
+    status = next(message["status"] for message in messages if message["type"] == "http.response.start")
+    content = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+    return status, content
+
+def test_asgi_application_serves_requests():
+    """Test that the ASGI entry point adds, lists and removes patients."""
+    patient = {"name": "asgi", "area_mean": 421.0}
+
+    status, content = call("POST", "/patients/batch", json.dumps({"patients": [patient]}).encode())
+    assert status == 200
+    assert json.loads(content)["results"][0]["status"] == 200
+
+    status, content = call("GET", "/patients", query=b"fields=name")
+    assert status == 200
+    assert "asgi" in [row["name"] for row in json.loads(content)["patients"]]
+
+    status, _ = call("DELETE", "/patient", query=b"name=asgi")
+    assert status == 200
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from model import MicroBatcher
+
+
+class SumModel:
+    """Stand-in model that records the size of every batch it scores."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(len(X))
+        return X.sum(axis=1)
+
+def test_micro_batcher_returns_each_caller_its_rows():
+    """Test that concurrent callers get back the predictions of their own rows."""
+    model = SumModel()
+    batcher = MicroBatcher(model, window_ms=50, max_rows=64)
+    inputs = [np.full((1, 8), i, dtype=np.float64) for i in range(32)]
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        results = list(executor.map(batcher.predict, inputs))
+
+    assert [float(result[0]) for result in results] == [8.0 * i for i in range(32)]
+    assert len(model.calls) < 32, "Concurrent requests should share model calls"
+    assert sum(model.calls) == 32
+
+def test_micro_batcher_respects_max_rows():
+    """Test that no batch exceeds the configured number of rows."""
+    model = SumModel()
+    batcher = MicroBatcher(model, window_ms=50, max_rows=4)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(batcher.predict, [np.ones((1, 8))] * 16))
+
+    assert max(model.calls) <= 4
+    stats = batcher.stats()
+    assert stats["rows"] == 16
+    assert sum(stats["wait_ms_histogram"].values()) == 16
+    assert stats["queue_depth"] == 0
+
+def test_micro_batcher_scores_directly_once_closed():
+    """Test that closing stops the worker and later calls still get predictions."""
+    model = SumModel()
+    batcher = MicroBatcher(model, window_ms=1, max_rows=4)
+    batcher.predict(np.ones((1, 8)))
+    worker = batcher._worker
+
+    batcher.close()
+    worker.join(timeout=1)
+
+    assert not worker.is_alive()
+    assert batcher.predict(np.ones((2, 8))).tolist() == [8.0, 8.0]
+
+class FiniteModel(SumModel):
+    """Stand-in model that fails on any batch holding a NaN, as sklearn does."""
+
+    def predict(self, X):
+        if np.isnan(X).any():
+            raise ValueError("Input X contains NaN")
+        return super().predict(X)
+
+def test_micro_batcher_fails_only_the_bad_request():
+    """Test that a request failing the model does not fail the requests sharing its batch."""
+    batcher = MicroBatcher(FiniteModel(), window_ms=50, max_rows=64)
+    inputs = [np.full((1, 8), np.nan if i == 3 else i, dtype=np.float64) for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(batcher.predict, X_input) for X_input in inputs]
+
+    for i, future in enumerate(futures):
+        if i == 3:
+            assert isinstance(future.exception(), ValueError)
+        else:
+            assert float(future.result()[0]) == 8.0 * i
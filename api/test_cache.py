@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+
+from model import ModelRegistry, ModelVersion, PredictionCache
+
+
+class CountingModel:
+    """Stand-in model that counts the rows it scores."""
+
+    def __init__(self):
+        self.rows = 0
+
+    def predict(self, X):
+        self.rows += len(X)
+        return (X[:, 0] > 0).astype(int)
+
+class LabelModel(CountingModel):
+    """Stand-in model predicting the same label for every row."""
+
+    def __init__(self, label):
+        super().__init__()
+        self.label = label
+
+    def predict(self, X):
+        self.rows += len(X)
+        return np.full(len(X), self.label)
+
+def test_prediction_cache_hits_repeated_rows():
+    """Test that repeated feature vectors are answered without calling the model."""
+    model = CountingModel()
+    cache = PredictionCache(model, "v1", max_size=2)
+    X = np.array([[1.0] * 8, [-1.0] * 8])
+
+    assert cache.predict(X).tolist() == [1, 0]
+    assert cache.predict(X[::-1]).tolist() == [0, 1]
+    assert model.rows == 2
+
+    cache.predict(np.array([[2.0] * 8]))
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (2, 3, 1, 2)
+
+def test_prediction_cache_expires_entries():
+    """Test that entries older than the TTL are scored again."""
+    model = CountingModel()
+    cache = PredictionCache(model, "v1", ttl=0)
+
+    cache.predict(np.ones((1, 8)))
+    cache.predict(np.ones((1, 8)))
+
+    assert model.rows == 2
+
+def test_prediction_cache_keys_on_model_version(tmp_path):
+    """Test that two registry versions scoring the same row never share a cached prediction."""
+    models = {}
+
+    def load(version, path):
+        with open(path) as file:
+            model = models[version] = LabelModel(int(file.read()))
+        return ModelVersion(version, path, PredictionCache(model, version), model=model)
+
+    fallback = tmp_path / "fallback.json"
+    fallback.write_text("0")
+    versions_dir = tmp_path / "versions"
+    versions_dir.mkdir()
+    registry = ModelRegistry(str(versions_dir), str(fallback), load, poll_interval=0)
+    row = np.ones((1, 8))
+
+    for version, label, mtime in [("aaaa", 1, 1_000_000_000), ("bbbb", 2, 2_000_000_000)]:
+        (versions_dir / version).mkdir()
+        manifest = versions_dir / version / "manifest.json"
+        manifest.write_text(str(label))
+        os.utime(manifest, ns=(mtime, mtime))
+        assert registry.refresh() is True
+        assert registry.active.predictor.predict(row).tolist() == [label]
+        assert registry.active.predictor.predict(row).tolist() == [label]
+        assert registry.active.predictor.stats()["fingerprint"] == version
+
+    # Rolling back answers from the older version's own cache
+    os.utime(versions_dir / "aaaa" / "manifest.json", ns=(3_000_000_000, 3_000_000_000))
+    assert registry.refresh() is True
+    assert registry.active.predictor.predict(row).tolist() == [1]
+    assert (models["aaaa"].rows, models["bbbb"].rows) == (1, 1)
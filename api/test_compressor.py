@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from data_loader import DataLoader
+from model_compressor import ModelCompressor
+from preprocessor import Preprocessor
+from train_pipeline import COLUMN_NAMES, DATA_PATH, TARGET_COLUMN
+
+
+@pytest.fixture(scope="module")
+def splits():
+    """Fixture splitting the selected features into fit, held-out and test rows."""
+    features = Preprocessor(DataLoader(DATA_PATH, ',', COLUMN_NAMES).load_data(), TARGET_COLUMN, 0.7).preprocess()
+    X = features.drop(columns=[TARGET_COLUMN])
+    y = features[TARGET_COLUMN]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=7)
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.2, random_state=7)
+    return X_fit, X_val, X_test, y_fit, y_val, y_test
+
+def fit_pipeline(X, y, kernel):
+    """Fits a StandardScaler -> SVC pipeline with probability estimates."""
+    return Pipeline([
+        ('scaler', StandardScaler()), ('SVM', SVC(kernel=kernel, probability=True, random_state=7))
+    ]).fit(X, y)
+
+def test_linear_collapse_matches_decision_function(splits):
+    """Test that the collapsed linear pipeline scores like the original one."""
+    X_fit, X_val, X_test, y_fit, y_val, _ = splits
+    pipeline = fit_pipeline(X_fit, y_fit, 'linear')
+    collapsed = ModelCompressor(X_fit, X_val, y_val).compress(pipeline)
+
+    assert len(collapsed.steps[-1][1].support_vectors_) == 2
+    assert np.allclose(collapsed.decision_function(X_test), pipeline.decision_function(X_test), rtol=0, atol=1e-10)
+    assert np.array_equal(collapsed.predict(X_test), pipeline.predict(X_test))
+    assert np.allclose(collapsed.predict_proba(X_test), pipeline.predict_proba(X_test), rtol=0, atol=1e-10)
+
+def test_pruning_keeps_held_out_accuracy(splits):
+    """Test that pruning removes support vectors without losing accuracy on rows it never saw."""
+    X_fit, X_val, X_test, y_fit, y_val, y_test = splits
+    pipeline = fit_pipeline(X_fit, y_fit, 'rbf')
+    compressor = ModelCompressor(X_fit, X_val, y_val, tolerance=0.01)
+    pruned = compressor.compress(pipeline, prune=True)
+
+    assert len(pruned.steps[-1][1].support_vectors_) < len(pipeline.steps[-1][1].support_vectors_) / 2
+    assert compressor._accuracy(pruned) >= compressor._accuracy(pipeline) - compressor.tolerance
+    assert accuracy_score(y_test, pruned.predict(X_test)) >= accuracy_score(y_test, pipeline.predict(X_test)) - 0.02
+
+def test_pruning_recalibrates_probabilities(splits):
+    """Test that the probabilities of a pruned pipeline agree with its predictions and still rank rows."""
+    X_fit, X_val, X_test, y_fit, y_val, y_test = splits
+    pipeline = fit_pipeline(X_fit, y_fit, 'rbf')
+    pruned = ModelCompressor(X_fit, X_val, y_val).compress(pipeline, prune=True)
+    probabilities = pruned.predict_proba(X_test)[:, 1]
+
+    assert not np.array_equal(pruned.steps[-1][1].probA_, pipeline.steps[-1][1].probA_)
+    assert np.mean((probabilities > 0.5) == (pruned.predict(X_test) == 1)) >= 0.95
+    assert np.mean(np.abs(probabilities - pipeline.predict_proba(X_test)[:, 1])) < 0.05
+    assert roc_auc_score(y_test, probabilities) >= roc_auc_score(y_test, pipeline.predict_proba(X_test)[:, 1]) - 0.02
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline as SklearnPipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from model import CompiledPipeline, Loader, Pipeline
+
+PATH_DATASET = "./machine_learning/data/test_dataset_breast_cancer.csv"
+PATH_PIPELINE = "./machine_learning/pipelines/svc_breast_cancer_pipeline.pkl"
+
+@pytest.fixture(scope="module")
+def test_data():
+    """Fixture with the features and labels of the test dataset."""
+    array = Loader.load_data(PATH_DATASET).values
+    return array[:, :-1], array[:, -1]
+
+def test_compiled_pipeline_matches_sklearn(test_data):
+    """Test that the compiled RBF pipeline is numerically equivalent to sklearn."""
+    X_test, _ = test_data
+    pipeline = Pipeline.load_pipeline(PATH_PIPELINE)
+    engine = CompiledPipeline.compile(pipeline)
+
+    assert np.allclose(engine.decision_function(X_test), pipeline.decision_function(X_test), rtol=0, atol=1e-9)
+    assert np.array_equal(engine.predict(X_test), pipeline.predict(X_test))
+    assert np.array_equal(engine.predict(X_test[:1]), pipeline.predict(X_test[:1]))
+
+def test_compiled_linear_pipeline_matches_sklearn(test_data):
+    """Test that a linear SVC is collapsed into weights with the scaler folded in."""
+    X_test, y_test = test_data
+    pipeline = SklearnPipeline([("scaler", StandardScaler()), ("svc", SVC(kernel="linear"))]).fit(X_test, y_test)
+    engine = CompiledPipeline.compile(pipeline)
+
+    assert engine.weights.shape == (X_test.shape[1],)
+    assert np.allclose(engine.decision_function(X_test), pipeline.decision_function(X_test), rtol=0, atol=1e-9)
+    assert np.array_equal(engine.predict(X_test), pipeline.predict(X_test))
+
+def test_compile_rejects_unsupported_pipelines(test_data):
+    """Test that pipelines other than StandardScaler -> SVC are refused."""
+    X_test, y_test = test_data
+    pipeline = SklearnPipeline([("scaler", StandardScaler()), ("knn", KNeighborsClassifier())]).fit(X_test, y_test)
+
+    with pytest.raises(ValueError):
+        CompiledPipeline.compile(pipeline)
+
+def test_compiled_pipeline_rejects_non_finite_features(test_data):
+    """Test that NaN and infinite features raise, as sklearn does, instead of predicting a class."""
+    X_test, _ = test_data
+    engine = CompiledPipeline.compile(Pipeline.load_pipeline(PATH_PIPELINE))
+
+    for value in (np.nan, np.inf, -np.inf):
+        X_input = X_test[:2].copy()
+        X_input[1, 3] = value
+        with pytest.raises(ValueError, match="NaN or infinity"):
+            engine.predict(X_input)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from sklearn.model_selection import StratifiedKFold
+from sklearn.naive_bayes import GaussianNB
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from data_loader import DataLoader
+from evaluation import cross_validate_parallel
+from preprocessor import Preprocessor
+from train_pipeline import COLUMN_NAMES, DATA_PATH, TARGET_COLUMN
+
+ESTIMATORS = [
+    ('NB', GaussianNB()),
+    ('SVM-std', Pipeline([('StandardScaler', StandardScaler()), ('SVM', SVC())]))
+]
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    """Fixture loading the selected features and the diagnosis."""
+    features = Preprocessor(DataLoader(DATA_PATH, ',', COLUMN_NAMES).load_data(), TARGET_COLUMN, 0.7).preprocess()
+    return features.drop(columns=[TARGET_COLUMN]), features[TARGET_COLUMN]
+
+def test_parallel_evaluation_matches_serial_evaluation(training_data):
+    """Test that evaluating folds in worker processes gives the serial scores."""
+    X, y = training_data
+    kfold = StratifiedKFold(5, shuffle=True, random_state=7)
+    serial = cross_validate_parallel(ESTIMATORS, X, y, kfold, n_jobs=None)
+    parallel = cross_validate_parallel(ESTIMATORS, X, y, kfold, n_jobs=2)
+
+    assert list(serial) == list(parallel) == ['NB', 'SVM-std']
+    for name in serial:
+        assert len(serial[name]['scores']) == 5
+        assert np.array_equal(serial[name]['scores'], parallel[name]['scores'])
+
+def test_arrays_are_evaluated_like_data_frames(training_data):
+    """Test that folds are taken by position from arrays as from data frames."""
+    X, y = training_data
+    kfold = StratifiedKFold(5, shuffle=True, random_state=7)
+    frames = cross_validate_parallel(ESTIMATORS, X, y, kfold)
+    arrays = cross_validate_parallel(ESTIMATORS, X.to_numpy(), y.to_numpy(), kfold)
+
+    for name in frames:
+        assert np.array_equal(frames[name]['scores'], arrays[name]['scores'])
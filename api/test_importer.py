@@ -0,0 +1,92 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+from sqlalchemy.orm import sessionmaker
+
+from model import Base, Importer, Loader, Patient, Pipeline
+
+PATH_DATASET = "./machine_learning/data/test_dataset_breast_cancer.csv"
+PATH_PIPELINE = "./machine_learning/pipelines/svc_breast_cancer_pipeline.pkl"
+
+
+class FlakyModel:
+    """Stand-in model that fails on one call and delegates the others to the pipeline."""
+
+    def __init__(self, pipeline, fail_on_call):
+        self.pipeline = pipeline
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("model unavailable")
+        return self.pipeline.predict(X)
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    """Fixture with a session factory bound to an empty database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'import.sqlite3'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+def test_import_resumes_after_failed_chunk(session_factory, tmp_path):
+    """Test that a second import skips the chunks committed before a failure."""
+    pipeline = Pipeline.load_pipeline(PATH_PIPELINE)
+    checkpoints = str(tmp_path / "imports")
+
+    failing = Importer(session_factory, FlakyModel(pipeline, fail_on_call=2), checkpoints, chunk_size=50)
+    with pytest.raises(RuntimeError):
+        failing.import_file(PATH_DATASET)
+
+    retry_model = FlakyModel(pipeline, fail_on_call=None)
+    summary = Importer(session_factory, retry_model, checkpoints, chunk_size=50).import_file(PATH_DATASET)
+
+    assert summary["resumed_chunks"] == 1
+    assert summary["inserted"] == 64
+    assert retry_model.calls == 2, "The committed chunk should not be scored again"
+    with session_factory() as session:
+        assert session.query(Patient).count() == 114
+
+def test_import_with_other_prefix_does_not_resume(session_factory, tmp_path):
+    """Test that a failed import is not resumed by an import of the same content under another prefix."""
+    pipeline = Pipeline.load_pipeline(PATH_PIPELINE)
+    checkpoints = str(tmp_path / "imports")
+
+    failing = Importer(session_factory, FlakyModel(pipeline, fail_on_call=2), checkpoints, chunk_size=50)
+    with pytest.raises(RuntimeError):
+        failing.import_file(PATH_DATASET, name_prefix="first")
+
+    summary = Importer(session_factory, pipeline, checkpoints, chunk_size=50).import_file(
+        PATH_DATASET, name_prefix="second"
+    )
+
+    assert summary["resumed_chunks"] == 0
+    assert summary["inserted"] == 114
+
+def test_cli_scores_with_the_version_the_api_serves(tmp_path):
+    """Test that the command line importer resolves its model like the API, skipping refused versions."""
+    from import_patients import resolve_model
+    from model import file_version
+    from model.preprocessor import FEATURES
+    from model_saver import ModelSaver
+
+    dataset = Loader.load_data(PATH_DATASET)
+    pipeline = make_pipeline(StandardScaler(), SVC()).fit(dataset[FEATURES], dataset["diagnosis"])
+    saver = ModelSaver(str(tmp_path))
+    refused = saver.save_version(pipeline, {"features": FEATURES[::-1]})
+
+    model = resolve_model(versions_dir=str(tmp_path / "versions"), fallback_path=PATH_PIPELINE)
+    assert model.version == file_version(PATH_PIPELINE)
+    model.close()
+
+    served = saver.save_version(pipeline.set_params(svc__C=10).fit(dataset[FEATURES], dataset["diagnosis"]),
+                                {"features": FEATURES})
+    os.utime(os.path.join(refused, "manifest.json"), ns=(1_000_000_000, 1_000_000_000))
+    model = resolve_model(versions_dir=str(tmp_path / "versions"), fallback_path=PATH_PIPELINE)
+    assert model.version == os.path.basename(served)
+    model.close()
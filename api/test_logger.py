@@ -0,0 +1,61 @@
+import json
+import logging
+
+from logger import AsyncHandler, JsonFormatter, request_id
+
+
+class ListHandler(logging.Handler):
+    """Handler keeping the formatted records in a list."""
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.setFormatter(JsonFormatter())
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+def test_async_handler_writes_json_with_request_id():
+    """Test that records are written by the listener thread as JSON with the request id and extra fields."""
+    target = ListHandler()
+    handler = AsyncHandler(target)
+    log = logging.getLogger("test_logger")
+    log.addHandler(handler)
+    log.propagate = False
+
+    token = request_id.set("req-1")
+    try:
+        log.warning("Served %s", "/patients", extra={"latency_ms": 1.5})
+    finally:
+        request_id.reset(token)
+    log.warning("Outside a request")
+    handler.close()
+    log.removeHandler(handler)
+
+    first, second = (json.loads(line) for line in target.lines)
+    assert first["message"] == "Served /patients"
+    assert first["request_id"] == "req-1"
+    assert first["latency_ms"] == 1.5
+    assert first["level"] == "WARNING"
+    assert second["request_id"] is None
+
+def test_async_handler_keeps_the_traceback_as_a_field():
+    """Test that an exception logged through the queue reaches the JSON output as its own field."""
+    target = ListHandler()
+    handler = AsyncHandler(target)
+    log = logging.getLogger("test_logger_exception")
+    log.addHandler(handler)
+    log.propagate = False
+
+    try:
+        raise ValueError("broken model")
+    except ValueError:
+        log.exception("Prediction failed for %s", "Maria")
+    handler.close()
+    log.removeHandler(handler)
+
+    entry = json.loads(target.lines[0])
+    assert entry["message"] == "Prediction failed for Maria"
+    assert "Traceback" in entry["exception"]
+    assert "ValueError: broken model" in entry["exception"]
@@ -0,0 +1,26 @@
+from metrics import Counter, Histogram, snapshot
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that histograms render cumulative buckets, sum and count per label set."""
+    histogram = Histogram("phase_seconds", "Phase duration.", ("phase",), buckets=[0.1, 1])
+    histogram.observe(0.05, "predict")
+    histogram.observe(0.1, "predict")
+    histogram.observe(5, "predict")
+
+    lines = histogram.render()
+    assert 'phase_seconds_bucket{phase="predict",le="0.1"} 2' in lines
+    assert 'phase_seconds_bucket{phase="predict",le="1"} 2' in lines
+    assert 'phase_seconds_bucket{phase="predict",le="+Inf"} 3' in lines
+    assert 'phase_seconds_sum{phase="predict"} 5.15' in lines
+    assert 'phase_seconds_count{phase="predict"} 3' in lines
+
+def test_counter_and_snapshot_render_labels():
+    """Test that label values are escaped and metric types are declared."""
+    counter = Counter("requests_total", "Requests.", ("route",))
+    counter.inc('/a"b')
+    counter.inc('/a"b')
+
+    assert counter.render() == [
+        "# HELP requests_total Requests.", "# TYPE requests_total counter", 'requests_total{route="/a\\"b"} 2'
+    ]
+    assert snapshot("swaps_total", "Swaps.", [((), 3)], kind="counter")[1:] == ["# TYPE swaps_total counter", "swaps_total 3"]
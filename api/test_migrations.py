@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from model.migrations import MigrationError, migrate
+
+def test_migrate_adds_indexes(tmp_path):
+    """Test that an old patients table gets its indexes and model version column, keeping unnamed patients."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.sqlite3'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE patients (id INTEGER PRIMARY KEY, name VARCHAR(50), insertion_date DATETIME)"))
+        connection.execute(text("INSERT INTO patients (name) VALUES ('Maria'), ('Ana'), (NULL), (NULL)"))
+
+    migrate(engine)
+    migrate(engine)
+
+    indexes = inspect(engine).get_indexes("patients")
+    assert any(index["column_names"] == ["name"] and index["unique"] for index in indexes)
+    assert any(index["column_names"] == ["insertion_date"] for index in indexes)
+    assert "model_version" in [column["name"] for column in inspect(engine).get_columns("patients")]
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT id, name FROM patients ORDER BY id")).all()
+    assert [tuple(row) for row in rows] == [(1, "Maria"), (2, "Ana"), (3, None), (4, None)]
+
+def test_migrate_refuses_to_remove_duplicate_patients(tmp_path):
+    """Test that patients sharing a name stop the migration instead of being deleted."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.sqlite3'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE patients (id INTEGER PRIMARY KEY, name VARCHAR(50), insertion_date DATETIME)"))
+        connection.execute(text("INSERT INTO patients (name) VALUES ('Maria'), ('Ana'), ('Maria')"))
+
+    with pytest.raises(MigrationError, match="'Maria' \\(2 patients\\)"):
+        migrate(engine)
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM patients")).scalar() == 3
@@ -0,0 +1,100 @@
+import pytest
+import sklearn
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+import model_optimizer
+from data_loader import DataLoader
+from model_optimizer import ModelOptimizer
+from preprocessor import Preprocessor
+from train_pipeline import COLUMN_NAMES, DATA_PATH, TARGET_COLUMN
+
+SVM_GRID = {'SVM': {'SVM__C': [0.1, 1, 10], 'SVM__gamma': [0.1, 0.01], 'SVM__kernel': ['rbf']}}
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    """Fixture loading the selected features and the diagnosis."""
+    features = Preprocessor(DataLoader(DATA_PATH, ',', COLUMN_NAMES).load_data(), TARGET_COLUMN, 0.7).preprocess()
+    return features.drop(columns=[TARGET_COLUMN]), features[TARGET_COLUMN]
+
+def optimizer(training_data, tmp_path, **kwargs):
+    """Builds an optimizer of the SVM-std pipeline caching under tmp_path."""
+    X, y = training_data
+    options = dict(
+        kfold=StratifiedKFold(3, shuffle=True, random_state=7), n_jobs=1, cache_dir=str(tmp_path / "memory"),
+        results_path=str(tmp_path / "results.json"), param_grids=SVM_GRID, pipeline_names=['SVM-std']
+    )
+    options.update(kwargs)
+    return ModelOptimizer(X, y, **options)
+
+def count_calls(monkeypatch, owner, name):
+    """Wraps a function so its calls (in this process) are counted."""
+    calls = []
+    function = getattr(owner, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return function(*args, **kwargs)
+
+    monkeypatch.setattr(owner, name, wrapper)
+    return calls
+
+def test_random_strategy_scores_n_iter_candidates(training_data, tmp_path):
+    """Test that the random strategy only evaluates n_iter sampled candidates."""
+    search = optimizer(training_data, tmp_path, strategy='random', n_iter=2)
+    score, params = search.optimize_models()['SVM-std']
+
+    assert len(search.results) == 2
+    assert params in [result['params'] for result in search.results.values()]
+    assert score == max(result['score'] for result in search.results.values())
+
+def test_halving_strategy_ranks_survivors_first(training_data, tmp_path):
+    """Test that the halving strategy picks a candidate that reached the last iteration."""
+    search = optimizer(training_data, tmp_path, strategy='halving')
+    score, params = search.optimize_models()['SVM-std']
+
+    most_resources = max(result['n_resources'] for result in search.results.values())
+    best = search.results[search._key('SVM-std', params)]
+    assert len(search.results) == 6
+    assert best['n_resources'] == most_resources
+    assert best['score'] == score
+
+def test_parallel_search_matches_serial_search(training_data, tmp_path):
+    """Test that scoring candidates in worker processes gives the serial scores."""
+    serial = optimizer(training_data, tmp_path / "serial", n_jobs=1)
+    parallel = optimizer(training_data, tmp_path / "parallel", n_jobs=2)
+
+    assert serial.optimize_models() == parallel.optimize_models()
+    assert serial.results == parallel.results
+
+def test_persisted_scores_are_reused_until_the_setup_changes(training_data, tmp_path, monkeypatch):
+    """Test that a rerun reuses persisted scores, unless the sklearn version or pipeline changed."""
+    best = optimizer(training_data, tmp_path).optimize_models()
+    calls = count_calls(monkeypatch, model_optimizer, 'fit_and_score')
+
+    assert optimizer(training_data, tmp_path).optimize_models() == best
+    assert len(calls) == 0
+
+    monkeypatch.setattr(sklearn, '__version__', '0.0.0')
+    optimizer(training_data, tmp_path).optimize_models()
+    assert len(calls) == 6 * 3
+
+    monkeypatch.setattr(ModelOptimizer, '_initialize_models', lambda self: [
+        ('SVM', model_optimizer.SVC(class_weight='balanced'))
+    ])
+    optimizer(training_data, tmp_path).optimize_models()
+    assert len(calls) == 2 * 6 * 3
+
+def test_fitted_scalers_are_cached_per_fold(training_data, tmp_path, monkeypatch):
+    """Test that the scaler is fitted once per fold and loaded from the Memory cache afterwards."""
+    calls = count_calls(monkeypatch, StandardScaler, 'fit')
+
+    optimizer(training_data, tmp_path, results_path=None).optimize_models()
+    assert len(calls) == 3
+
+    optimizer(training_data, tmp_path, results_path=None).optimize_models()
+    assert len(calls) == 3
+
+    optimizer(training_data, tmp_path, results_path=None, cache_dir=None).optimize_models()
+    assert len(calls) == 3 + 6 * 3
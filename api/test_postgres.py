@@ -0,0 +1,79 @@
+"""
+Runs the database layer against PostgreSQL.
+
+Uses the server of TEST_POSTGRES_URL when set, or else starts a throwaway
+local server with pgserver; skipped when neither is available.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import func, inspect, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy_utils import drop_database
+
+from model import GroupCommitWriter, Importer, Patient, Pipeline, create_db_engine, setup_database
+
+PATH_DATASET = "./machine_learning/data/test_dataset_breast_cancer.csv"
+PATH_PIPELINE = "./machine_learning/pipelines/svc_breast_cancer_pipeline.pkl"
+
+pytest.importorskip("psycopg2")
+
+
+@pytest.fixture(scope="module")
+def server_url(tmp_path_factory):
+    """URL of a PostgreSQL server."""
+    if os.environ.get("TEST_POSTGRES_URL"):
+        yield os.environ["TEST_POSTGRES_URL"]
+        return
+    pgserver = pytest.importorskip("pgserver")
+    server = pgserver.get_server(str(tmp_path_factory.mktemp("pgdata")), cleanup_mode="stop")
+    yield server.get_uri()
+    server.cleanup()
+
+@pytest.fixture()
+def engine(server_url):
+    """Engine of a fresh database of the server, created by setup_database and dropped afterwards."""
+    url = make_url(server_url).set(database="patients_test")
+    engine = create_db_engine(url.render_as_string(hide_password=False), pool_pre_ping=True)
+    setup_database(engine)
+    yield engine
+    engine.dispose()
+    drop_database(engine.url)
+
+def test_setup_database_is_idempotent(engine):
+    """Test that the schema is created with its indexes and that upgrading it again is a no-op."""
+    setup_database(engine)
+
+    indexes = inspect(engine).get_indexes("patients")
+    assert any(index["column_names"] == ["name"] and index["unique"] for index in indexes)
+    assert "model_version" in [column["name"] for column in inspect(engine).get_columns("patients")]
+
+def test_group_commit_skips_duplicate_names(engine):
+    """Test that concurrent inserts are committed with ON CONFLICT DO NOTHING on PostgreSQL."""
+    writer = GroupCommitWriter(sessionmaker(bind=engine), window_ms=50)
+    names = [f"patient-{i}" for i in range(16)] * 2
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        patients = list(executor.map(lambda name: writer.insert(
+            {"name": name, "concave_points_worst": 0.2654, "perimeter_worst": 184.6,
+             "concave_points_mean": 0.1471, "radius_worst": 25.38, "perimeter_mean": 122.8,
+             "area_worst": 2019.0, "radius_mean": 17.99, "area_mean": 1001.0, "diagnosis": 1}
+        ), names))
+    writer.close()
+
+    assert sum(patient is not None for patient in patients) == 16
+    with sessionmaker(bind=engine)() as session:
+        assert session.scalar(select(func.count(Patient.id))) == 16
+
+def test_import_into_postgres(engine, tmp_path):
+    """Test that a file is imported once, a second import skipping the stored names."""
+    pipeline = Pipeline.load_pipeline(PATH_PIPELINE)
+    session_factory = sessionmaker(bind=engine)
+
+    first = Importer(session_factory, pipeline, str(tmp_path / "first"), chunk_size=50).import_file(PATH_DATASET)
+    second = Importer(session_factory, pipeline, str(tmp_path / "second"), chunk_size=50).import_file(PATH_DATASET)
+
+    assert first["inserted"] == 114
+    assert second["skipped"] == 114
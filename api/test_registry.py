@@ -0,0 +1,162 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from model import ModelRegistry, ModelVersion, PreProcessor, file_version
+from model.preprocessor import FEATURES
+from model_saver import ModelSaver
+
+PIPELINE_PATH = "./machine_learning/pipelines/svc_breast_cancer_pipeline.pkl"
+
+
+class ConstantModel:
+    """Stand-in model predicting the same label for every row, closed on eviction."""
+
+    def __init__(self, label):
+        self.label = label
+        self.closed = False
+
+    def predict(self, X):
+        return np.full(len(X), self.label)
+
+    def close(self):
+        self.closed = True
+
+def write_version(versions_dir, version, label, mtime):
+    """Writes a version directory whose manifest holds the label to predict."""
+    path = versions_dir / version
+    path.mkdir()
+    manifest = path / "manifest.json"
+    manifest.write_text(str(label))
+    os.utime(manifest, ns=(mtime, mtime))
+
+def load(version, path):
+    """Builds a ModelVersion predicting the label stored in the manifest."""
+    with open(path) as file:
+        model = ConstantModel(int(file.read()))
+    return ModelVersion(version, path, model, model=model)
+
+def test_registry_serves_fallback_then_swaps_to_newest_version(tmp_path):
+    """Test that new versions replace the fallback and that only `keep` stay resident."""
+    fallback = tmp_path / "fallback.json"
+    fallback.write_text("0")
+    versions_dir = tmp_path / "versions"
+    registry = ModelRegistry(str(versions_dir), str(fallback), load, keep=2, poll_interval=0,
+                             warmup_input=np.zeros((1, 8)))
+
+    assert registry.active.version == file_version(str(fallback))
+    assert registry.refresh() is False
+
+    versions_dir.mkdir()
+    write_version(versions_dir, "aaaa", 1, 1_000_000_000)
+    assert registry.refresh() is True
+    first = registry.active
+    assert (first.version, first.predictor.predict(np.zeros((2, 8))).tolist()) == ("aaaa", [1, 1])
+
+    write_version(versions_dir, "bbbb", 2, 2_000_000_000)
+    assert registry.refresh() is True
+    stats = registry.stats()
+    assert (stats["active"], stats["resident"], stats["swaps"]) == ("bbbb", ["aaaa", "bbbb"], 2)
+    assert first.model.closed is False
+
+    # Touching an older version rolls back to it without reloading it
+    os.utime(versions_dir / "aaaa" / "manifest.json", ns=(3_000_000_000, 3_000_000_000))
+    assert registry.refresh() is True
+    assert registry.active is first
+
+def test_registry_keeps_serving_when_a_version_fails_to_load(tmp_path):
+    """Test that a broken version is skipped and the active one keeps serving."""
+    versions_dir = tmp_path / "versions"
+    versions_dir.mkdir()
+    write_version(versions_dir, "good", 1, 1_000_000_000)
+    registry = ModelRegistry(str(versions_dir), str(tmp_path / "missing.json"), load, poll_interval=0)
+
+    write_version(versions_dir, "broken", "not a label", 2_000_000_000)
+    assert registry.refresh() is False
+    assert registry.active.version == "good"
+    assert registry.stats()["failures"] == 1
+
+    # The broken version is not retried on every scan
+    assert registry.refresh() is False
+    assert registry.stats()["failures"] == 1
+
+    # Until its manifest is rewritten
+    manifest = versions_dir / "broken" / "manifest.json"
+    manifest.write_text("2")
+    os.utime(manifest, ns=(3_000_000_000, 3_000_000_000))
+    assert registry.refresh() is True
+    assert registry.active.predictor.predict(np.zeros((1, 8))).tolist() == [2]
+
+def test_registry_starts_on_the_newest_version_that_loads(tmp_path):
+    """Test that broken versions found at startup are skipped instead of keeping the API from starting."""
+    fallback = tmp_path / "fallback.json"
+    fallback.write_text("0")
+    versions_dir = tmp_path / "versions"
+    versions_dir.mkdir()
+    write_version(versions_dir, "good", 1, 1_000_000_000)
+    write_version(versions_dir, "broken", "not a label", 2_000_000_000)
+
+    registry = ModelRegistry(str(versions_dir), str(fallback), load, poll_interval=0)
+    assert registry.active.version == "good"
+    assert registry.stats()["failures"] == 1
+    assert registry.refresh() is False
+
+    # With no version loading, the fallback is served
+    (versions_dir / "good" / "manifest.json").write_text("not a label either")
+    registry = ModelRegistry(str(versions_dir), str(fallback), load, poll_interval=0)
+    assert registry.active.version == file_version(str(fallback))
+    assert registry.stats()["failures"] == 2
+
+def test_registry_hashes_the_fallback_only_when_it_changes(tmp_path, monkeypatch):
+    """Test that polling an empty directory does not hash the fallback artifact every time."""
+    import model.registry
+
+    hashed = []
+    monkeypatch.setattr(model.registry, "file_version", lambda path: hashed.append(path) or file_version(path))
+    fallback = tmp_path / "fallback.json"
+    fallback.write_text("0")
+    registry = ModelRegistry(str(tmp_path / "versions"), str(fallback), load, poll_interval=0)
+
+    for _ in range(3):
+        assert registry.refresh() is False
+    assert len(hashed) == 1
+
+    fallback.write_text("10")
+    assert registry.refresh() is True
+    assert len(hashed) == 2
+    assert registry.active.version == file_version(str(fallback))
+
+def test_version_trained_on_other_features_is_not_activated(tmp_path):
+    """Test that a version whose metadata lists other features than the API sends is refused."""
+    from app import PatientService
+
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame(rng.normal(size=(40, len(FEATURES))), columns=FEATURES)
+    y = (X[FEATURES[0]] > 0).astype(int)
+    saver = ModelSaver(str(tmp_path))
+    good = saver.save_version(make_pipeline(StandardScaler(), SVC()).fit(X, y), {"features": FEATURES})
+    os.utime(os.path.join(good, "manifest.json"), ns=(1_000_000_000, 1_000_000_000))
+    registry = ModelRegistry(str(tmp_path / "versions"), PIPELINE_PATH, PatientService._load_version, poll_interval=0)
+    assert registry.active.version == os.path.basename(good)
+
+    # Same columns, but recorded (and sent by the API) in another order
+    reordered = saver.save_version(make_pipeline(StandardScaler(), SVC(C=10)).fit(X, y), {"features": FEATURES[::-1]})
+    os.utime(os.path.join(reordered, "manifest.json"), ns=(2_000_000_000, 2_000_000_000))
+    assert registry.refresh() is False
+    assert registry.active.version == os.path.basename(good)
+    assert registry.stats()["failures"] == 1
+
+def test_pipeline_fitted_on_other_columns_is_rejected(tmp_path):
+    """Test that the column names a pipeline was fitted on are checked without metadata."""
+    X = pd.DataFrame(np.eye(len(FEATURES)), columns=FEATURES)
+    y = np.arange(len(FEATURES)) % 2
+    path = str(tmp_path / "pipeline.pkl")
+
+    PreProcessor.check_features(make_pipeline(StandardScaler(), SVC()).fit(X, y), path)
+    with pytest.raises(ValueError, match="fitted on the features"):
+        PreProcessor.check_features(make_pipeline(StandardScaler(), SVC()).fit(X[FEATURES[::-1]], y), path)
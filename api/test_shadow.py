@@ -0,0 +1,71 @@
+import time
+
+import numpy as np
+
+from model import ShadowEvaluator
+
+
+class ThresholdModel:
+    """Stand-in model predicting 1 when the first feature exceeds a threshold."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+
+    def predict(self, X):
+        return (X[:, 0] > self.threshold).astype(int)
+
+def wait_until_idle(shadow):
+    """Waits for the shadow workers to score every pending sample."""
+    deadline = time.monotonic() + 5
+    while shadow.stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def test_shadow_evaluator_counts_agreements():
+    """Test that sampled rows are scored by the candidate and compared with production."""
+    production, candidate = ThresholdModel(0.5), ThresholdModel(1.5)
+    shadow = ShadowEvaluator(candidate, "candidate", fraction=1.0)
+    X = np.array([[0.0] * 8, [1.0] * 8, [2.0] * 8])
+
+    for _ in range(4):
+        shadow.submit(production, "production", X, production.predict(X))
+    wait_until_idle(shadow)
+
+    stats = shadow.stats()
+    assert (stats["sampled"], stats["rows"], stats["agreements"]) == (4, 12, 8)
+    assert stats["disagreements"] == {"1->0": 4}
+    assert stats["candidate_latency_ms"]["count"] == 4
+    assert "Agreement: 66.67% (8 of 12)" in shadow.report()
+
+def test_shadow_evaluator_samples_and_drops():
+    """Test that unsampled requests are ignored and that a full queue drops samples."""
+    model = ThresholdModel(0.5)
+    X = np.ones((1, 8))
+
+    unsampled = ShadowEvaluator(model, "candidate", fraction=0.0)
+    unsampled.submit(model, "production", X, model.predict(X))
+    assert unsampled.stats()["sampled"] == 0
+
+    saturated = ShadowEvaluator(model, "candidate", fraction=1.0, max_pending=0)
+    saturated.submit(model, "production", X, model.predict(X))
+    assert (saturated.stats()["sampled"], saturated.stats()["dropped"], saturated.stats()["rows"]) == (1, 1, 0)
+
+def test_shadow_evaluator_starts_over_after_a_swap():
+    """Test that the comparison only counts rows of the current production version."""
+    old, new, candidate = ThresholdModel(0.5), ThresholdModel(1.5), ThresholdModel(1.5)
+    shadow = ShadowEvaluator(candidate, "candidate", fraction=1.0)
+    X = np.array([[0.0] * 8, [1.0] * 8, [2.0] * 8])
+
+    shadow.submit(old, "old", X, old.predict(X))
+    wait_until_idle(shadow)
+    assert (shadow.stats()["production_version"], shadow.stats()["agreements"]) == ("old", 2)
+
+    shadow.submit(new, "new", X, new.predict(X))
+    wait_until_idle(shadow)
+    # A sample of the old version scored after the swap is left out
+    shadow._pending += 1
+    shadow._score(old, "old", X, old.predict(X))
+
+    stats = shadow.stats()
+    assert (stats["production_version"], stats["sampled"], stats["rows"], stats["agreements"]) == ("new", 2, 3, 3)
+    assert stats["disagreements"] == {}
+    assert stats["production_latency_ms"]["count"] == 1
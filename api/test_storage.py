@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from model import Base, GroupCommitWriter, Patient, configure_sqlite, create_db_engine, setup_database, sqlite_pragmas
+
+VALUES = {
+    "concave_points_worst": 0.2654,
+    "perimeter_worst": 184.6,
+    "concave_points_mean": 0.1471,
+    "radius_worst": 25.38,
+    "perimeter_mean": 122.8,
+    "area_worst": 2019.0,
+    "radius_mean": 17.99,
+    "area_mean": 1001.0,
+    "diagnosis": 1
+}
+
+@pytest.fixture()
+def engine(tmp_path):
+    """Engine of a fresh database using the performance profile."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'patients.sqlite3'}")
+    configure_sqlite(engine, sqlite_pragmas("performance", busy_timeout=1234))
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+def test_performance_profile_is_applied_on_connect(engine):
+    """Test that every connection gets the PRAGMA settings of the profile and its overrides."""
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+
+    with pytest.raises(ValueError):
+        sqlite_pragmas("fastest")
+
+def test_group_commit_writer_coalesces_inserts(engine):
+    """Test that concurrent inserts share transactions and duplicate names are reported once."""
+    writer = GroupCommitWriter(sessionmaker(bind=engine), window_ms=50, max_rows=64)
+    names = [f"patient-{i}" for i in range(32)] + ["patient-0"]
+
+    with ThreadPoolExecutor(max_workers=33) as executor:
+        patients = list(executor.map(lambda name: writer.insert({**VALUES, "name": name}), names))
+    writer.close()
+
+    assert sum(patient is not None for patient in patients) == 32
+    assert {patient.name for patient in patients if patient} == set(names)
+    stats = writer.stats()
+    assert stats["rows"] == 33
+    assert stats["groups"] < 33, "Concurrent inserts should share transactions"
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM patients")).scalar() == 32
+
+@pytest.mark.parametrize("url", ["sqlite://", "sqlite:///:memory:"])
+def test_in_memory_database_ignores_pool_sizing(url):
+    """Test that an in-memory SQLite URL gets an engine, although its pool has no size to set."""
+    engine = create_db_engine(url, pool_size=3, max_overflow=1, pool_timeout=2)
+    setup_database(engine)
+    with engine.connect() as connection:
+        assert connection.execute(select(func.count()).select_from(Patient)).scalar() == 0
+    engine.dispose()
+
+def test_file_database_is_pooled_with_the_given_size(tmp_path):
+    """Test that a SQLite file gets a QueuePool sized as requested."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'patients.sqlite3'}", pool_size=3, max_overflow=1)
+    assert isinstance(engine.pool, QueuePool)
+    assert (engine.pool.size(), engine.pool._max_overflow) == (3, 1)
+    engine.dispose()
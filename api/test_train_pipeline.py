@@ -0,0 +1,51 @@
+import argparse
+import json
+import os
+import re
+
+import pytest
+
+from train_pipeline import DATA_PATH, train
+
+
+@pytest.fixture()
+def args(tmp_path):
+    """Fixture with the arguments of a quick training run writing under tmp_path."""
+    grids = tmp_path / "grids.json"
+    grids.write_text(json.dumps({'NB': {'NB__var_smoothing': [1e-9, 1e-8]}}))
+    return argparse.Namespace(
+        data=DATA_PATH, corr_threshold=0.7, test_size=0.2, seed=7, n_splits=3, strategy='grid', n_iter=10,
+        param_grids=str(grids), pipelines=['NB-std'], compress=False, validation_size=0.2,
+        compress_tolerance=0.01, n_jobs=1, cache_dir=str(tmp_path / "cache"), output_dir=str(tmp_path)
+    )
+
+def run(args, capsys):
+    """Trains and returns the saved version directory and the cached/done status of each stage."""
+    path = train(args)
+    return path, dict(re.findall(r"^\[([\w-]+)\] (cached|done)", capsys.readouterr().out, re.MULTILINE))
+
+def test_rerun_is_served_from_the_stage_cache(args, capsys):
+    """Test that an unchanged rerun takes every stage from the cache and saves the same version."""
+    first, stages = run(args, capsys)
+    assert stages == dict.fromkeys(['load', 'feature-select', 'split', 'search', 'fit', 'evaluate'], 'done')
+
+    second, stages = run(args, capsys)
+    assert set(stages.values()) == {'cached'}
+    assert second == first
+
+    with open(os.path.join(first, "metadata.json")) as file:
+        metadata = json.load(file)
+    assert metadata['pipeline'] == 'NB-std'
+    assert metadata['params']['NB__var_smoothing'] in (1e-9, 1e-8)
+
+def test_new_param_grids_resume_at_the_search(args, capsys):
+    """Test that changing the parameter grids reruns the search and the stages after it only."""
+    run(args, capsys)
+    with open(args.param_grids, 'w') as file:
+        json.dump({'NB': {'NB__var_smoothing': [1e-7, 1e-6]}}, file)
+
+    path, stages = run(args, capsys)
+    assert stages == {'load': 'cached', 'feature-select': 'cached', 'split': 'cached',
+                      'search': 'done', 'fit': 'done', 'evaluate': 'done'}
+    with open(os.path.join(path, "metadata.json")) as file:
+        assert json.load(file)['params']['NB__var_smoothing'] in (1e-7, 1e-6)
@@ -8,15 +8,21 @@ API_BASE_URL = "http://127.0.0.1:5000"
 GET_PATIENTS_URL = f"{API_BASE_URL}/patients"
 ADD_PATIENT_URL = f"{API_BASE_URL}/patient_streamlit"
 
-# Function to fetch all patients from the backend
-def fetch_patients():
-    response = requests.get(GET_PATIENTS_URL)
-    if response.status_code == 200:
-        data = response.json()
-        return data['patients']
-    else:
+# Patients shown per page of the list
+PAGE_SIZE = 50
+
+# Function to fetch one page of patients from the backend, starting after the given id
+def fetch_patients(after=None, limit=PAGE_SIZE):
+    params = {"limit": limit}
+    if after is not None:
+        params["after"] = after
+    response = requests.get(GET_PATIENTS_URL, params=params)
+    if response.status_code != 200:
         st.error("Error fetching patients")
-        return []
+        return [], None
+
+    data = response.json()
+    return data['patients'], data.get('next_after')
 
 # Function to add a new patient
 def add_patient(patient_data):
@@ -79,9 +85,25 @@ def main():
             # Add patient to the backend
             add_patient(patient_data)
 
-    # Display the list of patients
+    # Display the list of patients, one page at a time; the cursor of every
+    # page visited is kept so the previous pages can be shown again
     st.header("Patient List")
-    patients = fetch_patients()
+    if "page_cursors" not in st.session_state:
+        st.session_state.page_cursors = [None]
+    cursors = st.session_state.page_cursors
+    patients, next_after = fetch_patients(cursors[-1])
+
+    previous_col, page_col, next_col = st.columns([1, 2, 1])
+    with previous_col:
+        if st.button("Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with page_col:
+        st.write(f"Page {len(cursors)}")
+    with next_col:
+        if st.button("Next", disabled=next_after is None):
+            cursors.append(next_after)
+            st.rerun()
 
     if patients:
         df = pd.DataFrame(patients)